@@ -3,8 +3,9 @@
 from dj.choices import Country, Gender
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
+from django.core.cache import cache
 from django.db import models
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_save, pre_delete
 from django.dispatch import receiver
 from django.utils.translation import ugettext_lazy as _
 from rest_framework.authtoken.models import Token
@@ -17,6 +18,8 @@ from ralph.lib.permissions import (
     user_permission
 )
 
+USER_REGIONS_CACHE_KEY = 'ralph.accounts.user.{}.regions_ids'
+
 
 @user_permission
 def has_region(user):
@@ -154,13 +157,29 @@ class RalphUser(
     @property
     def regions_ids(self):
         """
-        Get region ids without additional SQL joins.
+        Get region ids (as a list) without additional SQL joins.
+
+        Ids are memoized on the user object (which lives as long as the
+        request) and optionally cached in the Django cache.
         """
-        return self.regions.through.objects.filter(
-            ralphuser=self
-        ).values_list(
-            'region_id', flat=True
-        )
+        regions_ids = self.__dict__.get('_regions_ids')
+        if regions_ids is None:
+            cache_key = USER_REGIONS_CACHE_KEY.format(self.pk)
+            if settings.USER_REGIONS_CACHE and self.pk:
+                regions_ids = cache.get(cache_key)
+            if regions_ids is None:
+                regions_ids = list(self.regions.through.objects.filter(
+                    ralphuser=self
+                ).values_list(
+                    'region_id', flat=True
+                ))
+                if settings.USER_REGIONS_CACHE and self.pk:
+                    cache.set(
+                        cache_key, regions_ids,
+                        settings.USER_REGIONS_CACHE_TTL
+                    )
+            self._regions_ids = regions_ids
+        return regions_ids
 
     def has_any_perms(self, perms, obj=None):
         return any([self.has_perm(p, obj=obj) for p in perms])
@@ -186,3 +205,36 @@ def create_auth_token(sender, instance=None, created=False, **kwargs):
     """
     if created:
         Token.objects.create(user=instance)
+
+
+def _invalidate_users_regions(users_ids):
+    if settings.USER_REGIONS_CACHE:
+        cache.delete_many([
+            USER_REGIONS_CACHE_KEY.format(user_id) for user_id in users_ids
+        ])
+
+
+@receiver(m2m_changed, sender=RalphUser.regions.through)
+def invalidate_user_regions(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    """
+    Invalidate cached regions of users when their regions are changed.
+    """
+    if not reverse:
+        if action.startswith('post_'):
+            instance.__dict__.pop('_regions_ids', None)
+            _invalidate_users_regions([instance.pk])
+    # region.users was changed - pk_set contains users ids (or is empty when
+    # all users are removed from region)
+    elif action == 'pre_clear':
+        _invalidate_users_regions(
+            instance.users.values_list('pk', flat=True)
+        )
+    elif action.startswith('post_'):
+        _invalidate_users_regions(pk_set or [])
+
+
+@receiver(pre_delete, sender=Region)
+def invalidate_region_users_regions(sender, instance, **kwargs):
+    _invalidate_users_regions(instance.users.values_list('pk', flat=True))
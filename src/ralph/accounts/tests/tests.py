@@ -1,8 +1,9 @@
 # -*- coding: utf-8 -*-
 import unittest
 
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
-from django.test import TestCase
+from django.test import override_settings, TestCase
 from rest_framework import status
 
 from ralph.accounts.ldap import manager_country_attribute_populate
@@ -11,6 +12,7 @@ from ralph.accounts.management.commands.ldap_sync import (
     ldap_module_exists
 )
 from ralph.accounts.models import RalphUser, Region
+from ralph.accounts.tests.factories import RegionFactory, UserFactory
 from ralph.api.tests._base import RalphAPITestCase
 from ralph.back_office.tests.factories import BackOfficeAssetFactory
 from ralph.licences.models import LicenceUser
@@ -155,3 +157,39 @@ class RalphUserAPITests(RalphAPITestCase):
         }
         response = self.client.patch(url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class RegionsIdsTest(TestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.region_pl = RegionFactory(name='pl')
+        self.region_de = RegionFactory(name='de')
+        self.user.regions.add(self.region_pl)
+
+    def test_regions_ids_are_memoized(self):
+        self.assertEqual(self.user.regions_ids, [self.region_pl.id])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.user.regions_ids, [self.region_pl.id])
+
+    def test_regions_ids_are_refreshed_after_change(self):
+        self.assertEqual(self.user.regions_ids, [self.region_pl.id])
+        self.user.regions.add(self.region_de)
+        self.assertCountEqual(
+            self.user.regions_ids, [self.region_pl.id, self.region_de.id]
+        )
+
+    @override_settings(USER_REGIONS_CACHE=True)
+    def test_regions_ids_cache_invalidated_on_region_change(self):
+        cache.clear()
+        self.assertEqual(self.user.regions_ids, [self.region_pl.id])
+        user = RalphUser.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(user.regions_ids, [self.region_pl.id])
+        self.region_de.users.add(self.user)
+        user = RalphUser.objects.get(pk=self.user.pk)
+        self.assertCountEqual(
+            user.regions_ids, [self.region_pl.id, self.region_de.id]
+        )
+        self.region_pl.delete()
+        user = RalphUser.objects.get(pk=self.user.pk)
+        self.assertEqual(user.regions_ids, [self.region_de.id])
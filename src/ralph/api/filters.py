@@ -1,7 +1,7 @@
 import inspect
 import logging
 import operator
-from functools import reduce
+from functools import lru_cache, reduce
 
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import FieldDoesNotExist
@@ -16,6 +16,27 @@ from ralph.lib.mixins.models import TaggableMixin
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=4096)
+def _get_field_lookups(filter_backend_class, model, field_path):
+    """
+    Return lookups (set) available for field of `model` referenced by
+    `field_path` (using `field_type_lookups` of filter backend class) or None
+    if there is no such field.
+
+    Result is cached, so resolving fields and checking type of field is done
+    only once for every model and field path.
+    """
+    try:
+        model_field = get_field_by_relation_path(model, field_path)
+    except FieldDoesNotExist:
+        return None
+    field_lookups = set()
+    # process every class from which field is inheriting
+    for cl in inspect.getmro(model_field.__class__):
+        field_lookups |= filter_backend_class.field_type_lookups.get(cl, set())
+    return frozenset(field_lookups)
+
+
 class AdditionalDjangoFilterBackend(DjangoFilterBackend):
     """
     Allows to spcify additional FilterSet for viewset (besides standard one,
@@ -144,25 +165,20 @@ class LookupFilterBackend(BaseFilterBackend):
             field path is not valid or lookup for field is not valid.
         """
         result = {}
-        logger.debug('Validating {}__{} lookup for model {}; value: {}'.format(
+        logger.debug(
+            'Validating %s__%s lookup for model %s; value: %s',
             model_field_name, lookup, model, value
-        ))
-        try:
-            model_field = get_field_by_relation_path(
-                model, model_field_name
-            )
-        except FieldDoesNotExist:
-            logger.debug(
-                '{} not found for model {}'.format(model_field_name, model)
-            )
+        )
+        field_lookups = _get_field_lookups(
+            self.__class__, model, model_field_name
+        )
+        if field_lookups is None:
+            logger.debug('%s not found for model %s', model_field_name, model)
         else:
-            field_lookups = set()
-            # process every class from which field is inheriting
-            for cl in inspect.getmro(model_field.__class__):
-                field_lookups |= self.field_type_lookups.get(cl, set())
-            logger.debug('Available lookups for {}.{} : {}'.format(
+            logger.debug(
+                'Available lookups for %s.%s : %s',
                 model, model_field_name, field_lookups
-            ))
+            )
             if lookup in field_lookups:
                 result = {'{}__{}'.format(model_field_name, lookup): value}
         return result
@@ -190,13 +206,11 @@ class LookupFilterBackend(BaseFilterBackend):
         result = []
         kw_result = {}
         logger.debug(
-            'Processing {} filters with filter fields={} and extended filter '
-            'fields={}'.format(model, filter_fields, extended_filter_fields)
+            'Processing %s filters with filter fields=%s and extended filter '
+            'fields=%s', model, filter_fields, extended_filter_fields
         )
         for field_name, value in request.query_params.items():
-            logger.debug(
-                'Processing query param {}:{}'.format(field_name, value)
-            )
+            logger.debug('Processing query param %s:%s', field_name, value)
             model_field_name, _, lookup = field_name.rpartition('__')
 
             # try if this field search could be expanded to other fields
@@ -213,9 +227,10 @@ class LookupFilterBackend(BaseFilterBackend):
                     )
                 )
             if extended_filters:
-                logger.debug('Using {} extended filters for query {}:{}'.format(
+                logger.debug(
+                    'Using %s extended filters for query %s:%s',
                     extended_filters, field_name, value
-                ))
+                )
                 result.append(reduce(
                     operator.or_,
                     [models.Q(**{k: v}) for k, v in extended_filters.items()]
@@ -226,9 +241,10 @@ class LookupFilterBackend(BaseFilterBackend):
                 filters = self._validate_single_query_lookup(
                     model, model_field_name, lookup, value
                 )
-                logger.debug('Using {} filters for query {}:{}'.format(
+                logger.debug(
+                    'Using %s filters for query %s:%s',
                     filters, field_name, value
-                ))
+                )
                 kw_result.update(filters)
         return result, kw_result
 
@@ -246,27 +262,31 @@ class LookupFilterBackend(BaseFilterBackend):
 class PolymorphicDescendantsFilterBackend(LookupFilterBackend):
     """
     Filter descendants of polymorphic models (especially by extended filters).
+
+    Objects matching filters in every model are selected by subquery (not
+    fetched), so filtering is done entirely by the database.
     """
     def _process_model(
         self, model, request, filter_fields, extended_filter_fields
     ):
-        ids = set()
-        is_lookup_used = False
+        """
+        Returns subquery selecting pks of `model` objects matching lookups
+        from query params or None if none of lookups is applicable to model.
+        """
         lookups, kw_lookups = self._validate_query_lookups(
             model, request, filter_fields, extended_filter_fields
         )
         if lookups or kw_lookups:
-            is_lookup_used = True
-            ids = set(model.objects.filter(
+            return model.objects.filter(
                 *lookups, **kw_lookups
-            ).values_list('pk', flat=True))
-        return ids, is_lookup_used
+            ).values('pk')
+        return None
 
-    def _get_polymorphic_ids(
+    def _get_polymorphic_filter(
         self, base_model, polymorphic_models, request, view
     ):
         """
-        Returns ids of polymorphic objects based on query filters.
+        Returns filter for polymorphic objects based on query filters.
 
         Args:
             base_model: (polymorphic) parent model
@@ -275,22 +295,17 @@ class PolymorphicDescendantsFilterBackend(LookupFilterBackend):
             request: current request
             view: current view
 
-        Returns: tuple (
-            * set of ids,
-            * True if at least one of the lookups was applied
-        )
+        Returns: Q object selecting objects matching filters in any model or
+            None if none of the lookups was applied.
         """
-        ids = set()
-        is_lookup_used = False
+        subqueries = []
 
         # process base model
         # used only with extended filters
-        model_ids, model_is_lookup_used = self._process_model(
+        subqueries.append(self._process_model(
             base_model, request, view.filter_fields,
             getattr(view, 'extended_filter_fields', {})
-        )
-        ids |= model_ids
-        is_lookup_used |= model_is_lookup_used
+        ))
         for model in polymorphic_models:
             filter_fields = []
             model_viewset = view._viewsets_registry.get(model)
@@ -301,25 +316,32 @@ class PolymorphicDescendantsFilterBackend(LookupFilterBackend):
                 # if not filter_fields from API viewset get fields
                 # from django model admin
                 filter_fields = ralph_site._registry[model].search_fields
-
-            model_ids, model_is_lookup_used = self._process_model(
+            # descendants which don't expose any of filtered fields are
+            # skipped (subquery is None)
+            subqueries.append(self._process_model(
                 model, request, filter_fields, {}
-            )
-            ids |= model_ids
-            is_lookup_used |= model_is_lookup_used
-        return ids, is_lookup_used
+            ))
+        subqueries = [
+            subquery for subquery in subqueries if subquery is not None
+        ]
+        if not subqueries:
+            return None
+        return reduce(
+            operator.or_,
+            [models.Q(pk__in=subquery) for subquery in subqueries]
+        )
 
     def filter_queryset(self, request, queryset, view):
         polymorphic_descendants = getattr(
             queryset.model, '_polymorphic_descendants', []
         )
         if polymorphic_descendants:
-            ids, is_lookup_used = self._get_polymorphic_ids(
+            polymorphic_filter = self._get_polymorphic_filter(
                 queryset.model, polymorphic_descendants, request, view
             )
-            if is_lookup_used:
+            if polymorphic_filter is not None:
                 logger.debug(
                     'Applying PolymorphicDescendantsFilterBackend filters'
                 )
-                queryset = queryset.filter(pk__in=list(ids))
+                queryset = queryset.filter(polymorphic_filter)
         return queryset
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+import base64
+import json
+from collections import OrderedDict
+from datetime import datetime
+
+from django.core.exceptions import FieldDoesNotExist
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import models
+from django.utils.dateparse import parse_datetime
+from django.utils.translation import ugettext_lazy as _
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(LimitOffsetPagination):
+    """
+    Keyset (cursor) pagination - every page is selected by filtering objects
+    placed after the last object of previous page (instead of skipping
+    `offset` objects), so fetching each page costs the same and rows are not
+    skipped or duplicated under concurrent writes.
+
+    Objects are ordered by `id`. When `since` (ISO datetime or unix timestamp)
+    is passed, only objects modified since then are returned (ordered by
+    `modified` and `id`), which allows incremental synchronization. Number of
+    objects on page is controlled by `limit` (as in limit-offset pagination).
+
+    Response contains link to the `next` page (None for the last page) and
+    `results`. Custom ordering (`ordering` query param) is not supported.
+    """
+    cursor_query_param = 'cursor'
+    since_query_param = 'since'
+    invalid_cursor_message = _('Invalid cursor')
+
+    @classmethod
+    def is_requested(cls, request):
+        return (
+            cls.cursor_query_param in request.query_params or
+            cls.since_query_param in request.query_params
+        )
+
+    def get_since(self, request, model):
+        since = request.query_params.get(self.since_query_param)
+        if since is None:
+            return None
+        try:
+            model._meta.get_field('modified')
+        except FieldDoesNotExist:
+            raise ValidationError({
+                self.since_query_param: _('Not supported for this resource')
+            })
+        try:
+            return datetime.fromtimestamp(float(since))
+        # timestamp could be out of range of datetime (ex. `inf`)
+        except (ValueError, OverflowError, OSError):
+            pass
+        try:
+            result = parse_datetime(since)
+        except ValueError:
+            result = None
+        if result is None:
+            raise ValidationError({
+                self.since_query_param: _(
+                    'Expected ISO 8601 datetime or unix timestamp'
+                )
+            })
+        return result
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            position = json.loads(
+                base64.urlsafe_b64decode(encoded.encode('ascii')).decode()
+            )
+            # cursor could be crafted by the client - validate types of all
+            # values here (invalid value used in filter would cause 500)
+            if (
+                not isinstance(position, list) or
+                len(position) != len(self.ordering)
+            ):
+                raise ValueError()
+            position[-1] = model._meta.pk.to_python(position[-1])
+            if self.since is not None:
+                if not isinstance(position[0], str):
+                    raise ValueError()
+                position[0] = parse_datetime(position[0])
+                if position[0] is None:
+                    raise ValueError()
+        except (TypeError, ValueError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+    def encode_cursor(self, obj):
+        position = [getattr(obj, field) for field in self.ordering]
+        if self.since is not None:
+            position[0] = position[0].isoformat()
+        return base64.urlsafe_b64encode(
+            json.dumps(position).encode()
+        ).decode('ascii')
+
+    def get_cursor_filter(self, position):
+        if self.since is not None:
+            modified, pk = position
+            return (
+                models.Q(modified__gt=modified) |
+                models.Q(modified=modified, pk__gt=pk)
+            )
+        return models.Q(pk__gt=position[0])
+
+    def check_ordering(self, request):
+        if api_settings.ORDERING_PARAM in request.query_params:
+            raise ValidationError({
+                api_settings.ORDERING_PARAM: _(
+                    'Not supported together with cursor or since'
+                )
+            })
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.check_ordering(request)
+        self.limit = self.get_limit(request)
+        self.since = self.get_since(request, queryset.model)
+        if self.since is not None:
+            self.ordering = ('modified', 'pk')
+            queryset = queryset.filter(modified__gte=self.since)
+        else:
+            self.ordering = ('pk',)
+        position = self.decode_cursor(request, queryset.model)
+        if position is not None:
+            queryset = queryset.filter(self.get_cursor_filter(position))
+        # fetch one additional object to check if there is next page
+        results = list(queryset.order_by(*self.ordering)[:self.limit + 1])
+        self.next_cursor = None
+        if len(results) > self.limit:
+            results = results[:self.limit]
+            self.next_cursor = self.encode_cursor(results[-1])
+        return results
+
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.next_cursor
+        )
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data)
+        ]))
+
+
+class RalphPagination(LimitOffsetPagination):
+    """
+    Limit-offset pagination, switched to `KeysetPagination` when `cursor` or
+    `since` query param is passed (use empty `cursor` to get the first page).
+    """
+    keyset_pagination_class = KeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset_pagination = None
+        if self.keyset_pagination_class.is_requested(request):
+            self.keyset_pagination = self.keyset_pagination_class()
+            return self.keyset_pagination.paginate_queryset(
+                queryset, request, view
+            )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset_pagination:
+            return self.keyset_pagination.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 import logging
 import operator
-from functools import reduce
+from functools import lru_cache, reduce
 
 import reversion
 from django.core.exceptions import ValidationError as DjangoValidationError
@@ -20,6 +20,7 @@ from taggit_serializer.serializers import (
 
 from ralph.api.fields import ReversedChoiceField
 from ralph.api.relations import RalphHyperlinkedRelatedField, RalphRelatedField
+from ralph.api.utils import SparseFieldsets
 from ralph.lib.mixins.models import TaggableMixin
 from ralph.lib.permissions.api import (
     PermissionsPerFieldSerializerMixin,
@@ -91,6 +92,8 @@ class RalphAPISerializerMixin(
           `PermissionsPerFieldSerializerMixin`)
         * use `ReversedChoiceField` as default serializer for choice field
         * request and user object easily accessible in each related serializer
+        * pruning fields (and nested objects) not selected by client (see
+          `ralph.api.utils.SparseFieldsets`)
     """
     serializer_choice_field = ReversedChoiceField
 
@@ -119,6 +122,22 @@ class RalphAPISerializerMixin(
             super().get_default_field_names(declared_fields, model_info)
         )
 
+    def get_sparse_fieldsets(self):
+        """
+        Return fields selected by client. It's applied only in main (root)
+        serializer - nested serializers are pruned by it.
+        """
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        if parent is not None:
+            return None
+        if not hasattr(self, '_sparse_fieldsets'):
+            self._sparse_fieldsets = SparseFieldsets.from_request(
+                self.context.get('request')
+            )
+        return self._sparse_fieldsets
+
     def get_fields(self, *args, **kwargs):
         """
         Bind every returned field to self (as a parent)
@@ -128,6 +147,9 @@ class RalphAPISerializerMixin(
         for field_name, field in fields.items():
             if not field.parent:
                 field.parent = self
+        sparse_fieldsets = self.get_sparse_fieldsets()
+        if sparse_fieldsets:
+            sparse_fieldsets.prune_fields(fields)
         return fields
 
     def build_field(self, field_name, info, model_class, nested_depth):
@@ -135,6 +157,9 @@ class RalphAPISerializerMixin(
         Attach context with request to every nested field which is another
         serializer.
         """
+        sparse_fieldsets = self.get_sparse_fieldsets()
+        if sparse_fieldsets and sparse_fieldsets.depth is not None:
+            nested_depth = min(nested_depth, sparse_fieldsets.depth)
         field_class, field_kwargs = super().build_field(
             field_name, info, model_class, nested_depth
         )
@@ -148,29 +173,12 @@ class RalphAPISerializerMixin(
         """
         Nested serializer is inheriting from `RalphAPISerializer`.
         """
-        class NestedMeta:
-            model = relation_info.related_model
-            depth = nested_depth - 1
-            # don't register this serializer as main model serializer
-            exclude_from_registry = True
-            exclude = []
-
-        # exclude some fields from nested serializer
-        for field in NESTED_SERIALIZER_FIELDS_BLACKLIST:
-            try:
-                relation_info.related_model._meta.get_field_by_name(field)
-            except exceptions.FieldDoesNotExist:
-                pass
-            else:
-                NestedMeta.exclude.append(field)
-
-        class NestedSerializer(RalphAPISerializer):
-            Meta = NestedMeta
-
         field_class, field_kwargs = super().build_nested_field(
             field_name, relation_info, nested_depth
         )
-        field_class = NestedSerializer
+        field_class = get_nested_serializer_class(
+            relation_info.related_model, nested_depth - 1
+        )
         return field_class, field_kwargs
 
 
@@ -211,6 +219,16 @@ class RalphAPISaveSerializer(
             field_kwargs.setdefault('style', {})['base_template'] = 'input.html'
         return field_class, field_kwargs
 
+    @classmethod
+    def _get_model_field_info(cls):
+        """
+        Return model fields info (computed once for every serializer class -
+        models don't change at runtime).
+        """
+        if '_model_field_info' not in cls.__dict__:
+            cls._model_field_info = model_meta.get_field_info(cls.Meta.model)
+        return cls._model_field_info
+
     def _validate_model_clean(self, attrs):
         """
         Run validation using model's clean method.
@@ -219,7 +237,7 @@ class RalphAPISaveSerializer(
         ModelClass = self.Meta.model
         # Remove many-to-many relationships from validated_data.
         # They are not valid arguments to the model initializer.
-        info = model_meta.get_field_info(ModelClass)
+        info = self._get_model_field_info()
         for field_name, relation_info in info.relations.items():
             if relation_info.to_many and (field_name in data):
                 data.pop(field_name)
@@ -282,3 +300,32 @@ class RalphAPISerializer(
     metaclass=RalphAPISerializerMetaclass
 ):
     pass
+
+
+@lru_cache(maxsize=None)
+def get_nested_serializer_class(model, depth):
+    """
+    Return serializer of `model` used as nested field (class is created once
+    for every model and depth).
+    """
+    class NestedMeta:
+        # don't register this serializer as main model serializer
+        exclude_from_registry = True
+        exclude = []
+
+    NestedMeta.model = model
+    NestedMeta.depth = depth
+
+    # exclude some fields from nested serializer
+    for field in NESTED_SERIALIZER_FIELDS_BLACKLIST:
+        try:
+            model._meta.get_field_by_name(field)
+        except exceptions.FieldDoesNotExist:
+            pass
+        else:
+            NestedMeta.exclude.append(field)
+
+    class NestedSerializer(RalphAPISerializer):
+        Meta = NestedMeta
+
+    return NestedSerializer
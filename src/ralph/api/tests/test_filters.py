@@ -1,13 +1,18 @@
 # -*- coding: utf-8 -*-
 from datetime import date
 from decimal import Decimal
+from unittest.mock import patch
 from urllib.parse import urlencode
 
 from django.contrib.auth import get_user_model
 from django.http import QueryDict
 from rest_framework.test import APIClient, APIRequestFactory
 
-from ralph.api.filters import ExtendedFiltersBackend, LookupFilterBackend
+from ralph.api.filters import (
+    _get_field_lookups,
+    ExtendedFiltersBackend,
+    LookupFilterBackend
+)
 from ralph.api.tests.api import (
     Bar,
     BarViewSet,
@@ -143,6 +148,21 @@ class TestLookupFilterBackend(RalphTestCase):
             request, Bar.objects.all(), bvs)
         ), 3)
 
+    def test_field_lookups_are_resolved_once(self):
+        _get_field_lookups.cache_clear()
+        request = self.request_factory.get('/api/bar')
+        bvs = BarViewSet()
+        request.query_params = QueryDict(urlencode({'count__gte': 2}))
+        bvs.request = request
+        self.lookup_filter.filter_queryset(request, Bar.objects.all(), bvs)
+        with patch(
+            'ralph.api.filters.get_field_by_relation_path'
+        ) as get_field_mock:
+            self.assertEqual(len(self.lookup_filter.filter_queryset(
+                request, Bar.objects.all(), bvs)
+            ), 2)
+        self.assertFalse(get_field_mock.called)
+
     def test_query_filters_datetimefield(self):
         request = self.request_factory.get('/api/bar')
         bvs = BarViewSet()
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+import base64
+import datetime
+import json
+
+from ddt import data, ddt
+from django.core.urlresolvers import reverse
+
+from ralph.api.tests._base import RalphAPITestCase
+from ralph.assets.models.assets import Manufacturer
+from ralph.assets.tests.factories import ManufacturerFactory
+
+
+def _encode_cursor(position):
+    return base64.urlsafe_b64encode(
+        json.dumps(position).encode()
+    ).decode('ascii')
+
+
+@ddt
+class KeysetPaginationTest(RalphAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.manufacturers = ManufacturerFactory.create_batch(5)
+        self.url = reverse('manufacturer-list')
+
+    def _fetch_all(self, url):
+        ids = []
+        while url:
+            response = self.client.get(url, format='json')
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('count', response.data)
+            ids.extend(obj['id'] for obj in response.data['results'])
+            url = response.data['next']
+        return ids
+
+    def test_cursor_pagination(self):
+        ids = self._fetch_all('{}?cursor=&limit=2'.format(self.url))
+        self.assertEqual(ids, sorted(m.pk for m in self.manufacturers))
+
+    def test_cursor_pagination_with_filters(self):
+        ids = self._fetch_all('{}?cursor=&limit=2&name={}'.format(
+            self.url, self.manufacturers[3].name
+        ))
+        self.assertEqual(ids, [self.manufacturers[3].pk])
+
+    def test_since(self):
+        old = self.manufacturers[:2]
+        Manufacturer.objects.filter(pk__in=[m.pk for m in old]).update(
+            modified=datetime.datetime(2010, 1, 1)
+        )
+        ids = self._fetch_all('{}?since=2015-01-01T00:00:00&limit=2'.format(
+            self.url
+        ))
+        self.assertCountEqual(ids, [m.pk for m in self.manufacturers[2:]])
+
+    def test_since_timestamp(self):
+        since = datetime.datetime.now() + datetime.timedelta(days=1)
+        response = self.client.get(
+            '{}?since={}'.format(self.url, since.timestamp()), format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'], [])
+        self.assertIsNone(response.data['next'])
+
+    def test_invalid_since(self):
+        response = self.client.get(
+            '{}?since=yesterday'.format(self.url), format='json'
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(
+            '{}?cursor=invalid'.format(self.url), format='json'
+        )
+        self.assertEqual(response.status_code, 404)
+
+    @data('inf', '1e20', '-1e20', 'nan')
+    def test_since_out_of_range(self, since):
+        response = self.client.get(
+            '{}?since={}'.format(self.url, since), format='json'
+        )
+        self.assertEqual(response.status_code, 400)
+
+    @data([{'a': 1}], ['abc'], {'0': 1}, [[1]], 1, [1, 2])
+    def test_crafted_cursor(self, position):
+        response = self.client.get(
+            '{}?cursor={}'.format(self.url, _encode_cursor(position)),
+            format='json'
+        )
+        self.assertEqual(response.status_code, 404)
+
+    @data([{'a': 1}, 1], [1, 1], ['2016-01-01T00:00:00', 'abc'])
+    def test_crafted_cursor_with_since(self, position):
+        response = self.client.get(
+            '{}?since=0&cursor={}'.format(
+                self.url, _encode_cursor(position)
+            ),
+            format='json'
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_cursor_pagination_with_ordering(self):
+        response = self.client.get(
+            '{}?cursor=&ordering=name'.format(self.url), format='json'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('ordering', response.data)
+
+    def test_limit_offset_pagination_by_default(self):
+        response = self.client.get(self.url, format='json')
+        self.assertEqual(response.data['count'], 5)
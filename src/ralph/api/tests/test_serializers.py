@@ -10,6 +10,7 @@ from ralph.accounts.tests.factories import RegionFactory
 from ralph.api.relations import RalphHyperlinkedRelatedField, RalphRelatedField
 from ralph.api.tests._base import RalphAPITestCase
 from ralph.api.tests.api import CarSerializer, CarSerializer2, FooSerializer
+from ralph.api.utils import parse_fields_tree, SparseFieldsets
 from ralph.back_office.tests.factories import BackOfficeAssetFactory
 from ralph.licences.models import BaseObjectLicence
 from ralph.licences.tests.factories import LicenceFactory
@@ -94,6 +95,18 @@ class TestRalphSerializer(RalphAPITestCase):
         self.assertIs(fields['year'].context['request'], request)
         self.assertIs(fields['manufacturer'].context['request'], request)
 
+    def test_nested_serializer_class_is_reused(self):
+        request = self.request_factory.get('/api/cars')
+        fields = CarSerializer(
+            instance=self.car, context={'request': request}
+        ).get_fields()
+        fields2 = CarSerializer(
+            instance=self.car, context={'request': request}
+        ).get_fields()
+        self.assertIs(
+            fields['manufacturer'].__class__, fields2['manufacturer'].__class__
+        )
+
     def test_reversion_history_save(self):
         response = self.client.post(
             '/test-ralph-api/foos/', data={'bar': 'bar_name'}
@@ -129,3 +142,65 @@ class TestRalphSerializer(RalphAPITestCase):
         self.assertIn(
             '"licence": {}'.format(licence.id), history[0].serialized_data
         )
+
+
+class TestSparseFieldsets(RalphAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.manufacturer = Manufacturer.objects.create(
+            name='Tesla', country='USA'
+        )
+        self.car = Car.objects.create(
+            manufacturer=self.manufacturer, name='S', year=2012
+        )
+        self.url = '/test-ralph-api/cars/{}/'.format(self.car.id)
+
+    def test_fields(self):
+        response = self.client.get(self.url + '?fields=id,name')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data), {'id', 'name'})
+
+    def test_nested_fields(self):
+        response = self.client.get(self.url + '?fields=name,manufacturer.name')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data), {'name', 'manufacturer'})
+        self.assertEqual(response.data['manufacturer'], {'name': 'Tesla'})
+
+    def test_exclude(self):
+        response = self.client.get(
+            self.url + '?exclude=year,manufacturer.country'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('year', response.data)
+        self.assertIn('name', response.data)
+        self.assertNotIn('country', response.data['manufacturer'])
+        self.assertIn('name', response.data['manufacturer'])
+
+    def test_depth(self):
+        response = self.client.get(self.url + '?depth=0')
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response.data['manufacturer'], str)
+
+    def test_invalid_depth(self):
+        response = self.client.get(self.url + '?depth=-1')
+        self.assertEqual(response.status_code, 400)
+
+    def test_lookups_pruning(self):
+        sparse_fieldsets = SparseFieldsets(
+            fields=parse_fields_tree('name,service_env.service.name'),
+            exclude=parse_fields_tree('service_env.service.environments'),
+        )
+        self.assertEqual(
+            sparse_fieldsets.prune_lookups([
+                'rack',
+                'service_env',
+                'service_env__service',
+                'service_env__service__environments',
+                'service_env__environment',
+            ]),
+            ['service_env', 'service_env__service']
+        )
+        self.assertEqual(
+            SparseFieldsets(depth=0).prune_lookups(['rack', 'rack__room']),
+            ['rack']
+        )
@@ -1,6 +1,5 @@
 # -*- coding: utf-8 -*-
-from datetime import date
-from decimal import Decimal
+from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
 from rest_framework import relations
@@ -17,6 +16,7 @@ from ralph.api.tests.api import (
 from ralph.api.viewsets import RalphAPIViewSet
 from ralph.tests import RalphTestCase
 from ralph.tests.factories import ManufacturerFactory
+from ralph.tests.models import Manufacturer
 
 
 class ViewsetWithoutRalphPermission(RalphAPIViewSet):
@@ -73,6 +73,16 @@ class TestRalphViewset(RalphTestCase):
             relations.PrimaryKeyRelatedField
         )
 
+    def test_get_serializer_class_should_reuse_dynamic_class(self):
+        request = self.request_factory.post('/')
+        cvs = CarViewSet()
+        cvs.request = request
+        cvs2 = CarViewSet()
+        cvs2.request = request
+        self.assertIs(
+            cvs.get_serializer_class(), cvs2.get_serializer_class()
+        )
+
     def test_get_serializer_class_should_return_defined_when_not_safe_request_and_save_serializer_class_defined(self):  # noqa
         request = self.request_factory.patch('/')
         mvs = ManufacturerViewSet()
@@ -84,6 +94,113 @@ class TestRalphViewset(RalphTestCase):
         self.assertListEqual(response.data['filtering'], ['name'])
 
 
+class TestBulkOperations(RalphTestCase):
+    url = '/test-ralph-api/manufacturers/bulk/'
+
+    def setUp(self):
+        super().setUp()
+        self.manufacturers = ManufacturerFactory.create_batch(3)
+        get_user_model().objects.create_superuser(
+            'test', 'test@test.test', 'test'
+        )
+        self.client = APIClient()
+        self.client.login(username='test', password='test')
+
+    def test_bulk_create(self):
+        data = [
+            {'name': 'm1', 'country': 'Poland'},
+            {'name': 'm2', 'country': 'Germany'},
+        ]
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            [item['name'] for item in response.data], ['m1', 'm2']
+        )
+        self.assertEqual(
+            Manufacturer.objects.filter(name__in=['m1', 'm2']).count(), 2
+        )
+
+    def test_bulk_create_should_not_save_anything_when_item_is_invalid(self):
+        data = [
+            {'name': 'm1', 'country': 'Poland'},
+            {'name': 'm2'},
+        ]
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data[0], {})
+        self.assertIn('country', response.data[1])
+        self.assertFalse(Manufacturer.objects.filter(name='m1').exists())
+
+    def test_bulk_create_should_accept_only_list(self):
+        response = self.client.post(
+            self.url, {'name': 'm1', 'country': 'Poland'}, format='json'
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_bulk_update(self):
+        data = [
+            {'id': manufacturer.id, 'country': 'Spain'}
+            for manufacturer in self.manufacturers[:2]
+        ]
+        response = self.client.patch(self.url, data, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            Manufacturer.objects.filter(country='Spain').count(), 2
+        )
+
+    def test_bulk_create_should_call_perform_create(self):
+        data = [
+            {'name': 'm1', 'country': 'Poland'},
+            {'name': 'm2', 'country': 'Germany'},
+        ]
+        with patch.object(
+            ManufacturerViewSet, 'perform_create',
+            side_effect=lambda serializer: serializer.save(country='Spain')
+        ) as perform_create:
+            response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(perform_create.call_count, 2)
+        self.assertEqual(
+            Manufacturer.objects.filter(country='Spain').count(), 2
+        )
+
+    def test_bulk_update_should_call_perform_update(self):
+        data = [
+            {'id': manufacturer.id, 'country': 'Spain'}
+            for manufacturer in self.manufacturers[:2]
+        ]
+        with patch.object(
+            ManufacturerViewSet, 'perform_update',
+            side_effect=lambda serializer: serializer.save(name='updated')
+        ) as perform_update:
+            response = self.client.patch(self.url, data, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(perform_update.call_count, 2)
+        self.assertEqual(
+            Manufacturer.objects.filter(name='updated').count(), 2
+        )
+
+    def test_bulk_update_not_found(self):
+        data = [
+            {'id': self.manufacturers[0].id, 'country': 'Spain'},
+            {'id': 0, 'country': 'Spain'},
+        ]
+        response = self.client.patch(self.url, data, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data[0], {})
+        self.assertIn('id', response.data[1])
+        self.assertFalse(Manufacturer.objects.filter(country='Spain').exists())
+
+    def test_bulk_destroy(self):
+        data = [manufacturer.id for manufacturer in self.manufacturers[:2]]
+        response = self.client.delete(self.url, data, format='json')
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(
+            list(Manufacturer.objects.values_list('id', flat=True)),
+            [self.manufacturers[2].id]
+        )
+
+
 class TestAdminSearchFieldsMixin(RalphTestCase):
     def test_get_filter_fields_from_admin(self):
         cvs = CarViewSet()
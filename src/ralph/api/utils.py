@@ -1,13 +1,130 @@
 import logging
 
 from django.db import models
-from rest_framework import serializers
+from django.db.models.constants import LOOKUP_SEP
+from django.utils.translation import ugettext_lazy as _
+from rest_framework import permissions, serializers
+from rest_framework.exceptions import ValidationError
 
 from ralph.admin.sites import ralph_site
 
 logger = logging.getLogger('__name__')
 
 
+def parse_fields_tree(value):
+    """
+    Convert comma-separated list of field paths (nested fields separated by
+    dot, ex. `service_env.service.name`) into tree of dicts (empty dict is
+    a leaf - whole field).
+    """
+    tree = {}
+    for path in value.split(','):
+        node = tree
+        for name in filter(None, path.strip().split('.')):
+            node = node.setdefault(name, {})
+    return tree
+
+
+class SparseFieldsets(object):
+    """
+    Fields of API response selected by client using query params:
+        * `fields` - list of fields to return (nested fields after dot, ex.
+          `?fields=hostname,service_env.service.name`)
+        * `exclude` - list of fields to skip (in the same format)
+        * `depth` - max depth of (automatically) nested objects - deeper
+          relations are returned as links
+
+    Pruned fields are removed from serializers (see `RalphAPISerializerMixin`)
+    and relations used only by them are not fetched at all (see
+    `QuerysetRelatedMixin`).
+    """
+    fields_query_param = 'fields'
+    exclude_query_param = 'exclude'
+    depth_query_param = 'depth'
+
+    def __init__(self, fields=None, exclude=None, depth=None):
+        self.fields = fields or {}
+        self.exclude = exclude or {}
+        self.depth = depth
+
+    @classmethod
+    def from_request(cls, request):
+        """
+        Return `SparseFieldsets` for (safe) request or None if client didn't
+        ask for it.
+        """
+        if request is None or request.method not in permissions.SAFE_METHODS:
+            return None
+        # `GET` instead of `query_params` to handle Django requests too
+        params = request.GET
+        fields = parse_fields_tree(params.get(cls.fields_query_param, ''))
+        exclude = parse_fields_tree(params.get(cls.exclude_query_param, ''))
+        depth = params.get(cls.depth_query_param)
+        if depth is not None:
+            try:
+                depth = int(depth)
+                if depth < 0:
+                    raise ValueError()
+            except ValueError:
+                raise ValidationError({
+                    cls.depth_query_param: _('Expected non-negative integer')
+                })
+        if not fields and not exclude and depth is None:
+            return None
+        return cls(fields, exclude, depth)
+
+    def is_lookup_needed(self, lookup):
+        """
+        Check if relation (`select_related` or `prefetch_related` lookup) is
+        used by any of selected fields.
+        """
+        lookup = getattr(lookup, 'prefetch_to', lookup)
+        path = lookup.split(LOOKUP_SEP)
+        if self.depth is not None and len(path) > self.depth + 1:
+            return False
+        node = self.fields
+        for name in path:
+            if not node:
+                break
+            if name not in node:
+                return False
+            node = node[name]
+        node = self.exclude
+        for name in path:
+            if name not in node:
+                break
+            node = node[name]
+            if not node:
+                return False
+        return True
+
+    def prune_lookups(self, lookups):
+        return [lookup for lookup in lookups if self.is_lookup_needed(lookup)]
+
+    def prune_fields(self, fields):
+        """
+        Remove not selected fields from (serializer) fields dict.
+        """
+        self._prune_fields(fields, self.fields, self.exclude)
+
+    def _prune_fields(self, fields, include, exclude):
+        for name, field in list(fields.items()):
+            sub_include = include.get(name)
+            sub_exclude = exclude.get(name)
+            if (
+                (include and sub_include is None) or
+                (sub_exclude is not None and not sub_exclude)
+            ):
+                del fields[name]
+                continue
+            if sub_include or sub_exclude:
+                nested = getattr(field, 'child', field)
+                if isinstance(nested, serializers.Serializer):
+                    self._prune_fields(
+                        nested.fields, sub_include or {}, sub_exclude or {}
+                    )
+
+
 class QuerysetRelatedMixin(object):
     """
     Allow to specify select_related and prefetch_related for queryset.
@@ -37,12 +154,23 @@ class QuerysetRelatedMixin(object):
                 self.select_related.extend(admin_site.list_select_related)
         super().__init__(*args, **kwargs)
 
+    def get_sparse_fieldsets(self):
+        return SparseFieldsets.from_request(getattr(self, 'request', None))
+
     def get_queryset(self):
         queryset = super().get_queryset()
-        if self.select_related:
-            queryset = queryset.select_related(*self.select_related)
-        if self.prefetch_related:
-            queryset = queryset.prefetch_related(*self.prefetch_related)
+        select_related = self.select_related
+        prefetch_related = self.prefetch_related
+        sparse_fieldsets = self.get_sparse_fieldsets()
+        if sparse_fieldsets:
+            select_related = sparse_fieldsets.prune_lookups(select_related)
+            prefetch_related = sparse_fieldsets.prune_lookups(
+                prefetch_related
+            )
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
         return queryset
 
 
@@ -51,24 +179,43 @@ class PolymorphicViewSetMixin(QuerysetRelatedMixin):
     ViewSet for polymorphic models - for each descendant model, dedicated
     serializer for this model is used. This ViewSet is working together with
     `PolymorphicSerializer`.
+
+    Descendant models listed in `polymorphic_join` (model names) are fetched
+    in the same query as base objects (see
+    `PolymorphicQuerySet.polymorphic_join`).
     """
+    polymorphic_join = None
+
     def get_queryset(self):
         queryset = super().get_queryset()
         polymorphic_select_related = {}
         polymorphic_prefetch_related = {}
+        sparse_fieldsets = self.get_sparse_fieldsets()
         for model, view in self._viewsets_registry.items():
             if model in queryset.model._polymorphic_descendants:
+                select_related = view.select_related or []
+                prefetch_related = view.prefetch_related or []
+                if sparse_fieldsets:
+                    select_related = sparse_fieldsets.prune_lookups(
+                        select_related
+                    )
+                    prefetch_related = sparse_fieldsets.prune_lookups(
+                        prefetch_related
+                    )
                 polymorphic_select_related[model._meta.object_name] = (
-                    view.select_related
+                    select_related
                 )
                 polymorphic_prefetch_related[model._meta.object_name] = (
-                    view.prefetch_related
+                    prefetch_related
                 )
-        return queryset.polymorphic_select_related(
+        queryset = queryset.polymorphic_select_related(
             **polymorphic_select_related
         ).polymorphic_prefetch_related(
             **polymorphic_prefetch_related
         )
+        if self.polymorphic_join:
+            queryset = queryset.polymorphic_join(*self.polymorphic_join)
+        return queryset
 
     def get_serializer(self, *args, **kwargs):
         serializer_class = self.get_serializer_class()
@@ -1,8 +1,22 @@
 # -*- coding: utf-8 -*-
 import inspect
+from functools import lru_cache
 
+import reversion
+from django.conf import settings
 from django.contrib.admin import SimpleListFilter
-from rest_framework import filters, permissions, relations, viewsets
+from django.db import transaction
+from django.utils.translation import ugettext_lazy as _
+from rest_framework import (
+    filters,
+    permissions,
+    relations,
+    status,
+    viewsets
+)
+from rest_framework.decorators import list_route
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
 
 from ralph.admin.sites import ralph_site
 from ralph.api.filters import (
@@ -103,24 +117,166 @@ class RalphAPIViewSetMixin(QuerysetRelatedMixin, AdminSearchFieldsMixin):
             if self.save_serializer_class:
                 return self.save_serializer_class
 
-            # create default class for save (POST, PUT etc.) serialization
-            # where every related field is serialized by it's primary key
-            class Meta(base_serializer.Meta):
-                model = self.queryset.model
-                depth = 0
-
-            return type(
-                '{}SaveSerializer'.format(Meta.model.__name__),
-                (RalphAPISaveSerializer,),
-                {
-                    'Meta': Meta,
-                    'serializer_choice_field': ReversedChoiceField,
-                    'serializer_related_field': relations.PrimaryKeyRelatedField
-                }
+            return get_save_serializer_class(
+                base_serializer, self.queryset.model
             )
         return base_serializer
 
 
+@lru_cache(maxsize=None)
+def get_save_serializer_class(base_serializer, model):
+    """
+    Create default class for save (POST, PUT etc.) serialization where every
+    related field is serialized by it's primary key (class is created once
+    for every serializer and model).
+    """
+    class Meta(base_serializer.Meta):
+        pass
+
+    Meta.model = model
+    Meta.depth = 0
+
+    return type(
+        '{}SaveSerializer'.format(model.__name__),
+        (RalphAPISaveSerializer,),
+        {
+            'Meta': Meta,
+            'serializer_choice_field': ReversedChoiceField,
+            'serializer_related_field': relations.PrimaryKeyRelatedField
+        }
+    )
+
+
+class BulkOperationsMixin(object):
+    """
+    Bulk create (POST), partial update (PATCH) and delete (DELETE) of many
+    objects in single request to `<resource>/bulk/`.
+
+    Payload is a list of items: objects data for create, objects data with
+    `id` for update and ids for delete. All items are validated first - if
+    any of them is invalid, nothing is saved and list of errors (one per
+    item, empty for valid items) is returned. Otherwise all items are saved
+    in single transaction and single reversion revision (using viewset's
+    `perform_create`, `perform_update` and `perform_destroy` for every item).
+    """
+    bulk_max_size = settings.API_BULK_MAX_SIZE
+
+    def _get_bulk_items(self, request):
+        items = request.data
+        if not isinstance(items, list):
+            raise ValidationError(_('Expected a list of items.'))
+        if len(items) > self.bulk_max_size:
+            raise ValidationError(
+                _('Too many items (max %(max_size)s).') % {
+                    'max_size': self.bulk_max_size
+                }
+            )
+        return items
+
+    def _get_item_id(self, item):
+        if isinstance(item, dict):
+            item = item.get('id')
+        return str(item) if isinstance(item, (int, str)) else None
+
+    def _get_bulk_instances(self, items):
+        """
+        Return list of objects (None for not found) for items (ids or dicts
+        with `id`). Objects are fetched in single query and user's
+        permissions to all of them are checked at once.
+        """
+        ids = [self._get_item_id(item) for item in items]
+        queryset = self.filter_queryset(self.get_queryset())
+        objects = {
+            str(obj.pk): obj
+            for obj in queryset.filter(pk__in=[pk for pk in ids if pk])
+        }
+        instances = [objects.get(pk) for pk in ids]
+        self.check_objects_permissions(
+            self.request, [obj for obj in instances if obj is not None]
+        )
+        return instances
+
+    def check_objects_permissions(self, request, objs):
+        for permission in self.get_permissions():
+            if hasattr(permission, 'has_objects_permission'):
+                allowed = permission.has_objects_permission(
+                    request, self, objs
+                )
+            else:
+                allowed = all(
+                    permission.has_object_permission(request, self, obj)
+                    for obj in objs
+                )
+            if not allowed:
+                self.permission_denied(request)
+
+    def _validate_bulk(self, serializers_list):
+        errors = [
+            {} if serializer.is_valid() else serializer.errors
+            for serializer in serializers_list
+        ]
+        if any(errors):
+            raise ValidationError(errors)
+
+    def bulk_create(self, request, items):
+        serializers_list = [self.get_serializer(data=item) for item in items]
+        self._validate_bulk(serializers_list)
+        with transaction.atomic(), reversion.create_revision():
+            reversion.set_user(request.user)
+            reversion.set_comment('API Bulk Create')
+            for serializer in serializers_list:
+                self.perform_create(serializer)
+        return Response(
+            [serializer.data for serializer in serializers_list],
+            status=status.HTTP_201_CREATED
+        )
+
+    def bulk_update(self, request, items):
+        instances = self._get_bulk_instances(items)
+        errors = [
+            {'id': [_('Not found.')]} if instance is None else {}
+            for instance in instances
+        ]
+        if any(errors):
+            raise ValidationError(errors)
+        serializers_list = [
+            self.get_serializer(instance, data=item, partial=True)
+            for instance, item in zip(instances, items)
+        ]
+        self._validate_bulk(serializers_list)
+        with transaction.atomic(), reversion.create_revision():
+            reversion.set_user(request.user)
+            reversion.set_comment('API Bulk Update')
+            for serializer in serializers_list:
+                self.perform_update(serializer)
+        return Response([serializer.data for serializer in serializers_list])
+
+    def bulk_destroy(self, request, items):
+        instances = self._get_bulk_instances(items)
+        errors = [
+            {'id': [_('Not found.')]} if instance is None else {}
+            for instance in instances
+        ]
+        if any(errors):
+            raise ValidationError(errors)
+        with transaction.atomic(), reversion.create_revision():
+            reversion.set_user(request.user)
+            reversion.set_comment('API Bulk Delete')
+            for instance in instances:
+                self.perform_destroy(instance)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @list_route(methods=['post', 'patch', 'delete'])
+    def bulk(self, request, *args, **kwargs):
+        items = self._get_bulk_items(request)
+        handler = {
+            'POST': self.bulk_create,
+            'PATCH': self.bulk_update,
+            'DELETE': self.bulk_destroy,
+        }[request.method]
+        return handler(request, items)
+
+
 _viewsets_registry = {}
 
 
@@ -140,6 +296,7 @@ class RalphAPIViewSetMetaclass(type):
 
 class RalphAPIViewSet(
     RalphAPIViewSetMixin,
+    BulkOperationsMixin,
     viewsets.ModelViewSet,
     metaclass=RalphAPIViewSetMetaclass
 ):
@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+from django.conf import settings
 from django.db.models import Prefetch
 from rest_framework.exceptions import ValidationError
 
@@ -73,6 +74,7 @@ class BaseObjectViewSet(PolymorphicViewSetMixin, RalphAPIViewSet):
     queryset = models.BaseObject.polymorphic_objects.all()
     serializer_class = serializers.BaseObjectPolymorphicSerializer
     http_method_names = ['get', 'options', 'head']
+    polymorphic_join = settings.API_BASE_OBJECT_POLYMORPHIC_JOIN
     prefetch_related = [
         Prefetch('licences', queryset=BaseObjectLicence.objects.select_related(
             *BaseObjectLicenceViewSet.select_related
@@ -1,11 +1,18 @@
 # -*- coding: utf-8 -*-
+from unittest.mock import patch
 from urllib.parse import urlencode
 
 from django.core.urlresolvers import reverse
+from django.db import connection
+from django.http import QueryDict
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
+from rest_framework.test import APIRequestFactory
 
 from ralph.accounts.tests.factories import TeamFactory
+from ralph.api.filters import PolymorphicDescendantsFilterBackend
 from ralph.api.tests._base import RalphAPITestCase
+from ralph.assets.api.views import BaseObjectViewSet
 from ralph.assets.models import (
     AssetModel,
     BaseObject,
@@ -501,6 +508,30 @@ class BaseObjectAPITests(RalphAPITestCase):
         ]
         self.assertCountEqual(barcodes, set(['12345', '12543']))
 
+    def _get_base_objects_page(self, polymorphic_join):
+        url = '{}?{}'.format(
+            reverse('baseobject-list'), urlencode({'limit': 10, 'offset': 0})
+        )
+        with patch.object(
+            BaseObjectViewSet, 'polymorphic_join', polymorphic_join
+        ), CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = sorted(response.data['results'], key=lambda r: r['id'])
+        return results, len(context.captured_queries)
+
+    def test_get_base_objects_page_with_polymorphic_join(self):
+        BackOfficeAssetFactory.create_batch(2)
+        DataCenterAssetFactory.create_batch(2)
+        VirtualServerFactory.create_batch(2)
+        results, queries = self._get_base_objects_page(None)
+        joined_results, joined_queries = self._get_base_objects_page(
+            ['BackOfficeAsset', 'DataCenterAsset', 'VirtualServer']
+        )
+        self.assertEqual(joined_results, results)
+        # separate query for every descendant model is not needed
+        self.assertLess(joined_queries, queries)
+
     def test_get_asset_model_details(self):
         url = reverse('baseobject-detail', args=(self.bo_asset.id,))
         response = self.client.get(url, format='json')
@@ -552,6 +583,21 @@ class BaseObjectAPITests(RalphAPITestCase):
         response = self.client.get(url, format='json')
         self.assertEqual(len(response.data['results']), 1)
 
+    def test_polymorphic_filter_should_not_fetch_descendants_ids(self):
+        request = APIRequestFactory().get(reverse('baseobject-list'))
+        request.query_params = QueryDict(
+            urlencode({'barcode__startswith': '12'})
+        )
+        with self.assertNumQueries(0):
+            queryset = PolymorphicDescendantsFilterBackend().filter_queryset(
+                request, BaseObject.polymorphic_objects.all(),
+                BaseObjectViewSet()
+            )
+        self.assertCountEqual(
+            queryset.values_list('pk', flat=True),
+            [self.bo_asset.pk, self.dc_asset.pk]
+        )
+
     def test_is_lookup_used(self):
         url = '{}?{}'.format(
             reverse('baseobject-list'), urlencode(
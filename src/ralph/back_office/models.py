@@ -455,7 +455,11 @@ class BackOfficeAsset(Regionalizable, Asset):
             instance.location = user.location
 
     @classmethod
-    def _generate_report(cls, name, request, instances, language):
+    def _generate_report(cls, name, request, instances, language, user=None):
+        # request is not available when transition is run asynchronously -
+        # `user` (who ran the transition) is passed instead
+        if request is not None:
+            user = request.user
         report = Report.objects.get(name=name)
         template = report.templates.filter(language=language).first()
         if not template:
@@ -480,7 +484,7 @@ class BackOfficeAsset(Regionalizable, Asset):
             data={
                 'id': ', '.join([str(obj.id) for obj in instances]),
                 'now': datetime.datetime.now(),
-                'logged_user': obj_to_dict(request.user),
+                'logged_user': obj_to_dict(user),
                 'affected_user': obj_to_dict(instances[0].user),
                 'assets': data_instances,
             }
@@ -495,7 +499,7 @@ class BackOfficeAsset(Regionalizable, Asset):
             with open(output_path, 'wb') as f:
                 f.write(result)
             return add_attachment_from_disk(
-                instances, output_path, request.user,
+                instances, output_path, user,
                 _('Document autogenerated by {} transition.').format(name)
             )
 
@@ -514,10 +518,11 @@ class BackOfficeAsset(Regionalizable, Asset):
         return_attachment=True,
         run_after=['assign_owner', 'assign_user']
     )
-    def release_report(cls, instances, request, **kwargs):
+    def release_report(cls, instances, request=None, **kwargs):
         return cls._generate_report(
             instances=instances, name='release', request=request,
-            language=kwargs['report_language']
+            language=kwargs['report_language'],
+            user=kwargs.get('_request__user')
         )
 
     @classmethod
@@ -535,10 +540,11 @@ class BackOfficeAsset(Regionalizable, Asset):
         return_attachment=True,
         precondition=_check_user_assigned,
     )
-    def return_report(cls, instances, request, **kwargs):
+    def return_report(cls, instances, request=None, **kwargs):
         return cls._generate_report(
             instances=instances, name='return', request=request,
-            language=kwargs['report_language']
+            language=kwargs['report_language'],
+            user=kwargs.get('_request__user')
         )
 
     @classmethod
@@ -556,10 +562,11 @@ class BackOfficeAsset(Regionalizable, Asset):
         return_attachment=True,
         run_after=['assign_owner', 'assign_user', 'assign_loan_end_date']
     )
-    def loan_report(cls, instances, request, **kwargs):
+    def loan_report(cls, instances, request=None, **kwargs):
         return cls._generate_report(
             name='loan', request=request, instances=instances,
-            language=kwargs['report_language']
+            language=kwargs['report_language'],
+            user=kwargs.get('_request__user')
         )
 
     @classmethod
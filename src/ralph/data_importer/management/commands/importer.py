@@ -16,6 +16,7 @@ from import_export import resources
 from ralph.data_importer import resources as ralph_resources
 from ralph.data_importer.models import ImportedObjects
 from ralph.data_importer.resources import RalphModelResource
+from ralph.networks.models import IPAddress, Network
 
 APP_MODELS = {model._meta.model_name: model for model in apps.get_models()}
 logger = logging.getLogger(__name__)
@@ -151,6 +152,8 @@ class Command(BaseCommand):
                 if int(obj.get('deleted', 0)) == 1
             ]
             result = model_resource.import_data(dataset, dry_run=False)
+            if model_resource._meta.model is Network:
+                self.networks_imported = True
             if result.has_errors():
                 for idx, row in enumerate(result.rows):
                     for error in row.errors:
@@ -187,9 +190,17 @@ class Command(BaseCommand):
         if options.get('map_imported_id_to_new_id'):
             settings.MAP_IMPORTED_ID_TO_NEW_ID = True
         settings.CHECK_IP_HOSTNAME_ON_SAVE = False
+        # IPs are assigned to imported networks in single pass at the end
+        settings.NETWORKS_ASSIGN_IPS_ON_SAVE = False
+        self.networks_imported = False
         if options.get('type') == 'dir':
             self.from_dir(options)
         elif options.get('type') == 'zip':
             self.from_zip(options)
         else:
             self.from_file(options)
+        if self.networks_imported:
+            updated = IPAddress.objects.assign_networks()
+            self.stdout.write(
+                '{} IP addresses assigned to networks\n'.format(updated)
+            )
@@ -69,4 +69,6 @@ class PrebootAdmin(RalphAdmin):
 
 @register(Deployment)
 class DeploymentAdmin(RalphAdmin):
-    pass
+    list_display = [
+        'id', 'obj', 'status', 'waiting_for', 'not_before', 'modified'
+    ]
@@ -19,7 +19,6 @@ Deployment order:
 
 """
 import logging
-import time
 from datetime import datetime
 from functools import partial
 
@@ -30,13 +29,16 @@ from django.utils.translation import ugettext_lazy as _
 
 from ralph.assets.models import ConfigurationClass, Ethernet
 from ralph.data_center.models import DataCenterAsset
-from ralph.deployment.models import Preboot
+from ralph.deployment.models import Deployment, Preboot
 from ralph.dhcp.models import DHCPEntry, DHCPServer
 from ralph.dns.dnsaas import DNSaaS
 from ralph.dns.forms import RecordType
 from ralph.dns.views import DNSaaSIntegrationNotEnabledError
 from ralph.lib.mixins.forms import ChoiceFieldWithOtherOption, OTHER
 from ralph.lib.transitions.decorators import transition_action
+from ralph.lib.transitions.exceptions import (
+    RescheduleAsyncTransitionActionLater
+)
 from ralph.lib.transitions.models import TransitionJobActionStatus
 from ralph.networks.models import IPAddress, Network, NetworkEnvironment
 from ralph.virtual.models import VirtualServer
@@ -345,10 +347,10 @@ def create_dhcp_entries(cls, instances, ip_or_network, ethernet, **kwargs):
         _store_history(instances[0], ip, ethernet)
     else:
         for instance, (ip, ethernet) in zip(
+            instances,
             _create_dhcp_entries_for_many_instances(
                 instances, ip_or_network
             ),
-            instances
         ):
             _store_history(instance, ip, ethernet)
     # TODO: use dedicated key
@@ -378,6 +380,16 @@ def _create_dhcp_entries_for_single_instance(
             pk=ip_or_network['value']
         )
         ip = network.issue_next_free_ip()
+    return _bind_ip_to_instance(ip, instance, ethernet_id)
+
+
+def _bind_ip_to_instance(ip, instance, ethernet_id):
+    """
+    Bind IP to ethernet of instance and expose it in DHCP.
+
+    Returns:
+        tuple with (IP, ethernet component)
+    """
     logger.info('Assigning {} to {}'.format(ip, instance))
     # pass base_object as param to make sure that this ethernet is assigned
     # to currently transitioned instance
@@ -393,16 +405,18 @@ def _create_dhcp_entries_for_single_instance(
 def _create_dhcp_entries_for_many_instances(instances, ip_or_network):
     """
     Assign IP and create DHCP entries for multiple instances.
+
+    IPs for all instances are reserved in the network at once.
     """
-    for instance in instances:
+    network = Network.objects.get(pk=ip_or_network['value'])
+    ips = network.issue_next_free_ips(len(instances))
+    for instance, ip in zip(instances, ips):
         # when IP is assigned to many instances, mac is not provided through
         # form and first non-mgmt mac should be used
         ethernet = _get_non_mgmt_ethernets(instance).values_list(
             'id', flat=True
         ).first()  # TODO: is first the best choice here?
-        yield _create_dhcp_entries_for_single_instance(
-            instance, ip_or_network, ethernet
-        )
+        yield _bind_ip_to_instance(ip, instance, ethernet)
 
 
 @deployment_action(
@@ -415,15 +429,12 @@ def wait_for_dhcp_servers(cls, instances, **kwargs):
     Wait until DHCP servers ping to Ralph.
     """
     created = kwargs['history_kwargs']['dhcp_entry_created_date']
-    # TODO: rescheduler instead of while
-    while True:
-        servers_sync_date = DHCPServer.objects.values_list(
-            'last_synchronized', flat=True
-        ).all()
-        for server_sync_date in servers_sync_date:
-            if created < server_sync_date:
-                return
-        time.sleep(1)
+    if not DHCPServer.objects.filter(last_synchronized__gt=created).exists():
+        # job is resumed when any DHCP server is synchronized (see
+        # `DHCPSyncView`)
+        raise RescheduleAsyncTransitionActionLater(
+            wait_for=Deployment.DHCP_SERVERS_SYNCHRONIZED_EVENT
+        )
 
 
 @deployment_action(
@@ -521,6 +532,11 @@ def wait_for_ping(cls, instances, tja, **kwargs):
     """
     Wait until server ping to Ralph that is has properly deployed.
     """
-    while tja.status == TransitionJobActionStatus.STARTED:
-        tja.refresh_from_db()
-        time.sleep(1)
+    tja.refresh_from_db()
+    if tja.status == TransitionJobActionStatus.STARTED:
+        # job is resumed by `Deployment.mark_as_done`
+        raise RescheduleAsyncTransitionActionLater(
+            wait_for=Deployment.DONE_PING_EVENT.format(
+                tja.transition_job_id
+            )
+        )
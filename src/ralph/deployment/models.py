@@ -157,6 +157,11 @@ class DeploymentManager(JobManager):
 
 
 class Deployment(TransitionJob):
+    # events which deployment jobs are waiting for (done ping is signalled
+    # separately for every deployment - formatted with its id)
+    DHCP_SERVERS_SYNCHRONIZED_EVENT = 'deployment.dhcp_servers_synchronized'
+    DONE_PING_EVENT = 'deployment.done_ping.{}'
+
     objects = DeploymentManager()
 
     class Meta:
@@ -182,3 +187,11 @@ class Deployment(TransitionJob):
         )
         tja.status = TransitionJobActionStatus.FINISHED
         tja.save()
+        cls.resume_waiting(cls.DONE_PING_EVENT.format(deployment.pk))
+
+    @classmethod
+    def mark_dhcp_servers_synchronized(cls):
+        """
+        Resume deployments waiting for synchronization of DHCP servers.
+        """
+        cls.resume_waiting(cls.DHCP_SERVERS_SYNCHRONIZED_EVENT)
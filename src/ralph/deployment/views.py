@@ -3,6 +3,7 @@ import logging
 from django.conf import settings
 from django.core.exceptions import SuspiciousOperation
 from django.core.urlresolvers import reverse
+from django.db import transaction
 from django.http import Http404, HttpResponse, HttpResponseRedirect
 from django.template import Context, Template
 
@@ -150,6 +151,8 @@ def files(request, file_type, deployment_id):
     return HttpResponseRedirect(file_url)
 
 
+# deployment has to be marked as done (committed) before resuming its job
+@transaction.non_atomic_requests
 def done_ping(request, deployment_id):
     """View mark specified deployment (by UUID from URL) as finished.
 
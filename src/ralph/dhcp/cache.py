@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+Cache of rendered DHCP configs.
+
+Every config (entries or networks for particular DCs or environments) is
+kept in the Django cache together with its content hash (used as ETag) and
+version of DHCP data at the time of rendering. Version is a single counter
+bumped by signals of every model used to render configs (see
+`ralph.dhcp.models`) and explicitly after bulk updates (see
+`invalidate_configs`), so cached config is served only if nothing changed
+since it was rendered. Notice that cache has to be shared between processes
+(ex. Redis) to make invalidation work across all of them.
+"""
+import hashlib
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+CONFIG_VERSION_CACHE_KEY = 'ralph.dhcp.config.version'
+CONFIG_CACHE_KEY_PREFIX = 'ralph.dhcp.config'
+
+
+def _new_version():
+    # when version counter is evicted from the cache it can't start from the
+    # same value again (old configs would be considered up to date)
+    return int(time.time() * 1000000)
+
+
+def bump_config_version():
+    try:
+        return cache.incr(CONFIG_VERSION_CACHE_KEY)
+    except ValueError:
+        version = _new_version()
+        cache.set(CONFIG_VERSION_CACHE_KEY, version, None)
+        return version
+
+
+def invalidate_configs():
+    """
+    Mark all cached configs as outdated. Has to be called explicitly after
+    changes which don't send signals (ex. `QuerySet.update`).
+    """
+    if settings.DHCP_CONFIG_CACHE:
+        bump_config_version()
+
+
+def get_config_cache_key(config_type, dc_names, env_names):
+    names = '|'.join(
+        ['dc:{}'.format(name) for name in sorted(dc_names)] +
+        ['env:{}'.format(name) for name in sorted(env_names)]
+    )
+    return '{}.{}.{}'.format(
+        CONFIG_CACHE_KEY_PREFIX,
+        config_type,
+        hashlib.md5(names.encode('utf-8')).hexdigest()
+    )
+
+
+def get_cached_config(key):
+    """
+    Return tuple (current version, cached config). Cached config is None
+    if it's not present in the cache or it's outdated.
+    """
+    values = cache.get_many([CONFIG_VERSION_CACHE_KEY, key])
+    version = values.get(CONFIG_VERSION_CACHE_KEY)
+    if version is None:
+        version = _new_version()
+        if not cache.add(CONFIG_VERSION_CACHE_KEY, version, None):
+            version = cache.get(CONFIG_VERSION_CACHE_KEY, version)
+    config = values.get(key)
+    if config is None or config['version'] != version:
+        return version, None
+    return version, config
+
+
+def set_cached_config(key, version, content, last_modified):
+    """
+    Store rendered config (rendered with data in passed `version`) in the
+    cache.
+    """
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    config = {
+        'version': version,
+        'content': content,
+        'etag': hashlib.sha1(content).hexdigest(),
+        'last_modified': last_modified,
+    }
+    logger.debug('Storing DHCP config %s (version %s)', key, version)
+    cache.set(key, config, settings.DHCP_CONFIG_CACHE_TTL)
+    return config
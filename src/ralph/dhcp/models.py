@@ -1,8 +1,17 @@
 from django.db import models
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
 
-from ralph.networks.models.networks import IPAddress, IPAddressStatus
+from ralph.assets.models.components import Ethernet
+from ralph.deployment.models import Deployment
+from ralph.dhcp.cache import invalidate_configs
+from ralph.networks.models.networks import (
+    IPAddress,
+    IPAddressStatus,
+    Network,
+    NetworkEnvironment
+)
 
 
 class DHCPEntryManager(models.Manager):
@@ -65,3 +74,21 @@ class DNSServer(models.Model):
 
     def __str__(self):
         return '{}'.format(self.ip_address)
+
+
+def invalidate_dhcp_config(sender, **kwargs):
+    """
+    Mark all cached DHCP configs as outdated.
+    """
+    invalidate_configs()
+
+
+for model in (
+    IPAddress, DHCPEntry, Ethernet, Network, NetworkEnvironment, Deployment,
+    DNSServer,
+):
+    for signal in (post_save, post_delete):
+        signal.connect(invalidate_dhcp_config, sender=model)
+m2m_changed.connect(
+    invalidate_dhcp_config, sender=Network.dns_servers.through
+)
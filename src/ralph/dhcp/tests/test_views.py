@@ -1,13 +1,16 @@
+from unittest.mock import patch
+
 from ddt import data, ddt, unpack
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
-from django.test import TestCase
+from django.test import override_settings, TestCase
 from django.utils.http import http_date
 
 from ralph.assets.tests.factories import EthernetFactory
 from ralph.data_center.tests.factories import DataCenterAssetFactory
 from ralph.dhcp.views import DHCPEntriesView
-from ralph.networks.models.networks import Network
+from ralph.networks.models.networks import IPAddress, Network
 from ralph.networks.tests.factories import IPAddressFactory, NetworkFactory
 
 
@@ -55,6 +58,93 @@ class DHCPConfigTest(TestCase):
         response = self.client.get(url)
         self.assertContains(response, message, status_code=400)
 
+    def test_streamed_entries_should_be_equal_to_rendered_template(self):
+        get_user_model().objects.create_superuser(
+            'test', 'test@test.test', 'test'
+        )
+        self.client.login(username='test', password='test')
+        network = NetworkFactory(
+            address='192.168.1.0/24', dhcp_broadcast=True
+        )
+        for i in range(5):
+            IPAddressFactory(
+                address='192.168.1.{}'.format(i + 10), dhcp_expose=True
+            )
+        url = '{}?env={}'.format(
+            reverse('dhcp_config_entries'), network.network_environment
+        )
+        rendered = self.client.get(url)
+        with override_settings(
+            DHCP_ENTRIES_STREAMING=True, DHCP_ENTRIES_CHUNK_SIZE=2
+        ):
+            streamed = self.client.get(url)
+        self.assertEqual(streamed.status_code, 200)
+        self.assertTrue(streamed.streaming)
+        self.assertEqual(
+            b''.join(streamed.streaming_content), rendered.content
+        )
+        self.assertEqual(rendered.content.count(b'\nhost '), 5)
+        self.assertEqual(streamed['Last-Modified'], rendered['Last-Modified'])
+
+
+@override_settings(DHCP_CONFIG_CACHE=True)
+class DHCPConfigCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        get_user_model().objects.create_superuser(
+            'test', 'test@test.test', 'test'
+        )
+        self.client.login(username='test', password='test')
+        self.network = NetworkFactory(
+            address='192.168.1.0/24', dhcp_broadcast=True
+        )
+        self.ip = IPAddressFactory(address='192.168.1.10', dhcp_expose=True)
+        self.url = '{}?env={}'.format(
+            reverse('dhcp_config_entries'), self.network.network_environment
+        )
+
+    def test_config_should_be_served_from_cache(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        with patch.object(DHCPEntriesView, 'get_last_modified') as mock:
+            cached_response = self.client.get(self.url)
+        self.assertFalse(mock.called)
+        self.assertEqual(cached_response.content, response.content)
+        self.assertEqual(cached_response['ETag'], response['ETag'])
+        self.assertEqual(
+            cached_response['Last-Modified'], response['Last-Modified']
+        )
+
+    def test_config_should_return_304_when_etag_matches(self):
+        response = self.client.get(self.url)
+        response = self.client.get(
+            self.url, HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_config_should_be_invalidated_when_ip_changes(self):
+        response = self.client.get(self.url)
+        self.ip.hostname = 'changed.hostname.local'
+        self.ip.save()
+        new_response = self.client.get(
+            self.url, HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        self.assertEqual(new_response.status_code, 200)
+        self.assertNotEqual(new_response['ETag'], response['ETag'])
+        self.assertIn(b'changed.hostname.local', new_response.content)
+
+    def test_config_should_be_invalidated_after_bulk_networks_assignment(self):
+        IPAddress.objects.filter(pk=self.ip.pk).update(network=None)
+        cache.clear()
+        response = self.client.get(self.url)
+        self.assertNotIn(b'192.168.1.10', response.content)
+        IPAddress.objects.all().assign_networks()
+        new_response = self.client.get(
+            self.url, HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        self.assertEqual(new_response.status_code, 200)
+        self.assertIn(b'192.168.1.10', new_response.content)
+
 
 class DHCPEntriesViewTest(TestCase):
     def setUp(self):
@@ -113,9 +203,14 @@ class DHCPEntriesViewTest(TestCase):
             ethernet.modified.strftime("%Y-%m-%d %H:%M:%S")
         )
 
-    def test_get_last_modified_should_run_5_queries(self):
+    def test_get_last_modified_should_return_none_when_nothing_found(self):
+        self.assertIsNone(
+            self.view.get_last_modified(Network.objects.none())
+        )
+
+    def test_get_last_modified_should_run_1_query(self):
         network = NetworkFactory(address='192.168.1.0/24')
-        with self.assertNumQueries(5):
+        with self.assertNumQueries(1):
             self.view.get_last_modified(
                Network.objects.filter(id__in=[network.id])
             )
@@ -1,12 +1,22 @@
 import logging
 
+from django.conf import settings
+from django.db import connection, models, transaction
+from django.db.models.sql.datastructures import EmptyResultSet
 from django.http import (
     HttpResponse,
     HttpResponseBadRequest,
     HttpResponseNotFound,
-    HttpResponseNotModified
+    HttpResponseNotModified,
+    StreamingHttpResponse
+)
+from django.utils.formats import localize
+from django.utils.http import (
+    http_date,
+    parse_etags,
+    parse_http_date_safe,
+    quote_etag
 )
-from django.utils.http import http_date, parse_http_date_safe
 from django.views.generic.base import TemplateView
 from rest_framework.views import APIView
 
@@ -14,6 +24,11 @@ from ralph.admin.helpers import get_client_ip
 from ralph.assets.models.components import Ethernet
 from ralph.data_center.models import DataCenter
 from ralph.deployment.models import Deployment
+from ralph.dhcp.cache import (
+    get_cached_config,
+    get_config_cache_key,
+    set_cached_config
+)
 from ralph.dhcp.models import DHCPEntry, DHCPServer
 from ralph.networks.models.networks import (
     IPAddress,
@@ -23,19 +38,52 @@ from ralph.networks.models.networks import (
 
 logger = logging.getLogger(__name__)
 
+DHCP_ENTRIES_HEADER = (
+    '# DHCP config generated by Ralph last modified at {last_modified}\n'
+)
+DHCP_ENTRY_LINE = (
+    '\nhost {hostname} {{option host-name "{hostname}"; '
+    'fixed-address {address}; hardware ethernet {mac}; }}'
+)
+DHCP_ENTRIES_FOOTER = '\n# End of autogenerated config\n'
 
-def last_modified_date(qs, filter_dict=None):
-    last_date = None
-    if filter_dict is None:
-        filter_dict = {}
-    obj = qs.filter(**filter_dict).order_by('-modified').first()
-    if obj:
-        last_date = obj.modified
-    return last_date
+
+def last_modified_date_many(querysets):
+    """
+    Return the latest ``modified`` date from all querysets using single
+    database query (the latest date of every queryset is selected in scalar
+    subquery and the maximum of them is returned).
+    """
+    subqueries, params = [], []
+    for qs in querysets:
+        try:
+            sql, qs_params = qs.order_by('-modified').values_list(
+                'modified', flat=True
+            )[:1].query.sql_with_params()
+        except EmptyResultSet:
+            continue
+        subqueries.append('SELECT ({}) AS modified'.format(sql))
+        params.extend(qs_params)
+    if not subqueries:
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT MAX(modified) FROM ({}) AS last_modified'.format(
+                ' UNION ALL '.join(subqueries)
+            ),
+            params
+        )
+        last_date = cursor.fetchone()[0]
+    # some backends (ex. SQLite) return plain string from subquery
+    return models.DateTimeField().to_python(last_date)
 
 
 class LastModifiedMixin(object):
-    """Add last modified to HTTP response if last_modified attr is exist."""
+    """
+    Add last modified (and ETag if etag attr is set) to HTTP response if
+    last_modified attr is exist.
+    """
+    etag = None
 
     @property
     def last_timestamp(self):
@@ -43,6 +91,9 @@ class LastModifiedMixin(object):
         return last_modified and int(last_modified.timestamp())
 
     def is_modified(self, request):
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if self.etag and if_none_match:
+            return self.etag not in parse_etags(if_none_match)
         http_modified_since = request.META.get('HTTP_IF_MODIFIED_SINCE')
         if http_modified_since is None or self.last_timestamp is None:
             return True
@@ -51,13 +102,17 @@ class LastModifiedMixin(object):
     def dispatch(self, request, *args, **kwargs):
         response = super().dispatch(request, *args, **kwargs)
         if not self.is_modified(request):
-            return HttpResponseNotModified()
-        response['Last-Modified'] = http_date(self.last_timestamp)
+            response = HttpResponseNotModified()
+        else:
+            response['Last-Modified'] = http_date(self.last_timestamp)
+        if self.etag:
+            response['ETag'] = quote_etag(self.etag)
         return response
 
 
 class DHCPConfigMixin(object):
     content_type = 'text/plain'
+    cached_config = None
 
     @staticmethod
     def check_objects_existence_by_names(model_class, names):
@@ -80,6 +135,20 @@ class DHCPConfigMixin(object):
                 content_type=self.content_type
             )
 
+        if settings.DHCP_CONFIG_CACHE:
+            self.config_cache_key = get_config_cache_key(
+                self.__class__.__name__, dc_names, env_names
+            )
+            self.config_version, self.cached_config = get_cached_config(
+                self.config_cache_key
+            )
+            # config for these DCs/environments was rendered before and
+            # nothing changed since then - names were already validated
+            if self.cached_config:
+                self.last_modified = self.cached_config['last_modified']
+                self.etag = self.cached_config['etag']
+                return super().dispatch(request, *args, **kwargs)
+
         if dc_names:
             found, not_found = self.check_objects_existence_by_names(
                 DataCenter, dc_names
@@ -112,8 +181,31 @@ class DHCPConfigMixin(object):
         self.last_modified = self.get_last_modified(self.networks)
         return super().dispatch(request, *args, **kwargs)
 
+    def get(self, request, *args, **kwargs):
+        if not settings.DHCP_CONFIG_CACHE:
+            return super().get(request, *args, **kwargs)
+        if self.cached_config is None:
+            response = super().get(request, *args, **kwargs)
+            if response.streaming:
+                content = b''.join(response.streaming_content)
+            else:
+                content = response.render().content
+            self.cached_config = set_cached_config(
+                self.config_cache_key, self.config_version, content,
+                self.last_modified
+            )
+            self.etag = self.cached_config['etag']
+        return HttpResponse(
+            self.cached_config['content'], content_type=self.content_type
+        )
+
 
 class DHCPSyncView(APIView):
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # synchronization has to be committed before resuming deployments
+        return transaction.non_atomic_requests(super().as_view(**initkwargs))
+
     def get(self, request, *args, **kwargs):
         ip = get_client_ip(request)
         logger.info('Sync request DHCP server with IP: %s', ip)
@@ -121,6 +213,7 @@ class DHCPSyncView(APIView):
             return HttpResponseNotFound(
                 'DHCP server doesn\'t exist.', content_type='text/plain'
             )
+        Deployment.mark_dhcp_servers_synchronized()
         return HttpResponse('OK', content_type='text/plain')
 
 
@@ -133,34 +226,15 @@ class DHCPEntriesView(
     def get_last_modified(self, networks):
         """
         Return the latest date based on ``modified`` field from networks,
-        IP (DHCP entry), ethernet.
+        IP (DHCP entry), ethernet and deployments (in single query).
         """
-        last_items = []
-
-        try:
-            last_items.append(Deployment.objects.latest('modified').modified)
-        except Deployment.DoesNotExist:
-            pass
-        last_items.append(last_modified_date(networks))
-        last_items.append(
-            last_modified_date(DHCPEntry.objects, filter_dict={
-                'network__in': networks
-            })
-        )
-        last_items.append(
-            last_modified_date(Ethernet.objects, filter_dict={
-                'ipaddress__network__in': networks
-            })
-        )
-        last_items.append(
-            last_modified_date(IPAddress.objects, filter_dict={
-                'network__in': networks
-            })
-        )
-        last_items = [item for item in last_items if item is not None]
-        if not last_items:
-            return None
-        return max(last_items)
+        return last_modified_date_many([
+            Deployment.objects.all(),
+            networks,
+            DHCPEntry.objects.filter(network__in=networks),
+            Ethernet.objects.filter(ipaddress__network__in=networks),
+            IPAddress.objects.filter(network__in=networks),
+        ])
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -170,6 +244,51 @@ class DHCPEntriesView(
         })
         return context
 
+    def render_to_response(self, context, **response_kwargs):
+        if not settings.DHCP_ENTRIES_STREAMING:
+            return super().render_to_response(context, **response_kwargs)
+        return StreamingHttpResponse(
+            self.stream_entries(), content_type=self.content_type
+        )
+
+    def iter_entries_values(self, chunk_size=None):
+        """
+        Yield (hostname, address, mac) of DHCP entries, fetched in chunks
+        of `chunk_size` rows (ordered by primary key), so only single chunk is
+        held in memory at once.
+        """
+        chunk_size = chunk_size or settings.DHCP_ENTRIES_CHUNK_SIZE
+        entries = DHCPEntry.objects.filter(
+            network__in=self.networks
+        ).order_by('pk').values_list(
+            'pk', 'hostname', 'address', 'ethernet__mac'
+        )
+        last_pk = None
+        while True:
+            chunk = entries
+            if last_pk is not None:
+                chunk = chunk.filter(pk__gt=last_pk)
+            chunk = list(chunk[:chunk_size])
+            for pk, hostname, address, mac in chunk:
+                yield hostname, address, mac
+            if len(chunk) < chunk_size:
+                break
+            last_pk = chunk[-1][0]
+
+    def stream_entries(self):
+        """
+        Generate DHCP entries config (same as `dhcp/entries.conf` template)
+        line by line.
+        """
+        yield DHCP_ENTRIES_HEADER.format(
+            last_modified=localize(self.last_modified)
+        )
+        for hostname, address, mac in self.iter_entries_values():
+            yield DHCP_ENTRY_LINE.format(
+                hostname=hostname, address=address, mac=mac
+            )
+        yield DHCP_ENTRIES_FOOTER
+
 
 class DHCPNetworksView(
     DHCPConfigMixin, LastModifiedMixin, TemplateView, APIView
@@ -177,23 +296,11 @@ class DHCPNetworksView(
     template_name = 'dhcp/networks.conf'
 
     def get_last_modified(self, networks):
-        last_items = []
-        last_items.append(last_modified_date(networks))
-        last_items.append(
-            last_modified_date(NetworkEnvironment.objects, filter_dict={
-                'network__in': networks
-            })
-        )
-        last_items.append(
-            last_modified_date(IPAddress.objects, filter_dict={
-                'network__in': networks,
-                'is_gateway': True
-            })
-        )
-        last_items = [item for item in last_items if item is not None]
-        if not last_items:
-            return None
-        return max(last_items)
+        return last_modified_date_many([
+            networks,
+            NetworkEnvironment.objects.filter(network__in=networks),
+            IPAddress.objects.filter(network__in=networks, is_gateway=True),
+        ])
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -1,5 +1,13 @@
-from .base import ExternalService, InternalService
+from .base import (
+    ExternalService,
+    InternalService,
+    QueuedServiceError,
+    ServiceTimeoutError
+)
 from .helpers import obj_to_dict
 
 
-__all__ = ['ExternalService', 'InternalService', 'obj_to_dict']
+__all__ = [
+    'ExternalService', 'InternalService', 'obj_to_dict', 'QueuedServiceError',
+    'ServiceTimeoutError'
+]
@@ -8,6 +8,73 @@ class QueuedServiceError(Exception):
     pass
 
 
+class ServiceTimeoutError(QueuedServiceError):
+    pass
+
+
+class ServiceJob(object):
+    """
+    Handle of the job queued in the service (returned by
+    `ExternalService.run_async`).
+
+    Finish of the job is noticed through Redis keyspace notifications of
+    job's hash (when they are enabled in Redis - `notify-keyspace-events`
+    has to contain `Kh`) - otherwise status of the job is checked every
+    `max_check_interval` seconds.
+
+    Other attributes (ex. `get_status`, `result`) are taken from wrapped RQ
+    job, so it could be used in place of RQ job.
+    """
+    max_check_interval = 1
+
+    def __init__(self, job):
+        self.job = job
+
+    def __getattr__(self, name):
+        return getattr(self.job, name)
+
+    def done(self):
+        return self.job.is_finished or self.job.is_failed
+
+    def _get_keyspace_channel(self):
+        connection_pool = self.job.connection.connection_pool
+        key = self.job.key
+        if isinstance(key, bytes):
+            key = key.decode()
+        return '__keyspace@{}__:{}'.format(
+            connection_pool.connection_kwargs.get('db', 0), key
+        )
+
+    def wait(self, timeout=None):
+        """
+        Wait until job is finished and return its result.
+
+        Raises:
+            ServiceTimeoutError: If job is not finished in `timeout` seconds.
+        """
+        if self.done():
+            return self.job.result
+        deadline = None if timeout is None else time.monotonic() + timeout
+        pubsub = self.job.connection.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(self._get_keyspace_channel())
+        try:
+            # check status after subscribing to not miss any notification
+            while not self.done():
+                wait_time = self.max_check_interval
+                if deadline is not None:
+                    wait_time = min(wait_time, deadline - time.monotonic())
+                    if wait_time <= 0:
+                        raise ServiceTimeoutError(
+                            'Job {} not finished in {} seconds'.format(
+                                self.id, timeout
+                            )
+                        )
+                pubsub.get_message(timeout=wait_time)
+        finally:
+            pubsub.close()
+        return self.job.result
+
+
 class ExternalService(object):
     services = settings.RALPH_EXTERNAL_SERVICES
 
@@ -18,6 +85,9 @@ class ExternalService(object):
             raise ValueError('The {} service doesn\'t exist'.format(service))
         self.method = service['method']
         self.queue = django_rq.get_queue(service['queue_name'])
+        # max time (in seconds) of job execution (queue's default if not
+        # specified)
+        self.timeout = service.get('timeout')
 
     def run(self, **kwargs):
         """Run function with params on external service.
@@ -35,17 +105,20 @@ class ExternalService(object):
 
         Raises:
             QueuedServiceError: If something goes wrong on queue.
+            ServiceTimeoutError: If job is not finished in time.
         """
-        job = self.queue.enqueue(self.method, **kwargs)
-        if not job.is_queued:
-            raise QueuedServiceError
-        while job and not any([job.is_finished, job.is_failed]):
-            time.sleep(0.1)
-        return job.result
+        return self.run_async(**kwargs).wait(
+            timeout=self.timeout or settings.RALPH_SERVICES_WAIT_TIMEOUT
+        )
 
     def run_async(self, **kwargs):
-        job = self.queue.enqueue(self.method, kwargs=kwargs)
-        return job
+        """
+        Queue function with params on external service and return
+        `ServiceJob` (use its `wait` method to get the result).
+        """
+        return ServiceJob(self.queue.enqueue_call(
+            self.method, kwargs=kwargs, timeout=self.timeout
+        ))
 
 
 class InternalService(ExternalService):
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+import time
+
+from django.core.management.base import BaseCommand
+
+from ralph.lib.external_services.models import Job
+
+
+class Command(BaseCommand):
+
+    help = "Queue jobs rescheduled with delay which time has come"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            dest='interval',
+            type=float,
+            default=0,
+            help=(
+                "Check scheduled jobs every `interval` seconds (by default "
+                "check only once)"
+            ),
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            resumed = Job.resume_scheduled()
+            if resumed:
+                self.stdout.write('{} jobs queued\n'.format(resumed))
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('external_services', '0002_job_waiting_for'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='not_before',
+            field=models.DateTimeField(null=True, blank=True, db_index=True),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('external_services', '0003_job_not_before'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobEvent',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('name', models.CharField(max_length=200, unique=True)),
+                ('signalled_at', models.DateTimeField(null=True, blank=True)),
+            ],
+        ),
+    ]
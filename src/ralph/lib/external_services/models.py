@@ -1,14 +1,14 @@
 # -*- coding: utf-8 -*-
 import logging
 import uuid
-from datetime import date
+from datetime import date, datetime, timedelta
 
 from dateutil.parser import parse
 from dj.choices import Choices
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
-from django.db import models
-from django.db.models import Q
+from django.db import IntegrityError, models, transaction
+from django.db.models import Func, Q
 from django.db.models.query import QuerySet
 from django.utils.translation import ugettext_lazy as _
 from django_extensions.db.fields.json import JSONField
@@ -41,6 +41,58 @@ class JobManager(models.Manager):
         )
 
 
+class CurrentTimestamp(Func):
+    """
+    Current time of the database - the same clock for every process (no
+    matter on which host it's running).
+    """
+    template = 'CURRENT_TIMESTAMP'
+
+    def __init__(self):
+        super().__init__(output_field=models.DateTimeField())
+
+
+class JobEvent(models.Model):
+    """
+    Last time (of the database) when event, which jobs could wait for, was
+    signalled.
+
+    Stored in DB (not in cache) to be visible for every process and worker.
+    """
+    name = models.CharField(max_length=200, unique=True)
+    signalled_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        app_label = 'external_services'
+
+    def __str__(self):
+        return self.name
+
+    @classmethod
+    def signal(cls, name):
+        """
+        Mark event `name` as signalled now.
+        """
+        if not cls.objects.filter(name=name).exists():
+            try:
+                with transaction.atomic():
+                    cls.objects.create(name=name)
+            except IntegrityError:
+                # created by another process in the meantime
+                pass
+        cls.objects.filter(name=name).update(signalled_at=CurrentTimestamp())
+
+    @classmethod
+    def get_signalled_at(cls, name):
+        """
+        Return time (of the database) when event `name` was signalled for the
+        last time or None if it was never signalled.
+        """
+        return cls.objects.filter(name=name).values_list(
+            'signalled_at', flat=True
+        ).first()
+
+
 class Job(TimeStampMixin):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     username = NullableCharField(max_length=200, null=True, blank=True)
@@ -51,6 +103,13 @@ class Job(TimeStampMixin):
         choices=JobStatus(),
         default=JobStatus.QUEUED.id,
     )
+    # name of the event which job is waiting for (job is not queued until
+    # this event is signalled)
+    waiting_for = NullableCharField(
+        max_length=200, null=True, blank=True, db_index=True
+    )
+    # job is not queued until this time (see `reschedule`)
+    not_before = models.DateTimeField(null=True, blank=True, db_index=True)
     _params = None
     objects = JobManager()
 
@@ -102,16 +161,110 @@ class Job(TimeStampMixin):
         ))
         self.save()
 
-    def reschedule(self):
+    def _enqueue(self):
+        service = InternalService(self.service_name)
+        return service.run_async(job_id=self.id)
+
+    def reschedule(self, delay=None):
         """
         Reschedule the same job again.
+
+        When `delay` (in seconds) is passed, job is queued again after this
+        time by `resume_scheduled` (run periodically by `resume_scheduled_jobs`
+        management command). Otherwise it's queued immediately.
         """
-        # TODO: use rq scheduler
+        if delay:
+            self.not_before = datetime.now() + timedelta(seconds=delay)
+            self._update_dumped_params()
+            logger.info('Rescheduling {} at {}'.format(self, self.not_before))
+            return None
         self._update_dumped_params()
         logger.info('Rescheduling {}'.format(self))
-        service = InternalService(self.service_name)
-        job = service.run_async(job_id=self.id)
-        return job
+        return self._enqueue()
+
+    @classmethod
+    def resume_scheduled(cls):
+        """
+        Queue jobs (rescheduled with delay) which time has come. Return number
+        of queued jobs.
+        """
+        resumed = 0
+        # ended job (ex. failed in the meantime) is never queued again
+        active = cls._default_manager.filter(
+            status__in=(JobStatus.QUEUED.id, JobStatus.STARTED.id)
+        )
+        for job in active.filter(not_before__lte=datetime.now()):
+            # make sure that job is not queued by another process
+            if active.filter(
+                pk=job.pk, not_before__isnull=False
+            ).update(not_before=None, waiting_for=None):
+                logger.info('Resuming scheduled {}'.format(job))
+                job._enqueue()
+                resumed += 1
+        return resumed
+
+    def get_current_time(self):
+        """
+        Return current time of the database (to compare it with time of
+        signalling the event - see `wait`).
+        """
+        return Job.objects.filter(pk=self.pk).annotate(
+            current_time=CurrentTimestamp()
+        ).values_list('current_time', flat=True).get()
+
+    def wait(self, event, since=None, timeout=None):
+        """
+        Stop processing the job until `event` is signalled (using
+        `resume_waiting`) - job is not queued in the meantime, so it doesn't
+        occupy any worker.
+
+        `since` is the time (of the database - see `get_current_time`) when
+        job found out that it has to wait - if the event was signalled after
+        that, job is resumed immediately (otherwise signal sent just before
+        starting waiting would be lost).
+
+        When `timeout` (in seconds) is passed, job is resumed after this time
+        by `resume_scheduled` even if the event was not signalled (in case
+        the signal was lost).
+        """
+        self.waiting_for = event
+        if timeout:
+            self.not_before = datetime.now() + timedelta(seconds=timeout)
+        self._update_dumped_params()
+        logger.info('Job {} is waiting for {}'.format(self, event))
+        signalled_at = JobEvent.get_signalled_at(event)
+        if (
+            since is not None and signalled_at is not None and
+            signalled_at >= since
+        ):
+            self.resume()
+
+    def resume(self):
+        """
+        Queue waiting job again. Return True if job was waiting.
+        """
+        resumed = Job.objects.filter(
+            pk=self.pk, waiting_for__isnull=False
+        ).update(waiting_for=None, not_before=None)
+        if resumed:
+            self.waiting_for = None
+            self.not_before = None
+            logger.info('Resuming {}'.format(self))
+            self._enqueue()
+        return bool(resumed)
+
+    @classmethod
+    def resume_waiting(cls, event, **filters):
+        """
+        Signal `event` - resume all jobs (optionally filtered by `filters`)
+        waiting for it. Should be called after saving changes which caused
+        the event (resumed job has to see them).
+        """
+        JobEvent.signal(event)
+        jobs = list(cls._default_manager.filter(waiting_for=event, **filters))
+        for job in jobs:
+            job.resume()
+        return len(jobs)
 
     def fail(self, reason=''):
         """
@@ -120,6 +273,7 @@ class Job(TimeStampMixin):
         self._update_dumped_params()
         logger.info('Job {} has failed. Reason: {}'.format(self, reason))
         self.status = JobStatus.FAILED
+        self.not_before = self.waiting_for = None
         self.save()
 
     def success(self):
@@ -129,6 +283,7 @@ class Job(TimeStampMixin):
         self._update_dumped_params()
         logger.info('Job {} has succeeded'.format(self))
         self.status = JobStatus.FINISHED
+        self.not_before = self.waiting_for = None
         self.save()
 
     @classmethod
@@ -144,19 +299,27 @@ class Job(TimeStampMixin):
         return result
 
     @classmethod
-    def run(cls, service_name, defaults=None, **kwargs):
+    def create(cls, service_name, defaults=None, **kwargs):
         """
-        Run Job asynchronously in internal service (with DB and models access).
+        Create Job without queueing it (see `run`).
         """
-        service = InternalService(service_name)
+        # make sure that service exists
+        InternalService(service_name)
         user = _get_user_from_request(kwargs.get('request'))
-        obj = cls._default_manager.create(
+        return cls._default_manager.create(
             service_name=service_name,
             username=user.username if user else None,
             _dumped_params=cls.prepare_params(**kwargs),
             **(defaults or {})
         )
-        service.run_async(job_id=obj.id)
+
+    @classmethod
+    def run(cls, service_name, defaults=None, **kwargs):
+        """
+        Run Job asynchronously in internal service (with DB and models access).
+        """
+        obj = cls.create(service_name, defaults, **kwargs)
+        obj._enqueue()
         return obj.id, obj
 
     @classmethod
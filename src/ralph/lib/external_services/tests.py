@@ -1,11 +1,14 @@
 # -*- coding: utf-8 -*-
 import json
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
 
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
 from django.test import RequestFactory, TestCase
 
-from ralph.lib.external_services.models import Job, JobStatus
+from ralph.lib.external_services.base import ServiceJob, ServiceTimeoutError
+from ralph.lib.external_services.models import Job, JobEvent, JobStatus
 from ralph.tests.models import Bar, Foo
 
 
@@ -96,3 +99,93 @@ class JobRunTestCase(TestCase):
         self.assertEqual(Bar.objects.count(), prev_bar_count + 1)
         self.assertEqual(self.foo.bar, 'barbar')
         self.assertTrue(Bar.objects.filter(name='test1').exists())
+
+
+class JobResumeScheduledTestCase(TestCase):
+    def test_ended_job_should_not_be_resumed(self):
+        job = Job.create('JOB_TEST')
+        job.reschedule(delay=60)
+        job.fail('test')
+        Job.objects.filter(pk=job.pk).update(
+            not_before=datetime.now() - timedelta(seconds=1)
+        )
+        self.assertEqual(Job.resume_scheduled(), 0)
+
+    def test_not_before_should_be_cleared_on_success(self):
+        job = Job.create('JOB_TEST')
+        job.reschedule(delay=60)
+        job.success()
+        job.refresh_from_db()
+        self.assertIsNone(job.not_before)
+
+
+class JobEventTestCase(TestCase):
+    def test_signal_event(self):
+        self.assertIsNone(JobEvent.get_signalled_at('test_event'))
+        JobEvent.signal('test_event')
+        signalled_at = JobEvent.get_signalled_at('test_event')
+        self.assertIsNotNone(signalled_at)
+        JobEvent.signal('test_event')
+        self.assertGreaterEqual(
+            JobEvent.get_signalled_at('test_event'), signalled_at
+        )
+        self.assertEqual(JobEvent.objects.count(), 1)
+
+    def test_wait_for_event_signalled_in_the_meantime(self):
+        job = Job.create('JOB_TEST')
+        since = job.get_current_time()
+        JobEvent.signal('test_event')
+        job.resume = MagicMock()
+        job.wait('test_event', since=since)
+        job.resume.assert_called_once_with()
+
+    def test_wait_for_event_signalled_before(self):
+        JobEvent.signal('test_event')
+        job = Job.create('JOB_TEST')
+        JobEvent.objects.update(
+            signalled_at=job.get_current_time() - timedelta(seconds=10)
+        )
+        job.resume = MagicMock()
+        job.wait('test_event', since=job.get_current_time(), timeout=60)
+        self.assertFalse(job.resume.called)
+        job.refresh_from_db()
+        self.assertEqual(job.waiting_for, 'test_event')
+        self.assertIsNotNone(job.not_before)
+
+
+class ServiceJobTestCase(TestCase):
+    def _get_rq_job(self, statuses):
+        rq_job = MagicMock()
+        rq_job.key = b'rq:job:1234'
+        rq_job.result = 'result'
+        rq_job.connection.connection_pool.connection_kwargs = {'db': 2}
+        type(rq_job).is_finished = property(lambda self: next(statuses))
+        rq_job.is_failed = False
+        return rq_job
+
+    def test_wait_for_finished_job(self):
+        rq_job = self._get_rq_job(iter([True]))
+        self.assertEqual(ServiceJob(rq_job).wait(), 'result')
+        self.assertFalse(rq_job.connection.pubsub.called)
+
+    def test_wait_until_job_is_finished(self):
+        rq_job = self._get_rq_job(iter([False, False, True]))
+        self.assertEqual(ServiceJob(rq_job).wait(timeout=10), 'result')
+        pubsub = rq_job.connection.pubsub.return_value
+        pubsub.subscribe.assert_called_once_with(
+            '__keyspace@2__:rq:job:1234'
+        )
+        self.assertTrue(pubsub.close.called)
+
+    def test_rq_job_attributes_are_available(self):
+        rq_job = self._get_rq_job(iter([True]))
+        rq_job.id = '1234'
+        rq_job.get_status.return_value = 'finished'
+        job = ServiceJob(rq_job)
+        self.assertEqual(job.id, '1234')
+        self.assertEqual(job.get_status(), 'finished')
+
+    def test_wait_timeout(self):
+        rq_job = self._get_rq_job(iter(lambda: False, True))
+        with self.assertRaises(ServiceTimeoutError):
+            ServiceJob(rq_job).wait(timeout=0.01)
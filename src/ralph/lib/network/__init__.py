@@ -3,6 +3,10 @@ domain-related exceptions."""
 
 
 import socket
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
 
 # moved from old ralph's source code
 # OLD_PATH: ralph/util/network.py
@@ -18,3 +22,69 @@ def hostname(ip, reverse=False):
         return result[0] if not reverse else result[2][0]
     except socket.error:
         return None
+
+
+class CachedResolver(object):
+    """
+    Wrapper around `hostname` with bounded time of single lookup and
+    (process-local) cache of results.
+
+    Lookup is performed in separate thread, so it could be abandoned after
+    `timeout` seconds (`socket.gethostbyaddr` doesn't accept timeout).
+    Successful lookups are cached for `ttl` seconds, failed ones (no
+    hostname or timeout) for `negative_ttl` seconds.
+
+    Abandoned lookups are still occupying workers, so number of outstanding
+    lookups is limited by `max_pending` - when it's reached (ex. DNS is
+    slow), None is returned immediately (without queueing the lookup).
+    """
+    def __init__(self, max_workers=4, max_size=10000, max_pending=16):
+        self.max_size = max_size
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._pending = threading.BoundedSemaphore(max_pending)
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_from_cache(self, key):
+        with self._lock:
+            expires_at, result = self._cache.get(key, (0, None))
+            if expires_at > time.monotonic():
+                self._cache.move_to_end(key)
+                return True, result
+            self._cache.pop(key, None)
+        return False, None
+
+    def _store_in_cache(self, key, result, ttl):
+        with self._lock:
+            self._cache[key] = (time.monotonic() + ttl, result)
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def hostname(
+        self, ip, reverse=False, timeout=1, ttl=3600, negative_ttl=300
+    ):
+        """
+        Same as `hostname` function, but returns None if lookup takes longer
+        than `timeout` seconds and caches results.
+        """
+        key = (str(ip), reverse)
+        found, result = self._get_from_cache(key)
+        if found:
+            return result
+        if not self._pending.acquire(blocking=False):
+            return None
+        future = self._executor.submit(hostname, ip, reverse)
+        future.add_done_callback(lambda f: self._pending.release())
+        try:
+            result = future.result(timeout=timeout)
+        except TimeoutError:
+            result = None
+        self._store_in_cache(key, result, ttl if result else negative_ttl)
+        return result
+
+
+resolver = CachedResolver()
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 import logging
+from collections import defaultdict
 from copy import deepcopy
 
 from django import forms
@@ -127,11 +128,16 @@ class PermissionsPerObjectFormMixin(RequestFormMixin):
                 if value and not isinstance(value, (list, tuple, QuerySet)):
                     value = [value]
             if field_name in self.fields and value:
+                objs_by_model = defaultdict(list)
                 for obj in value:
-                    if not obj.has_permission_to_object(self._user):
-                        self.add_error(field_name, ValidationError(
-                            "You don't have permissions to select this value"
-                        ))
+                    objs_by_model[obj.__class__].append(obj)
+                if not all(
+                    model.has_permission_to_objects(self._user, objs)
+                    for model, objs in objs_by_model.items()
+                ):
+                    self.add_error(field_name, ValidationError(
+                        "You don't have permissions to select this value"
+                    ))
 
     def clean(self):
         super().clean()
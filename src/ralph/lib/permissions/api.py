@@ -42,10 +42,23 @@ class ObjectPermissionsMixin(object):
     `rest_framework.permissions.BasePermission` subclasses.
     """
     def has_object_permission(self, request, view, obj):
-        result = super().has_object_permission(request, view, obj)
-        if isinstance(obj, PermissionsForObjectMixin):
-            result &= obj.has_permission_to_object(request.user)
-        return result
+        return self.has_objects_permission(request, view, [obj])
+
+    def has_objects_permission(self, request, view, objs):
+        """
+        Check permissions to many objects (ex. whole page) at once - objects
+        of the same model are validated using single query.
+        """
+        objs_by_model = {}
+        for obj in objs:
+            if not super().has_object_permission(request, view, obj):
+                return False
+            if isinstance(obj, PermissionsForObjectMixin):
+                objs_by_model.setdefault(obj.__class__, []).append(obj)
+        return all(
+            model.has_permission_to_objects(request.user, model_objs)
+            for model, model_objs in objs_by_model.items()
+        )
 
 
 class PermissionsPerFieldSerializerMixin(object):
@@ -1,9 +1,15 @@
 import operator
+import time
 
+from django.conf import settings
+from django.core.cache import cache
 from django.db import models
 from django.db.models.base import ModelBase
 from django.utils.translation import ugettext_lazy as _
 
+FIELD_PERMISSIONS_VERSION_CACHE_KEY = 'ralph.permissions.fields.version'
+FIELD_PERMISSIONS_CACHE_KEY_PREFIX = 'ralph.permissions.fields'
+
 
 def get_perm_key(action, class_name, field_name):
     """
@@ -27,6 +33,36 @@ def get_perm_key(action, class_name, field_name):
     return '{}_{}_{}_field'.format(action, class_name, field_name)
 
 
+def _get_field_permissions_version():
+    version = cache.get(FIELD_PERMISSIONS_VERSION_CACHE_KEY)
+    if version is None:
+        version = bump_field_permissions_version()
+    return version
+
+
+def bump_field_permissions_version():
+    """
+    Mark field permissions cached for all users as outdated.
+    """
+    try:
+        return cache.incr(FIELD_PERMISSIONS_VERSION_CACHE_KEY)
+    except ValueError:
+        # start from unique value, so fields cached with counter evicted from
+        # the cache are never considered up to date
+        version = int(time.time() * 1000000)
+        cache.set(FIELD_PERMISSIONS_VERSION_CACHE_KEY, version, None)
+        return version
+
+
+def invalidate_field_permissions(sender, **kwargs):
+    """
+    Signal handler called on every change of users' permissions (see
+    `PermissionAppConfig`).
+    """
+    if settings.FIELD_PERMISSIONS_CACHE:
+        bump_field_permissions_version()
+
+
 class user_permission(object):  # noqa
     """
     Decorator for functions which should validate if user has all rights to
@@ -241,20 +277,51 @@ class PermByFieldMixin(models.Model, metaclass=PermissionsBase):
         :return: List of field names
         :rtype: list
         """
-        result = set()
-        blacklist = cls._permissions.blacklist
-
-        for field in (cls._meta.fields + cls._meta.many_to_many):
-            if (
-                field.name not in blacklist and
-                cls.has_access_to_field(field.name, user, action)
-            ):
-                result.add(field.name)
-        # If the user does not have rights to view,
-        # but has the right to change he can view the field
-        if action == 'view':
-            result |= cls.allowed_fields(user, 'change')
-        return result
+        # allowed fields are memoized on the user object (which lives as long
+        # as the request) and optionally in the Django cache
+        memo = getattr(user, '_allowed_fields_memo', None)
+        if memo is None:
+            memo = user._allowed_fields_memo = {}
+        try:
+            return set(memo[(cls, action)])
+        except KeyError:
+            pass
+        if settings.FIELD_PERMISSIONS_CACHE and user.pk:
+            # superuser and active flags are part of the key - changing them
+            # doesn't invalidate cached fields
+            cache_key = '{}.{}.{}.{:d}{:d}.{}.{}.{}'.format(
+                FIELD_PERMISSIONS_CACHE_KEY_PREFIX,
+                _get_field_permissions_version(),
+                user.pk,
+                user.is_superuser,
+                user.is_active,
+                cls._meta.app_label,
+                cls._meta.model_name,
+                action,
+            )
+            fields = cache.get(cache_key)
+            if fields is None:
+                fields = cls._get_allowed_fields(user, action)
+                cache.set(
+                    cache_key, fields, settings.FIELD_PERMISSIONS_CACHE_TTL
+                )
+        else:
+            fields = cls._get_allowed_fields(user, action)
+        memo[(cls, action)] = fields
+        return set(fields)
+
+    @classmethod
+    def _get_allowed_fields(cls, user, action):
+        """
+        Calculate allowed fields (permissions of the user are fetched once
+        and cached on the user object by authentication backend).
+        """
+        return frozenset(
+            field.name
+            for field in (cls._meta.fields + cls._meta.many_to_many)
+            if field.name not in cls._permissions.blacklist and
+            cls.has_access_to_field(field.name, user, action)
+        )
 
     class Meta:
         abstract = True
@@ -267,13 +334,22 @@ class PermissionsForObjectMixin(models.Model, metaclass=PermissionsBase):
         """
         Check if user has all rights to single object.
         """
-        user_perms = self._permissions.has_access(user)
-        if not user_perms:
+        return self.has_permission_to_objects(user, [self])
+
+    @classmethod
+    def has_permission_to_objects(cls, user, objs):
+        """
+        Check if user has all rights to every passed object (using single
+        query).
+        """
+        user_perms = cls._permissions.has_access(user)
+        pks = set(obj.pk for obj in objs)
+        if not user_perms or not pks:
             return True
-        return self._default_manager.filter(
+        return cls._default_manager.filter(
             user_perms,
-            pk=self.pk
-        ).exists()
+            pk__in=pks
+        ).count() == len(pks)
 
     @classmethod
     def _get_objects_for_user(cls, user, queryset=None):
@@ -1,6 +1,7 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Permission
-from django.test import RequestFactory, TestCase
+from django.core.cache import cache
+from django.test import override_settings, RequestFactory, TestCase
 
 from ralph.assets.models.assets import AssetModel
 from ralph.assets.models.choices import ObjectModelType
@@ -115,3 +116,52 @@ class PermissionsByFieldTestCase(TestCase):
             'manufacturer',
             fields_list
         )
+
+    def test_user_view_allowed_fields_contain_change_fields(self):
+        fields_list = self.asset_model.allowed_fields(self.user, action='view')
+        self.assertEqual(set(['height_of_device']), fields_list)
+
+    def test_allowed_fields_are_memoized_on_user(self):
+        user = get_user_model().objects.get(pk=self.user.pk)
+        self.asset_model.allowed_fields(user, action='change')
+        with self.assertNumQueries(0):
+            fields_list = self.asset_model.allowed_fields(
+                user, action='change'
+            )
+        self.assertEqual(set(['height_of_device']), fields_list)
+
+    @override_settings(FIELD_PERMISSIONS_CACHE=True)
+    def test_allowed_fields_cache_invalidated_on_permission_change(self):
+        cache.clear()
+        user = get_user_model().objects.get(pk=self.user.pk)
+        self.asset_model.allowed_fields(user, action='change')
+        # another request (new user object)
+        user = get_user_model().objects.get(pk=self.user.pk)
+        with self.assertNumQueries(0):
+            fields_list = self.asset_model.allowed_fields(
+                user, action='change'
+            )
+        self.assertEqual(set(['height_of_device']), fields_list)
+
+        user.user_permissions.add(Permission.objects.get(
+            codename='change_assetmodel_name_field',
+        ))
+        user = get_user_model().objects.get(pk=self.user.pk)
+        fields_list = self.asset_model.allowed_fields(user, action='change')
+        self.assertEqual(set(['height_of_device', 'name']), fields_list)
+
+    @override_settings(FIELD_PERMISSIONS_CACHE=True)
+    def test_allowed_fields_cache_after_superuser_demotion(self):
+        cache.clear()
+        user = get_user_model().objects.create(
+            username='demoted', is_superuser=True
+        )
+        self.assertIn(
+            'name', self.asset_model.allowed_fields(user, action='change')
+        )
+        user.is_superuser = False
+        user.save()
+        user = get_user_model().objects.get(pk=user.pk)
+        self.assertEqual(
+            set(), self.asset_model.allowed_fields(user, action='change')
+        )
@@ -117,6 +117,21 @@ class TestPermissionsPerObject(PermissionsTestMixin, TestCase):
             self.long_article_2.has_permission_to_object(self.user1)
         )
 
+    def test_has_permission_to_objects(self):
+        with self.assertNumQueries(1):
+            self.assertTrue(Article.has_permission_to_objects(
+                self.user2, [self.article_1, self.article_2]
+            ))
+        self.assertFalse(Article.has_permission_to_objects(
+            self.user2, [self.article_1, self.article_3]
+        ))
+
+    def test_has_permission_to_objects_for_superuser(self):
+        with self.assertNumQueries(0):
+            self.assertTrue(Article.has_permission_to_objects(
+                self.superuser, [self.article_1, self.article_3]
+            ))
+
     @unpack
     @data(
         # single Article + 2x LongArticle (notice that LongArticle permissions
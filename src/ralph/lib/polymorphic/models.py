@@ -12,22 +12,41 @@ Example:
         <Model3: model3L test>
     ]
 """
-from itertools import groupby
+from collections import defaultdict
+from itertools import islice
 
 from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ObjectDoesNotExist
 from django.db import models
+from django.db.models.query import prefetch_related_objects
+
+
+def _select_related_lookups(select_related, prefix=''):
+    """
+    Convert (nested) select_related dict of the query to list of lookups.
+    """
+    for name, nested in select_related.items():
+        lookup = prefix + name
+        if nested:
+            yield from _select_related_lookups(nested, lookup + '__')
+        else:
+            yield lookup
 
 
 class PolymorphicQuerySet(models.QuerySet):
     _polymorphic_select_related = {}
     _polymorphic_prefetch_related = {}
+    # number of base objects for which descendants are fetched at once
+    _polymorphic_chunk_size = 2000
+    # names of descendant models fetched in the same query as base objects
+    _polymorphic_join = ()
 
     def iterator(self):
         """
         Override iterator:
-            - Iterate for all objects and collected ID
-            - For each ContentType generates additional queryset
-            - Returns iterator with different models
+            - Iterate for objects in chunks (of `_polymorphic_chunk_size`)
+            - For each ContentType in chunk generates additional queryset
+            - Returns iterator with different models (in original order)
         """
         # if this is final-level model, don't check for descendants - just
         # return original queryset result
@@ -35,35 +54,131 @@ class PolymorphicQuerySet(models.QuerySet):
             yield from super().iterator()
             return
 
-        result = []
-        content_types_ids = set()
         select_related = None
         if self.query.select_related:
             select_related = self.query.select_related
             self.query.select_related = False
 
-        for obj in super().iterator():
-            content_types_ids.add(obj.content_type_id)
-            result.append((
-                obj.content_type_id, obj.pk)
+        join_paths = self._get_polymorphic_join_paths()
+        if join_paths:
+            base_queryset = self._clone()
+            base_queryset.query.add_select_related(
+                self._get_polymorphic_join_lookups(join_paths, select_related)
             )
-        # store original order of items by PK
-        pks_order = [r[1] for r in result]
-        # WARNING! sorting result (by content type) breaks original order of
-        # items - we need to restore it at the end of this function
-        result = groupby(sorted(result), lambda x: x[0])
-
-        content_type_model_map = {
-            ct.id: ct.model_class() for ct in ContentType.objects.filter(
-                pk__in=list(content_types_ids)
+            base_iterator = super(
+                PolymorphicQuerySet, base_queryset
+            ).iterator()
+        else:
+            base_iterator = super().iterator()
+        if not self._polymorphic_chunk_size:
+            yield from self._get_descendants(
+                list(base_iterator), select_related, join_paths
             )
-        }
+            return
+        while True:
+            chunk = list(islice(base_iterator, self._polymorphic_chunk_size))
+            if not chunk:
+                break
+            yield from self._get_descendants(chunk, select_related, join_paths)
+
+    def _get_polymorphic_join_paths(self):
+        """
+        Return mapping from joined descendant model to the path (list of
+        reverse parent links names) leading to it from the base model, ex.
+        `{DataCenterAsset: ['asset', 'datacenterasset']}`.
+        """
+        join_paths = {}
+        for model in self.model._polymorphic_descendants:
+            if (
+                model._meta.proxy or
+                model._meta.object_name not in self._polymorphic_join
+            ):
+                continue
+            path = []
+            current = model
+            while current is not self.model:
+                current, link = next(
+                    (parent, link)
+                    for parent, link in current._meta.parents.items()
+                    if issubclass(parent, self.model)
+                )
+                path.insert(0, link.related_query_name())
+            join_paths[model] = path
+        return join_paths
+
+    def _get_polymorphic_join_lookups(self, join_paths, select_related):
+        """
+        Return select_related lookups joining descendant models (together with
+        their related objects) to the base model.
+        """
+        base_lookups = []
+        if isinstance(select_related, dict):
+            base_lookups = list(_select_related_lookups(select_related))
+        lookups = []
+        for model, path in join_paths.items():
+            prefix = '__'.join(path)
+            lookups.append(prefix)
+            for lookup in base_lookups + list(
+                self._polymorphic_select_related.get(
+                    model._meta.object_name, []
+                )
+            ):
+                lookups.append('{}__{}'.format(prefix, lookup))
+        return lookups
+
+    @staticmethod
+    def _get_joined_descendant(obj, path):
+        """
+        Return descendant instance (already fetched by select_related) or
+        None if it's not found.
+        """
+        try:
+            for name in path:
+                obj = getattr(obj, name)
+        except ObjectDoesNotExist:
+            return None
+        return obj
+
+    def _get_descendants(self, objects, select_related=None, join_paths=None):
+        """
+        Return final (descendant) instances of passed base objects, in the
+        same order. Descendants which were not fetched already (using joins)
+        are selected by additional query for every content type.
+        """
+        pks_by_content_type = defaultdict(list)
+        joined_by_model = defaultdict(list)
         result_mapping = {}
-        for k, v in result:
-            model = content_type_model_map[k]
+        for obj in objects:
+            descendant = None
+            if join_paths:
+                model = ContentType.objects.get_for_id(
+                    obj.content_type_id
+                ).model_class()
+                if model in join_paths:
+                    descendant = self._get_joined_descendant(
+                        obj, join_paths[model]
+                    )
+            if descendant is None:
+                pks_by_content_type[obj.content_type_id].append(obj.pk)
+            else:
+                result_mapping[obj.pk] = descendant
+                joined_by_model[model].append(descendant)
+
+        for model, descendants in joined_by_model.items():
+            prefetch_related = self._polymorphic_prefetch_related.get(
+                model._meta.object_name
+            )
+            if prefetch_related:
+                prefetch_related_objects(descendants, prefetch_related)
+
+        for content_type_id, pks in pks_by_content_type.items():
+            # content types are taken from ContentType cache
+            model = ContentType.objects.get_for_id(
+                content_type_id
+            ).model_class()
             polymorphic_models = getattr(model, '_polymorphic_models', [])
             if polymorphic_models and model not in polymorphic_models:
-                model_query = model.objects.filter(pk__in=[i[1] for i in v])
+                model_query = model.objects.filter(pk__in=pks)
                 model_name = model._meta.object_name
                 # first check if select_related/prefetch_related is present for
                 # this model to not trigger selecting/prefetching all related
@@ -83,9 +198,8 @@ class PolymorphicQuerySet(models.QuerySet):
                     )
                 for obj in model_query:
                     result_mapping[obj.pk] = obj
-        # yield objects in original order
-        for pk in pks_order:
-            yield result_mapping[pk]
+        # return objects in original order
+        return [result_mapping[obj.pk] for obj in objects]
 
     def _clone(self, *args, **kwargs):
         clone = super()._clone(*args, **kwargs)
@@ -95,8 +209,38 @@ class PolymorphicQuerySet(models.QuerySet):
         clone._polymorphic_prefetch_related = (
             self._polymorphic_prefetch_related.copy()
         )
+        clone._polymorphic_chunk_size = self._polymorphic_chunk_size
+        clone._polymorphic_join = self._polymorphic_join
         return clone
 
+    def polymorphic_chunk_size(self, chunk_size):
+        """
+        Set number of objects for which descendants are fetched at once
+        (None to fetch all of them at once). Usage:
+
+        >>> MyBaseModel.objects.polymorphic_chunk_size(500)
+        """
+        obj = self._clone()
+        obj._polymorphic_chunk_size = chunk_size
+        return obj
+
+    def polymorphic_join(self, *model_names):
+        """
+        Fetch descendant models (passed as model names) in the same query as
+        base objects (using LEFT JOINs to their tables) instead of separate
+        query for each of them. Select related of base queryset and
+        `polymorphic_select_related` of joined models are joined as well, so
+        keep number of joined models reasonable (ex. MySQL allows up to 61
+        tables in single query). Usage:
+
+        >>> MyBaseModel.objects.polymorphic_join(
+            'MyDescendantModel', 'MyDescendantModel2'
+        )
+        """
+        obj = self._clone()
+        obj._polymorphic_join = tuple(model_names)
+        return obj
+
     def polymorphic_select_related(self, **kwargs):
         """
         Apply select related on descendant model (passed as model name). Usage:
@@ -48,10 +48,10 @@ class PolymorphicTestCase(TestCase):
 
     def test_polymorphic_queryset(self):
         result = []
-        with self.assertNumQueries(7):
+        with self.assertNumQueries(6):
             # queries:
             # select PolymorphicModelBaseTest
-            # select content types
+            # (content types are taken from ContentType cache)
             # select PolymorphicModelTest
             # select SomethingRelated (from sth_related) x2
             # select PolymorphicModelTest2
@@ -67,10 +67,9 @@ class PolymorphicTestCase(TestCase):
         self.assertIn('PolymorphicModelTest2: {}'.format(self.pol_3.pk), result)
 
     def test_polymorphic_queryset_with_select_related(self):
-        with self.assertNumQueries(4):
+        with self.assertNumQueries(3):
             # queries:
             # select PolymorphicModelBaseTest
-            # select content types
             # select PolymorphicModelTest
             # select PolymorphicModelTest2
             for item in PolymorphicModelBaseTest.polymorphic_objects.polymorphic_select_related(  # noqa
@@ -86,6 +85,53 @@ class PolymorphicTestCase(TestCase):
         r = list(PolymorphicModelBaseTest.polymorphic_objects.order_by('-name'))
         self.assertEqual(r, [self.pol_3, self.pol_2, self.pol_1])
 
+    def test_polymorphic_queryset_in_chunks(self):
+        with self.assertNumQueries(3):
+            # queries:
+            # select PolymorphicModelBaseTest
+            # select PolymorphicModelTest (pol_1 and pol_2 in first chunk)
+            # select PolymorphicModelTest2 (pol_3 in second chunk)
+            r = list(
+                PolymorphicModelBaseTest.polymorphic_objects.polymorphic_chunk_size(  # noqa
+                    2
+                ).order_by('name')
+            )
+        self.assertEqual(r, [self.pol_1, self.pol_2, self.pol_3])
+        self.assertIsInstance(r[2], PolymorphicModelTest2)
+
+    def test_polymorphic_queryset_with_join(self):
+        with self.assertNumQueries(1):
+            # queries:
+            # select PolymorphicModelBaseTest joined with PolymorphicModelTest
+            # and PolymorphicModelTest2 (and their related objects)
+            r = list(
+                PolymorphicModelBaseTest.polymorphic_objects.polymorphic_join(
+                    'PolymorphicModelTest', 'PolymorphicModelTest2'
+                ).polymorphic_select_related(
+                    PolymorphicModelTest2=['another_related'],
+                ).select_related('sth_related').order_by('name')
+            )
+            for item in r:
+                item.sth_related
+            r[2].another_related
+        self.assertEqual(r, [self.pol_1, self.pol_2, self.pol_3])
+        self.assertIsInstance(r[0], PolymorphicModelTest)
+        self.assertIsInstance(r[2], PolymorphicModelTest2)
+        self.assertEqual(r[2].name, 'Pol3')
+
+    def test_polymorphic_queryset_with_partial_join(self):
+        with self.assertNumQueries(2):
+            # queries:
+            # select PolymorphicModelBaseTest joined with PolymorphicModelTest
+            # select PolymorphicModelTest2
+            r = list(
+                PolymorphicModelBaseTest.polymorphic_objects.polymorphic_join(
+                    'PolymorphicModelTest'
+                ).order_by('-name')
+            )
+        self.assertEqual(r, [self.pol_3, self.pol_2, self.pol_1])
+        self.assertIsInstance(r[0], PolymorphicModelTest2)
+
     def test_polymorphic_queryset_use_regular_iterator(self):
         with self.assertNumQueries(1):
             list(PolymorphicModelTest.polymorphic_objects.all())
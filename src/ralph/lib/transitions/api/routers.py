@@ -4,6 +4,7 @@ from django.conf.urls import url
 from ralph.api import router
 from ralph.lib.transitions.api.views import (
     TransitionActionViewSet,
+    TransitionJobBatchViewSet,
     TransitionJobViewSet,
     TransitionModelViewSet,
     TransitionView,
@@ -14,6 +15,7 @@ router.register(r'transitions', TransitionViewSet)
 router.register(r'transitions-action', TransitionActionViewSet)
 router.register(r'transitions-model', TransitionModelViewSet)
 router.register(r'transitions-job', TransitionJobViewSet)
+router.register(r'transitions-job-batch', TransitionJobBatchViewSet)
 
 
 urlpatterns = [url(
@@ -6,6 +6,7 @@ from ralph.lib.transitions.models import (
     Action,
     Transition,
     TransitionJob,
+    TransitionJobBatch,
     TransitionModel
 )
 
@@ -37,3 +38,11 @@ class TransitionJobSerializer(RalphAPISerializer):
     class Meta:
         model = TransitionJob
         exclude = ('content_type',)
+
+
+class TransitionJobBatchSerializer(RalphAPISerializer):
+    # number of transition jobs of the batch by status
+    progress = serializers.ReadOnlyField()
+
+    class Meta:
+        model = TransitionJobBatch
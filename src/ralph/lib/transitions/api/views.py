@@ -11,6 +11,7 @@ from ralph.lib.mixins.api import ChoiceFieldWithOtherOptionField
 from ralph.lib.mixins.forms import ChoiceFieldWithOtherOption
 from ralph.lib.transitions.api.serializers import (
     TransitionActionSerializer,
+    TransitionJobBatchSerializer,
     TransitionJobSerializer,
     TransitionModelSerializer,
     TransitionSerializer
@@ -20,6 +21,7 @@ from ralph.lib.transitions.models import (
     run_transition,
     Transition,
     TransitionJob,
+    TransitionJobBatch,
     TransitionModel
 )
 from ralph.lib.transitions.views import collect_actions
@@ -56,6 +58,11 @@ class TransitionJobViewSet(RalphReadOnlyAPIViewSet):
     serializer_class = TransitionJobSerializer
 
 
+class TransitionJobBatchViewSet(RalphReadOnlyAPIViewSet):
+    queryset = TransitionJobBatch.objects.all()
+    serializer_class = TransitionJobBatchSerializer
+
+
 class TransitionModelViewSet(RalphReadOnlyAPIViewSet):
     queryset = TransitionModel.objects.all()
     serializer_class = TransitionModelSerializer
@@ -2,49 +2,283 @@
 Asynchronous runner for transitions
 """
 import logging
+from collections import defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
 
-from django.db import transaction
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import F
 
 from ralph.attachments.models import Attachment
+from ralph.lib.external_services.base import InternalService
+from ralph.lib.external_services.models import JobStatus
 from ralph.lib.transitions.exceptions import (
     AsyncTransitionError,
     FailedActionError,
     MoreThanOneStartedActionError,
-    RescheduleAsyncTransitionActionLater
+    RescheduleAsyncTransitionActionLater,
+    TransitionNotAllowedError
 )
 from ralph.lib.transitions.models import (
     _check_action_with_instances,
     _check_instances_for_transition,
-    _order_actions_by_requirements,
+    _group_actions_by_requirements,
     _post_transition_instance_processing,
     _prepare_action_data,
     TransitionJob,
     TransitionJobAction,
-    TransitionJobActionStatus
+    TransitionJobActionStatus,
+    TransitionJobBatch
 )
 
 logger = logging.getLogger(__name__)
 
+ActionRescheduling = namedtuple('ActionRescheduling', ['wait_for', 'delay'])
+# params of transition job modified by actions
+MUTABLE_PARAMS = ('history_kwargs', 'shared_params')
 
-def _check_previous_actions(job, executed_actions):
+
+def _check_previous_actions(job, executed_actions, actions_levels=()):
     """
     Check if:
     * none of previously executed actions has failed
-    * there is max 1 started action
+    * all started actions belong to the same level of actions (there is max
+      1 started action when actions are performed sequentially)
     """
-    started_actions = 0
+    started_actions = set()
     for action in executed_actions:
         if action.status == TransitionJobActionStatus.FAILED:
             job.fail('Action {} has failed.'.format(action))
             raise FailedActionError()
         elif action.status == TransitionJobActionStatus.STARTED:
-            started_actions += 1
+            started_actions.add(action.action_name)
 
-    if started_actions > 1:
+    if len(started_actions) > 1 and not any(
+        started_actions.issubset(level) for level in actions_levels
+    ):
         job.fail('More than one started action')
         raise MoreThanOneStartedActionError()
 
 
+def _get_reschedule_delay(func, retries, waiting=False):
+    """
+    Return delay (in seconds) of rescheduling action after `retries` retries
+    (exponential backoff).
+
+    When action is `waiting` for the event, delay is the safety-net timeout
+    after which action is checked again even if the event was not signalled
+    (it's at least `ASYNC_TRANSITION_ACTION_WAIT_TIMEOUT`).
+    """
+    delay = func.reschedule_delay
+    if delay is None:
+        delay = settings.ASYNC_TRANSITION_ACTION_RESCHEDULE_DELAY
+    backoff = (
+        func.reschedule_backoff or
+        settings.ASYNC_TRANSITION_ACTION_RESCHEDULE_BACKOFF
+    )
+    delay = min(
+        delay * backoff ** (retries - 1),
+        settings.ASYNC_TRANSITION_ACTION_RESCHEDULE_MAX_DELAY
+    )
+    if waiting:
+        delay = max(delay, settings.ASYNC_TRANSITION_ACTION_WAIT_TIMEOUT)
+    return delay
+
+
+def _count_action_retry(tja, func, waiting=False):
+    """
+    Increase number of action's retries and return delay of rescheduling.
+
+    When action is `waiting` for the event, return timeout of waiting only -
+    waiting is not counted as retry (job could be resumed by the event many
+    times before action is ready).
+    """
+    if waiting:
+        return _get_reschedule_delay(func, tja.retries + 1, waiting=True)
+    max_retries = func.max_retries
+    if max_retries is None:
+        max_retries = settings.ASYNC_TRANSITION_ACTION_MAX_RETRIES
+    tja.retries += 1
+    if max_retries and tja.retries > max_retries:
+        raise FailedActionError('Max retries of {} exceeded'.format(
+            tja.action_name
+        ))
+    # update only retries - status could be changed in the meantime
+    TransitionJobAction.objects.filter(pk=tja.pk).update(
+        retries=F('retries') + 1
+    )
+    return _get_reschedule_delay(func, tja.retries)
+
+
+def _perform_async_action(transition_job, obj, action, params=None):
+    """
+    Perform single action of transition job in separate transaction.
+    Action is using `params` (params of transition job by default).
+
+    Returns:
+        tuple (result, rescheduling) where rescheduling is `None` if action
+        is finished, otherwise `ActionRescheduling` (event to wait for or
+        delay of rescheduling)
+    """
+    logger.info('Performing action {} in transition {} (job: {})'.format(
+        action, transition_job.transition, transition_job
+    ))
+    func = getattr(obj, action.name)
+    # TODO: disable save object ?
+    # data should be in transition_job.params dict
+    defaults = _prepare_action_data(
+        action=action,
+        **(transition_job.params if params is None else params)
+    )
+    tja = TransitionJobAction.objects.get_or_create(
+        transition_job=transition_job,
+        action_name=action.name,
+        defaults=dict(
+            status=TransitionJobActionStatus.STARTED,
+        )
+    )[0]
+    result = rescheduling = None
+    try:
+        # we shouldn't run whole transition atomically since it could be
+        # spreaded to multiple processes (multiple tasks) - run single
+        # action in transaction instead
+        with transaction.atomic():
+            try:
+                result = func(instances=[obj], tja=tja, **defaults)
+            except RescheduleAsyncTransitionActionLater as e:
+                # action is not ready - reschedule this job later (or
+                # wait for the event) and continue when you left off
+                rescheduling = ActionRescheduling(
+                    wait_for=e.wait_for,
+                    delay=_count_action_retry(
+                        tja, func, waiting=bool(e.wait_for)
+                    )
+                )
+    except Exception as e:
+        logger.exception(e)
+        tja.status = TransitionJobActionStatus.FAILED
+        raise FailedActionError('Action {} has failed'.format(action.name)) from e  # noqa
+    else:
+        if rescheduling is None:
+            tja.status = TransitionJobActionStatus.FINISHED
+    finally:
+        # action which is not finished yet (rescheduled) is already saved
+        # as started - don't overwrite status changed in the meantime
+        # (ex. by `Deployment.mark_as_done`)
+        if tja.status != TransitionJobActionStatus.STARTED:
+            tja.save()
+    return result, rescheduling
+
+
+def _copy_mutable_params(params):
+    return dict(params, **{
+        param: deepcopy(params[param])
+        for param in MUTABLE_PARAMS if param in params
+    })
+
+
+def _merge_params(params, changed_params):
+    """
+    Merge (recursively) params changed by action into `params`.
+    """
+    for key, value in changed_params.items():
+        if isinstance(value, dict) and isinstance(params.get(key), dict):
+            _merge_params(params[key], value)
+        else:
+            params[key] = value
+
+
+def _perform_async_action_in_thread(transition_job, obj, action, params):
+    try:
+        return _perform_async_action(transition_job, obj, action, params)
+    finally:
+        # every thread uses its own database connections
+        for connection in connections.all():
+            connection.close()
+
+
+def _perform_async_actions_level(transition_job, obj, actions):
+    """
+    Perform independent actions (single level) of transition job -
+    concurrently, when `ASYNC_TRANSITION_MAX_PARALLEL_ACTIONS` is greater
+    than 1 (every action in its own thread and transaction).
+
+    Returns:
+        list of tuples (action, result, rescheduling)
+    """
+    max_workers = min(
+        len(actions), settings.ASYNC_TRANSITION_MAX_PARALLEL_ACTIONS
+    )
+    if max_workers <= 1:
+        results = []
+        for action in actions:
+            result, rescheduling = _perform_async_action(
+                transition_job, obj, action
+            )
+            results.append((action, result, rescheduling))
+            if rescheduling:
+                break
+        return results
+
+    # every action (thread) is modifying its own copy of params - they are
+    # merged into params of transition job after all actions are finished
+    actions_params = [
+        (action, _copy_mutable_params(transition_job.params))
+        for action in actions
+    ]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            (action, params, executor.submit(
+                _perform_async_action_in_thread, transition_job, obj, action,
+                params
+            ))
+            for action, params in actions_params
+        ]
+    results = []
+    failure = None
+    for action, params, future in futures:
+        try:
+            results.append((action,) + future.result())
+        except FailedActionError as e:
+            failure = failure or e
+        else:
+            for param in MUTABLE_PARAMS:
+                if param in params:
+                    _merge_params(transition_job.params[param], params[param])
+    # raise error after all actions are finished
+    if failure:
+        raise failure
+    return results
+
+
+def _reschedule_transition_job(transition_job, reschedulings, since):
+    """
+    Reschedule transition job after the shortest delay of rescheduled actions
+    or (if all of them are waiting) wait for the event - at most until the
+    shortest timeout of waiting actions.
+    """
+    delays = [r.delay for r in reschedulings if not r.wait_for]
+    if delays:
+        transition_job.reschedule(delay=min(delays))
+    else:
+        transition_job.wait(
+            reschedulings[0].wait_for, since=since,
+            timeout=min(r.delay for r in reschedulings)
+        )
+
+
+def _finish_async_transition(transition_job, attachment=None):
+    # save obj and history
+    _post_transition_instance_processing(
+        transition_job.obj, transition_job.transition,
+        transition_job.params['data'],
+        history_kwargs=transition_job.params['history_kwargs'],
+        user=transition_job.user, attachment=attachment,
+    )
+    transition_job.success()
+
+
 def run_async_transition(job_id):
     transition_job = TransitionJob.objects.get(pk=job_id)
     try:
@@ -52,6 +286,237 @@ def run_async_transition(job_id):
     except Exception as e:
         logger.exception(e)
         transition_job.fail(str(e))
+    if transition_job.batch_id:
+        transition_job.batch.update_status()
+
+
+def run_async_transitions_batch(job_id, transition_jobs_ids=None):
+    """
+    Split batch of transition jobs into parts (when `transition_jobs_ids` is
+    not passed) or perform part of the batch.
+    """
+    batch = TransitionJobBatch.objects.get(pk=job_id)
+    try:
+        if transition_jobs_ids is None:
+            _split_async_transitions_batch(batch)
+        else:
+            _perform_async_transitions_batch(batch, list(
+                TransitionJob.objects.filter(pk__in=transition_jobs_ids)
+            ))
+    except Exception as e:
+        logger.exception(e)
+    batch.update_status()
+
+
+def _split_async_transitions_batch(batch):
+    """
+    Queue (at most `ASYNC_TRANSITION_BATCH_WORKERS`) worker jobs performing
+    parts of the batch.
+    """
+    jobs_ids = list(batch.transition_jobs.values_list('pk', flat=True))
+    workers = min(len(jobs_ids), settings.ASYNC_TRANSITION_BATCH_WORKERS)
+    batch.status = JobStatus.STARTED
+    batch.save()
+    service = InternalService(batch.service_name)
+    for i in range(workers):
+        service.run_async(
+            job_id=batch.id, transition_jobs_ids=jobs_ids[i::workers]
+        )
+
+
+def _get_transitions_batch_jobs(transition, transition_jobs):
+    """
+    Return jobs of the batch which could be performed (with fetched objects).
+    Job which object does not exist (or could not be transitioned) is failed.
+    """
+    jobs = [job for job in transition_jobs if job.is_running]
+    objects = transition.model_cls._default_manager.in_bulk(
+        [job.object_id for job in jobs]
+    )
+    objects = {str(pk): obj for pk, obj in objects.items()}
+    for job in jobs[:]:
+        try:
+            job.obj = objects[job.object_id]
+        except KeyError:
+            job.fail('Object {} does not exist'.format(job.object_id))
+            jobs.remove(job)
+    if not jobs:
+        return jobs
+    try:
+        _check_instances_for_transition([job.obj for job in jobs], transition)
+    except TransitionNotAllowedError as e:
+        for job in jobs[:]:
+            if job.obj in e.errors:
+                job.fail('{}: {}'.format(e.message, e.errors[job.obj]))
+                jobs.remove(job)
+    return jobs
+
+
+def _perform_async_transitions_batch(batch, transition_jobs):
+    """
+    Perform part of the batch. Checks and ordering of actions are done once
+    for all jobs. Actions marked with `run_in_batch` are performed once for
+    objects of all jobs, other actions - for every object separately.
+
+    Job which is rescheduled (or failed) is excluded from further processing
+    of the batch (rescheduled job is continued as a separate transition job).
+    """
+    transition = batch.transition
+    model = transition.model_cls
+    jobs = _get_transitions_batch_jobs(transition, transition_jobs)
+    if not jobs:
+        return
+    try:
+        _check_action_with_instances([job.obj for job in jobs], transition)
+        actions_levels = list(
+            _group_actions_by_requirements(transition.actions.all(), model)
+        )
+    except Exception as e:
+        for job in jobs:
+            job.fail(str(e))
+        raise
+
+    attachments = {}
+    for level in actions_levels:
+        batch_actions = [
+            action for action in level
+            if getattr(model, action.name).run_in_batch
+        ]
+        for action in batch_actions:
+            if not jobs:
+                return
+            jobs, attachment = _perform_async_action_in_batch(jobs, action)
+            if isinstance(attachment, Attachment):
+                attachments.update((job.pk, attachment) for job in jobs)
+        actions = [action for action in level if action not in batch_actions]
+        if actions:
+            jobs = [
+                job for job in jobs
+                if _perform_async_actions_level_in_batch(
+                    job, actions, attachments
+                )
+            ]
+
+    for job in jobs:
+        _finish_async_transition(job, attachments.get(job.pk))
+
+
+def _perform_async_actions_level_in_batch(job, actions, attachments):
+    """
+    Perform (not batch) actions of single level for job of the batch.
+
+    Returns:
+        True if job could be continued in batch, False if it was failed or
+        rescheduled
+    """
+    started = job.get_current_time()
+    reschedulings = []
+    try:
+        for action, result, rescheduling in (
+            _perform_async_actions_level(job, job.obj, actions)
+        ):
+            if rescheduling:
+                reschedulings.append(rescheduling)
+            elif isinstance(result, Attachment):
+                attachments[job.pk] = result
+    except FailedActionError as e:
+        job.fail(str(e))
+        return False
+    if reschedulings:
+        _reschedule_transition_job(job, reschedulings, started)
+        return False
+    return True
+
+
+def _perform_async_action_in_batch(jobs, action):
+    """
+    Perform action once for objects of all jobs (in single transaction).
+    Action is not receiving `tja` (there is separate `TransitionJobAction`
+    for every job).
+
+    Returns:
+        tuple (list of jobs which could be continued in batch, result)
+    """
+    logger.info('Performing action {} in batch of {} jobs'.format(
+        action, len(jobs)
+    ))
+    func = getattr(jobs[0].obj, action.name)
+    # history kwargs and shared params are stored separately in every job
+    # (by object's pk)
+    merged_params = {
+        param: defaultdict(dict)
+        for param in ('history_kwargs', 'shared_params')
+    }
+    for job in jobs:
+        for param, value in merged_params.items():
+            value[job.obj.pk] = job.params[param][job.obj.pk]
+    defaults = _prepare_action_data(
+        action=action, **dict(jobs[0].params, **merged_params)
+    )
+    tjas = [
+        TransitionJobAction.objects.get_or_create(
+            transition_job=job,
+            action_name=action.name,
+            defaults=dict(
+                status=TransitionJobActionStatus.STARTED,
+            )
+        )[0]
+        for job in jobs
+    ]
+    started = jobs[0].get_current_time()
+    result = rescheduling = None
+    try:
+        with transaction.atomic():
+            try:
+                result = func(
+                    instances=[job.obj for job in jobs], **defaults
+                )
+            except RescheduleAsyncTransitionActionLater as e:
+                rescheduling = e
+    except Exception as e:
+        logger.exception(e)
+        for job, tja in zip(jobs, tjas):
+            _fail_action_in_batch(job, tja, 'Action {} has failed'.format(
+                action.name
+            ))
+        return [], None
+    for job in jobs:
+        for param, value in merged_params.items():
+            job.params[param][job.obj.pk] = value[job.obj.pk]
+    if rescheduling is None:
+        for tja in tjas:
+            tja.status = TransitionJobActionStatus.FINISHED
+            tja.save()
+        return jobs, result
+
+    # every job is rescheduled (or waiting) and continued separately
+    for job, tja in zip(jobs, tjas):
+        _reschedule_action_in_batch(job, tja, func, rescheduling, started)
+    return [], None
+
+
+def _fail_action_in_batch(job, tja, reason):
+    tja.status = TransitionJobActionStatus.FAILED
+    tja.save()
+    job.fail(reason)
+
+
+def _reschedule_action_in_batch(job, tja, func, rescheduling, since):
+    """
+    Reschedule (or wait for the event) job which action performed in batch
+    is not ready yet. Job is failed when max retries of action is exceeded.
+    """
+    try:
+        delay = _count_action_retry(
+            tja, func, waiting=bool(rescheduling.wait_for)
+        )
+    except FailedActionError as e:
+        _fail_action_in_batch(job, tja, str(e))
+    else:
+        if rescheduling.wait_for:
+            job.wait(rescheduling.wait_for, since=since, timeout=delay)
+        else:
+            job.reschedule(delay=delay)
 
 
 # TODO: unify this function with `ralph.lib.transitions.models.run_field_transition`  # noqa
@@ -67,10 +532,15 @@ def _perform_async_transition(transition_job):
             'Runnig previously ended transition job: {}'.format(transition_job)
         )
         return
+    actions_levels = list(
+        _group_actions_by_requirements(transition.actions.all(), obj)
+    )
     # make sure that none of previous actions has failed
     executed_actions = list(transition_job.transition_job_actions.all())
     try:
-        _check_previous_actions(transition_job, executed_actions)
+        _check_previous_actions(transition_job, executed_actions, [
+            set(action.name for action in level) for level in actions_levels
+        ])
     except AsyncTransitionError:
         return
 
@@ -81,58 +551,30 @@ def _perform_async_transition(transition_job):
     attachment = None
     # TODO: move this to transition (sth like
     # `for action in transition.get_actions(obj)`)
-    for action in _order_actions_by_requirements(transition.actions.all(), obj):
-        if action.name in completed_actions_names:
-            logger.debug('Action {} already performed - skipping'.format(
-                action.name
-            ))
+    for level in actions_levels:
+        actions = []
+        for action in level:
+            if action.name in completed_actions_names:
+                logger.debug('Action {} already performed - skipping'.format(
+                    action.name
+                ))
+            else:
+                actions.append(action)
+        if not actions:
             continue
-        logger.info('Performing action {} in transition {} (job: {})'.format(
-            action, transition, transition_job
-        ))
-        func = getattr(obj, action.name)
-        # TODO: disable save object ?
-        # data should be in transition_job.params dict
-        defaults = _prepare_action_data(
-            action=action,
-            **transition_job.params
-        )
-        tja = TransitionJobAction.objects.get_or_create(
-            transition_job=transition_job,
-            action_name=action.name,
-            defaults=dict(
-                status=TransitionJobActionStatus.STARTED,
-            )
-        )[0]
-        try:
-            # we shouldn't run whole transition atomically since it could be
-            # spreaded to multiple processes (multiple tasks) - run single
-            # action in transaction instead
-            with transaction.atomic():
-                try:
-                    result = func(instances=[obj], tja=tja, **defaults)
-                except RescheduleAsyncTransitionActionLater as e:
-                    # action is not ready - reschedule this job later and
-                    # continue when you left off
-                    transition_job.reschedule()
-                    return
-                else:
-                    if isinstance(result, Attachment):
-                        attachment = result
-        except Exception as e:
-            logger.exception(e)
-            tja.status = TransitionJobActionStatus.FAILED
-            raise FailedActionError('Action {} has failed'.format(action.name)) from e  # noqa
-        else:
-            tja.status = TransitionJobActionStatus.FINISHED
-        finally:
-            tja.save()
-        completed_actions_names.add(action.name)
+        started = transition_job.get_current_time()
+        reschedulings = []
+        for action, result, rescheduling in _perform_async_actions_level(
+            transition_job, obj, actions
+        ):
+            if rescheduling:
+                reschedulings.append(rescheduling)
+                continue
+            if isinstance(result, Attachment):
+                attachment = result
+            completed_actions_names.add(action.name)
+        if reschedulings:
+            _reschedule_transition_job(transition_job, reschedulings, started)
+            return
 
-    # save obj and history
-    _post_transition_instance_processing(
-        obj, transition, transition_job.params['data'],
-        history_kwargs=transition_job.params['history_kwargs'],
-        user=transition_job.user, attachment=attachment,
-    )
-    transition_job.success()
+    _finish_async_transition(transition_job, attachment)
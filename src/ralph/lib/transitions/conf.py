@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
 DEFAULT_ASYNC_TRANSITION_SERVICE_NAME = 'ASYNC_TRANSITIONS'
+ASYNC_TRANSITIONS_BATCH_SERVICE_NAME = 'ASYNC_TRANSITIONS_BATCH'
 TRANSITION_ATTR_TAG = 'transition_action'
 TRANSITION_ORIGINAL_STATUS = (0, 'Keep orginal status')
@@ -17,6 +17,14 @@ def transition_action(method=None, **kwargs):
         func.disable_save_object = kwargs.get('disable_save_object', False)
         func.only_one_action = kwargs.get('only_one_action', False)
         func.is_async = kwargs.get('is_async', False)
+        # action performed once for all objects of batch of asynchronous
+        # transition (see `TransitionJobBatch`)
+        func.run_in_batch = kwargs.get('run_in_batch', False)
+        # rescheduling of async action (see
+        # `ASYNC_TRANSITION_ACTION_RESCHEDULE_*` settings for defaults)
+        func.reschedule_delay = kwargs.get('reschedule_delay', None)
+        func.reschedule_backoff = kwargs.get('reschedule_backoff', None)
+        func.max_retries = kwargs.get('max_retries', None)
         setattr(func, TRANSITION_ATTR_TAG, True)
 
         @wraps(func)
@@ -17,7 +17,14 @@ class TransitionModelNotFoundError(TransitionError):
 
 
 class RescheduleAsyncTransitionActionLater(Exception):
-    pass
+    """
+    Raised by asynchronous action which is not ready yet. When `wait_for`
+    (name of the event) is passed, job is not rescheduled, but it's waiting
+    until this event is signalled (see `Job.resume_waiting`).
+    """
+    def __init__(self, *args, wait_for=None):
+        super().__init__(*args)
+        self.wait_for = wait_for
 
 
 class AsyncTransitionError(TransitionError):
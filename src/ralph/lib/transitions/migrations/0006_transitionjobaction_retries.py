@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transitions', '0005_auto_20160606_1420'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transitionjobaction',
+            name='retries',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
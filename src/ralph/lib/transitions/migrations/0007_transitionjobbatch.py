@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('external_services', '0003_job_not_before'),
+        ('transitions', '0006_transitionjobaction_retries'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TransitionJobBatch',
+            fields=[
+                ('job_ptr', models.OneToOneField(parent_link=True, serialize=False, auto_created=True, to='external_services.Job', primary_key=True)),
+                ('transition', models.ForeignKey(to='transitions.Transition', on_delete=django.db.models.deletion.CASCADE)),
+            ],
+            options={
+                'abstract': False,
+                'ordering': ('-modified', '-created'),
+            },
+            bases=('external_services.job',),
+        ),
+        migrations.AddField(
+            model_name='transitionjob',
+            name='batch',
+            field=models.ForeignKey(null=True, blank=True, related_name='transition_jobs', to='transitions.TransitionJobBatch', on_delete=django.db.models.deletion.SET_NULL),
+        ),
+    ]
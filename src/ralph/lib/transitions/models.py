@@ -31,9 +31,10 @@ from ralph.admin.helpers import (
     get_field_by_relation_path
 )
 from ralph.attachments.models import Attachment
-from ralph.lib.external_services.models import Job
+from ralph.lib.external_services.models import Job, JobStatus
 from ralph.lib.mixins.models import TimeStampMixin
 from ralph.lib.transitions.conf import (
+    ASYNC_TRANSITIONS_BATCH_SERVICE_NAME,
     DEFAULT_ASYNC_TRANSITION_SERVICE_NAME,
     TRANSITION_ATTR_TAG,
     TRANSITION_ORIGINAL_STATUS
@@ -45,6 +46,7 @@ from ralph.lib.transitions.exceptions import (
 from ralph.lib.transitions.fields import TransitionField
 from ralph.lib.transitions.utils import (
     _compare_instances_types,
+    _group_graph_topologically,
     _sort_graph_topologically
 )
 
@@ -210,6 +212,17 @@ def _order_actions_by_requirements(actions, instance):
         yield actions_by_name[action]
 
 
+def _group_actions_by_requirements(actions, instance):
+    """
+    Return generator of lists of actions (levels) in order of requirements.
+    Actions from single level don't depend on each other.
+    """
+    graph = _create_graph_from_actions(actions, instance)
+    actions_by_name = {a.name: a for a in actions}
+    for level in _group_graph_topologically(graph):
+        yield [actions_by_name[action] for action in level]
+
+
 def run_transition(instances, transition_obj_or_name, field, data={}, **kwargs):
     """
     Main function to run transition (async or synchronous).
@@ -219,6 +232,17 @@ def run_transition(instances, transition_obj_or_name, field, data={}, **kwargs):
         first_instance, transition_obj_or_name, field
     )
     if transition.is_async:
+        if (
+            len(instances) > 1 and
+            settings.ASYNC_TRANSITION_BATCH_WORKERS > 0
+        ):
+            return TransitionJobBatch.run(
+                transition.async_service_name or DEFAULT_ASYNC_TRANSITION_SERVICE_NAME,  # noqa
+                instances,
+                transition=transition,
+                data=data,
+                **kwargs
+            )[1]
         job_ids = []
         for instance in instances:
             job_id, job = TransitionJob.run(
@@ -529,6 +553,73 @@ class TransitionJobActionStatus(Choices):
     FAILED = _('failed')
 
 
+class TransitionJobBatch(Job):
+    """
+    Asynchronous transition of multiple objects performed in batch - this
+    (parent) job splits transition jobs of objects into parts performed by
+    (at most) `ASYNC_TRANSITION_BATCH_WORKERS` worker jobs.
+    """
+    transition = models.ForeignKey(Transition, on_delete=models.CASCADE)
+
+    @classmethod
+    def run(cls, service_name, instances, transition, request=None, **kwargs):
+        """
+        Create transition job (not queued) for every instance and run batch.
+
+        Returns:
+            tuple (batch, list of transition jobs ids)
+        """
+        with transaction.atomic():
+            batch = cls.create(
+                ASYNC_TRANSITIONS_BATCH_SERVICE_NAME,
+                defaults=dict(transition=transition),
+                request=request,
+            )
+            job_ids = [
+                TransitionJob.create(
+                    service_name, instance,
+                    transition=transition,
+                    request=request,
+                    defaults=dict(batch=batch),
+                    **kwargs
+                ).id
+                for instance in instances
+            ]
+        batch._enqueue()
+        return batch, job_ids
+
+    @property
+    def progress(self):
+        """
+        Return number of transition jobs of this batch by status name.
+        """
+        return {
+            JobStatus.name_from_id(item['status']): item['count']
+            for item in self.transition_jobs.values('status').annotate(
+                count=models.Count('pk')
+            )
+        }
+
+    def update_status(self):
+        """
+        End batch (as failed if any of its transition jobs has failed) when
+        all its transition jobs are ended.
+        """
+        progress = self.progress
+        if progress.get('queued') or progress.get('started'):
+            return
+        status = JobStatus.FAILED if progress.get('failed') else (
+            JobStatus.FINISHED
+        )
+        # make sure that batch is not ended by another worker
+        if TransitionJobBatch.objects.filter(
+            pk=self.pk,
+            status__in=(JobStatus.QUEUED.id, JobStatus.STARTED.id)
+        ).update(status=status.id):
+            self.status = status
+            logger.info('Batch {} has ended: {}'.format(self, progress))
+
+
 class TransitionJob(Job):
     content_type = models.ForeignKey(ContentType, on_delete=models.PROTECT)
     # char field to allow uids, not only ints
@@ -536,9 +627,22 @@ class TransitionJob(Job):
     obj = GenericForeignKey('content_type', 'object_id')
     transition = models.ForeignKey(Transition, on_delete=models.CASCADE)  # ?
     # TODO: field?
+    batch = models.ForeignKey(
+        TransitionJobBatch,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name='transition_jobs',
+    )
 
     @classmethod
-    def run(
+    def run(cls, service_name, obj, transition, **kwargs):
+        job = cls.create(service_name, obj, transition, **kwargs)
+        job._enqueue()
+        return job.id, job
+
+    @classmethod
+    def create(
         cls, service_name, obj, transition, request=None, defaults=None,
         **kwargs
     ):
@@ -556,7 +660,9 @@ class TransitionJob(Job):
                 # (json needs str as the key of an object)
                 # we need to restore it in `_restore_params`
                 kwargs[p] = {obj.pk: {}}
-        return super().run(service_name, defaults, request=request, **kwargs)
+        return super().create(
+            service_name, defaults, request=request, **kwargs
+        )
 
     @classmethod
     def _restore_params(cls, obj):
@@ -588,7 +694,8 @@ class TransitionJobAction(TimeStampMixin):
         choices=TransitionJobActionStatus(),
         default=TransitionJobActionStatus.STARTED.id,
     )
-    # TODO: add retries field and max retries param for async action
+    # number of times when action was rescheduled
+    retries = models.PositiveIntegerField(default=0)
 
 
 def update_models_attrs():
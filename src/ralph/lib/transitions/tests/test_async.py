@@ -1,13 +1,18 @@
 """
 Test asynchronous transitions
 """
+from datetime import datetime, timedelta
+
 from django.contrib.auth import get_user_model
-from django.test import RequestFactory
+from django.test import override_settings, RequestFactory, TestCase
 
-from ralph.lib.external_services.models import JobStatus
+from ralph.lib.external_services.models import Job, JobStatus
+from ralph.lib.transitions.async import _copy_mutable_params, _merge_params
 from ralph.lib.transitions.models import (
     run_transition,
     TransitionJob,
+    TransitionJobAction,
+    TransitionJobBatch,
     TransitionsHistory
 )
 from ralph.lib.transitions.tests import TransitionTestCase
@@ -97,6 +102,143 @@ class AsyncTransitionsTest(TransitionTestCase):
                 ]
             )
 
+    def test_waiting_for_event_during_async_transition(self):
+        async_order = AsyncOrder.objects.create(name='test')
+        _, transition, _ = self._create_transition(
+            model=async_order, name='prepare',
+            source=[OrderStatus.new.id], target=OrderStatus.to_send.id,
+            actions=['action_waiting_for_event'],
+            async_service_name='ASYNC_TRANSITIONS',
+        )
+        job_id = run_transition(
+            instances=[async_order],
+            transition_obj_or_name=transition,
+            request=self.request,
+            field='status',
+        )[0]
+        job = TransitionJob.objects.get(pk=job_id)
+        self.assertTrue(job.is_running)
+        self.assertEqual(job.waiting_for, 'async_order_ready')
+
+        # event signalled, but job is still not ready
+        self.assertEqual(Job.resume_waiting('async_order_ready'), 1)
+        job.refresh_from_db()
+        self.assertTrue(job.is_running)
+        self.assertEqual(job.waiting_for, 'async_order_ready')
+
+        async_order.name = 'ready'
+        async_order.save()
+        Job.resume_waiting('async_order_ready')
+        job.refresh_from_db()
+        self.assertEqual(job.status, JobStatus.FINISHED.id)
+        self.assertIsNone(job.waiting_for)
+        # resuming by the event is not counted as retry
+        tja = TransitionJobAction.objects.get(transition_job=job)
+        self.assertEqual(tja.retries, 0)
+
+    def test_waiting_for_event_timeout_during_async_transition(self):
+        async_order = AsyncOrder.objects.create(name='test')
+        _, transition, _ = self._create_transition(
+            model=async_order, name='prepare',
+            source=[OrderStatus.new.id], target=OrderStatus.to_send.id,
+            actions=['action_waiting_for_event'],
+            async_service_name='ASYNC_TRANSITIONS',
+        )
+        job_id = run_transition(
+            instances=[async_order],
+            transition_obj_or_name=transition,
+            request=self.request,
+            field='status',
+        )[0]
+        job = TransitionJob.objects.get(pk=job_id)
+        self.assertEqual(job.waiting_for, 'async_order_ready')
+        self.assertGreater(job.not_before, datetime.now())
+        self.assertEqual(Job.resume_scheduled(), 0)
+
+        # event is not signalled, but job is resumed after timeout
+        async_order.name = 'ready'
+        async_order.save()
+        TransitionJob.objects.filter(pk=job_id).update(
+            not_before=datetime.now() - timedelta(seconds=1)
+        )
+        self.assertEqual(Job.resume_scheduled(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, JobStatus.FINISHED.id)
+        self.assertIsNone(job.waiting_for)
+        # already resumed
+        self.assertEqual(Job.resume_waiting('async_order_ready'), 0)
+
+    def test_delayed_rescheduling_during_async_transition(self):
+        async_order = AsyncOrder.objects.create(name='test')
+        _, transition, _ = self._create_transition(
+            model=async_order, name='prepare',
+            source=[OrderStatus.new.id], target=OrderStatus.to_send.id,
+            actions=['action_with_delayed_retries'],
+            async_service_name='ASYNC_TRANSITIONS',
+        )
+        job_id = run_transition(
+            instances=[async_order],
+            transition_obj_or_name=transition,
+            request=self.request,
+            field='status',
+        )[0]
+        job = TransitionJob.objects.get(pk=job_id)
+        tja = TransitionJobAction.objects.get(transition_job=job)
+        self.assertTrue(job.is_running)
+        self.assertGreater(job.not_before, datetime.now())
+        self.assertEqual(tja.retries, 1)
+        # not scheduled yet
+        self.assertEqual(Job.resume_scheduled(), 0)
+
+        for retries in [2, 3]:
+            TransitionJob.objects.filter(pk=job_id).update(
+                not_before=datetime.now() - timedelta(seconds=1)
+            )
+            self.assertEqual(Job.resume_scheduled(), 1)
+            tja.refresh_from_db()
+            self.assertEqual(tja.retries, retries)
+
+        # max retries exceeded
+        job.refresh_from_db()
+        self.assertEqual(job.status, JobStatus.FAILED.id)
+
+    @override_settings(ASYNC_TRANSITION_BATCH_WORKERS=2)
+    def test_run_async_transition_in_batch(self):
+        async_orders = [
+            AsyncOrder.objects.create(name='test{}'.format(i))
+            for i in range(3)
+        ]
+        _, transition, _ = self._create_transition(
+            model=async_orders[0], name='prepare',
+            source=[OrderStatus.new.id], target=OrderStatus.to_send.id,
+            actions=['long_running_action', 'action_in_batch'],
+            async_service_name='ASYNC_TRANSITIONS',
+        )
+        job_ids = run_transition(
+            instances=async_orders,
+            transition_obj_or_name=transition,
+            request=self.request,
+            field='status',
+            data={'name': 'abc'}
+        )
+        batch_sizes = []
+        for job_id, async_order in zip(job_ids, async_orders):
+            job = TransitionJob.objects.get(pk=job_id)
+            async_order.refresh_from_db()
+            self.assertEqual(job.status, JobStatus.FINISHED.id)
+            self.assertEqual(async_order.counter, 3)
+            self.assertEqual(async_order.status, OrderStatus.to_send.id)
+            self.assertEqual(job.transition_job_actions.count(), 2)
+            batch_sizes.append(
+                job.params['shared_params'][async_order.pk]['batch_size']
+            )
+        # 3 jobs performed by 2 workers
+        self.assertCountEqual(batch_sizes, [1, 2, 2])
+        batch = TransitionJobBatch.objects.get()
+        self.assertEqual(batch.status, JobStatus.FINISHED.id)
+        self.assertEqual(batch.progress, {'finished': 3})
+        self.assertEqual(batch.transition_jobs.count(), 3)
+
     def test_run_failing_async_transition(self):
         async_order = AsyncOrder.objects.create(name='test')
         async_order2 = AsyncOrder.objects.create(name='test')
@@ -122,3 +264,24 @@ class AsyncTransitionsTest(TransitionTestCase):
             )
             with self.assertRaises(TransitionsHistory.DoesNotExist):
                 TransitionsHistory.objects.get(object_id=async_order.id)
+
+
+class AsyncActionsParamsTest(TestCase):
+    def test_copy_mutable_params(self):
+        params = {
+            'data': {'name': 'abc'},
+            'history_kwargs': {1: {'a': 1}},
+            'shared_params': {1: {}},
+        }
+        copied = _copy_mutable_params(params)
+        copied['history_kwargs'][1]['b'] = 2
+        copied['shared_params'][1]['c'] = 3
+        self.assertEqual(params['history_kwargs'], {1: {'a': 1}})
+        self.assertEqual(params['shared_params'], {1: {}})
+        self.assertIs(copied['data'], params['data'])
+
+    def test_merge_params_of_concurrent_actions(self):
+        history_kwargs = {1: {'a': 1}}
+        _merge_params(history_kwargs, {1: {'a': 1, 'b': 2}})
+        _merge_params(history_kwargs, {1: {'a': 1, 'c': 3}, 'd': 4})
+        self.assertEqual(history_kwargs, {1: {'a': 1, 'b': 2, 'c': 3}, 'd': 4})
@@ -1,6 +1,10 @@
 from django.test import TestCase
 
-from ralph.lib.transitions.utils import _sort_graph_topologically, CycleError
+from ralph.lib.transitions.utils import (
+    _group_graph_topologically,
+    _sort_graph_topologically,
+    CycleError
+)
 
 
 class TopologicalSortTest(TestCase):
@@ -25,3 +29,26 @@ class TopologicalSortTest(TestCase):
         }
         with self.assertRaises(CycleError):
             [a for a in _sort_graph_topologically(graph)]
+
+
+class TopologicalGroupTest(TestCase):
+    def test_topological_group(self):
+        graph = {
+            1: [],
+            2: [1, 4],
+            3: [],
+            4: [1],
+            5: [4],
+        }
+        levels = list(_group_graph_topologically(graph))
+        self.assertEqual(levels, [[2, 3, 5], [4], [1]])
+
+    def test_topological_group_cycle(self):
+        graph = {
+            1: [2],
+            2: [1, 4],
+            3: [],
+            4: [1]
+        }
+        with self.assertRaises(CycleError):
+            list(_group_graph_topologically(graph))
@@ -36,6 +36,36 @@ def _sort_graph_topologically(graph):
         raise CycleError("Cycle detected during topological sort")
 
 
+def _group_graph_topologically(graph):
+    """
+    Split directed graph into topological levels - every node is placed in
+    the level following the levels of all nodes pointing to it, so nodes
+    from the same level don't depend on each other.
+
+    Args:
+        graph: dict of lists (key is node name, value if list of neighbours)
+
+    Returns:
+        generator of lists of nodes (sorted) in topological order of levels
+    """
+    indeg = {k: 0 for k in graph}
+    for node, edges in graph.items():
+        for edge in edges:
+            indeg[edge] += 1
+    level = [a for a in indeg if indeg[a] == 0]
+    while level:
+        next_level = []
+        for node in level:
+            for dependency in graph[node]:
+                indeg[dependency] -= 1
+                if indeg[dependency] == 0:
+                    next_level.append(dependency)
+        yield sorted(level)
+        level = next_level
+    if any(indeg.values()):
+        raise CycleError("Cycle detected during topological sort")
+
+
 def _compare_instances_types(instances):
     """Function check type of instances.
     Conditions:
@@ -1,6 +1,9 @@
 # -*- coding: utf-8 -*-
 from django.conf import settings
-from rest_framework.exceptions import ValidationError
+from rest_framework import serializers, status
+from rest_framework.decorators import detail_route
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.response import Response
 
 from ralph.api import RalphAPISerializer, RalphAPIViewSet, router
 from ralph.api.serializers import RalphAPISaveSerializer
@@ -9,7 +12,8 @@ from ralph.networks.models import (
     IPAddress,
     Network,
     NetworkEnvironment,
-    NetworkKind
+    NetworkKind,
+    NotEnoughFreeIPsError
 )
 
 
@@ -40,6 +44,11 @@ class NetworkSerializer(RalphAPISerializer):
         depth = 1
 
 
+class IssueNextFreeIPsSerializer(serializers.Serializer):
+    count = serializers.IntegerField(min_value=1, max_value=1024, default=1)
+    contiguous = serializers.BooleanField(default=False)
+
+
 class IPAddressSerializer(RalphAPISerializer):
     ethernet = EthernetSerializer()
     network = NetworkSimpleSerializer()
@@ -98,6 +107,25 @@ class NetworkViewSet(RalphAPIViewSet):
     select_related = ['network_environment', 'kind']
     prefetch_related = ['racks', 'dns_servers']
 
+    @detail_route(methods=['post'], url_path='issue-next-free-ips')
+    def issue_next_free_ips(self, request, pk=None):
+        """
+        Reserve `count` next free IP addresses in the network at once.
+        """
+        if not request.user.has_perm('networks.add_ipaddress'):
+            raise PermissionDenied()
+        network = self.get_object()
+        params = IssueNextFreeIPsSerializer(data=request.data)
+        params.is_valid(raise_exception=True)
+        try:
+            ips = network.issue_next_free_ips(**params.validated_data)
+        except NotEnoughFreeIPsError as e:
+            raise ValidationError(str(e))
+        serializer = IPAddressSerializer(
+            ips, many=True, context=self.get_serializer_context()
+        )
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
 
 class NetworkEnvironmentViewSet(RalphAPIViewSet):
     queryset = NetworkEnvironment.objects.all()
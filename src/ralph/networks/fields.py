@@ -43,3 +43,65 @@ class IPNetwork(Field):
 
     def get_db_prep_save(self, value, connection, **kwargs):
         return str(value)
+
+
+class IPNumberField(Field):
+    """
+    Field for IP address (IPv4 or IPv6) presented as int.
+
+    Number is stored using the most compact representation supported by
+    the database, which preserves ordering of numbers (so range lookups could
+    be performed on it):
+    * PostgreSQL - native NUMERIC(39, 0),
+    * MySQL - BINARY(16) (number as 16 bytes, big-endian),
+    * others (ex. SQLite) - BLOB (number as 16 bytes, big-endian).
+    """
+    IP_NUMBER_BYTES = 16
+
+    def stored_as_number(self, connection):
+        """
+        Return True if number is stored in numeric column (so arithmetic
+        operations could be performed on it in SQL).
+        """
+        return connection.vendor == 'postgresql'
+
+    def db_type(self, connection):
+        if self.stored_as_number(connection):
+            return 'numeric(39, 0)'
+        if connection.vendor == 'mysql':
+            return 'binary({})'.format(self.IP_NUMBER_BYTES)
+        return 'blob'
+
+    def to_python(self, value):
+        if value is None or isinstance(value, int):
+            return value
+        try:
+            return int(value)
+        except (TypeError, ValueError) as exc:
+            raise ValidationError(
+                str(exc),
+                code='invalid',
+                params={'value': value},
+            )
+
+    def get_prep_value(self, value):
+        value = super().get_prep_value(value)
+        if value is None:
+            return value
+        return int(value)
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        if not prepared:
+            value = self.get_prep_value(value)
+        if value is None or self.stored_as_number(connection):
+            return value
+        return connection.Database.Binary(
+            int(value).to_bytes(self.IP_NUMBER_BYTES, 'big')
+        )
+
+    def from_db_value(self, value, expression, connection, context):
+        if value is None or isinstance(value, int):
+            return value
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return int.from_bytes(bytes(value), 'big')
+        return int(value)
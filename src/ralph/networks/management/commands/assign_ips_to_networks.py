@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from ralph.networks.models import IPAddress
+
+
+class Command(BaseCommand):
+
+    help = "Assign every IP address to the most specific network containing it"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            dest='batch_size',
+            type=int,
+            default=1000,
+            help="Number of IP addresses updated in single query",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            updated = IPAddress.objects.assign_networks(
+                batch_size=options['batch_size']
+            )
+        self.stdout.write('{} IP addresses updated\n'.format(updated))
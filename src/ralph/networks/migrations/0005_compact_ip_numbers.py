@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import ipaddress
+from decimal import Decimal
+from itertools import islice
+
+from django.db import migrations, models
+from django.db.models import Case, Value, When
+
+import ralph.networks.fields
+
+
+# max number of rows updated by single query (SQLite limits number of
+# query params to 999)
+CHUNK_SIZE = 150
+
+
+def _update_in_chunks(model, rows, fields):
+    """
+    Update `fields` of rows (tuples of pk and values of fields) using single
+    UPDATE (with CASE expression for every field) per chunk of rows.
+    """
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, CHUNK_SIZE))
+        if not chunk:
+            break
+        values = {}
+        for i, field_name in enumerate(fields, start=1):
+            field = model._meta.get_field(field_name)
+            values[field_name] = Case(
+                *[
+                    When(pk=row[0], then=Value(row[i], output_field=field))
+                    for row in chunk
+                ],
+                output_field=field
+            )
+        model.objects.filter(pk__in=[row[0] for row in chunk]).update(
+            **values
+        )
+
+
+def _fill_numbers(apps, ip_field, min_ip_field, max_ip_field, convert):
+    """
+    Recalculate IP numbers from addresses (source of truth) and store them
+    in passed fields.
+    """
+    IPAddress = apps.get_model('networks', 'IPAddress')
+    Network = apps.get_model('networks', 'Network')
+    _update_in_chunks(IPAddress, (
+        (pk, convert(int(ipaddress.ip_address(address))))
+        for pk, address in IPAddress.objects.values_list(
+            'pk', 'address'
+        ).iterator()
+    ), [ip_field])
+
+    def get_network_numbers(pk, address):
+        network = ipaddress.ip_network(address, strict=False)
+        return (
+            pk,
+            convert(int(network.network_address)),
+            convert(int(network.broadcast_address)),
+        )
+
+    _update_in_chunks(Network, (
+        get_network_numbers(pk, address)
+        for pk, address in Network.objects.values_list(
+            'pk', 'address'
+        ).iterator()
+    ), [min_ip_field, max_ip_field])
+
+
+def fill_compact_numbers(apps, schema_editor):
+    _fill_numbers(apps, 'number', 'min_ip', 'max_ip', int)
+
+
+def fill_decimal_numbers(apps, schema_editor):
+    _fill_numbers(apps, 'number_old', 'min_ip_old', 'max_ip_old', Decimal)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('networks', '0004_auto_20160606_1512'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='network',
+            unique_together=set([]),
+        ),
+        migrations.RenameField(
+            model_name='ipaddress',
+            old_name='number',
+            new_name='number_old',
+        ),
+        migrations.RenameField(
+            model_name='network',
+            old_name='min_ip',
+            new_name='min_ip_old',
+        ),
+        migrations.RenameField(
+            model_name='network',
+            old_name='max_ip',
+            new_name='max_ip_old',
+        ),
+        migrations.AlterField(
+            model_name='ipaddress',
+            name='number_old',
+            field=models.DecimalField(editable=False, decimal_places=0, max_digits=39, null=True, default=None),
+        ),
+        migrations.AlterField(
+            model_name='network',
+            name='min_ip_old',
+            field=models.DecimalField(editable=False, decimal_places=0, max_digits=39, null=True),
+        ),
+        migrations.AlterField(
+            model_name='network',
+            name='max_ip_old',
+            field=models.DecimalField(editable=False, decimal_places=0, max_digits=39, null=True),
+        ),
+        migrations.AddField(
+            model_name='ipaddress',
+            name='number',
+            field=ralph.networks.fields.IPNumberField(editable=False, null=True, default=None),
+        ),
+        migrations.AddField(
+            model_name='network',
+            name='min_ip',
+            field=ralph.networks.fields.IPNumberField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='network',
+            name='max_ip',
+            field=ralph.networks.fields.IPNumberField(editable=False, null=True),
+        ),
+        migrations.RunPython(
+            fill_compact_numbers,
+            reverse_code=fill_decimal_numbers
+        ),
+        migrations.RemoveField(
+            model_name='ipaddress',
+            name='number_old',
+        ),
+        migrations.RemoveField(
+            model_name='network',
+            name='min_ip_old',
+        ),
+        migrations.RemoveField(
+            model_name='network',
+            name='max_ip_old',
+        ),
+        migrations.AlterField(
+            model_name='ipaddress',
+            name='number',
+            field=ralph.networks.fields.IPNumberField(editable=False, unique=True, verbose_name='IP address', help_text='Presented as int.', default=None),
+        ),
+        migrations.AlterField(
+            model_name='network',
+            name='min_ip',
+            field=ralph.networks.fields.IPNumberField(editable=False, verbose_name='smallest IP number'),
+        ),
+        migrations.AlterField(
+            model_name='network',
+            name='max_ip',
+            field=ralph.networks.fields.IPNumberField(editable=False, verbose_name='largest IP number'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='network',
+            unique_together=set([('min_ip', 'max_ip')]),
+        ),
+    ]
@@ -3,11 +3,15 @@ import ipaddress
 import logging
 import socket
 import struct
+import threading
+import time
+from collections import defaultdict
 from itertools import chain
 
 from django.conf import settings
 from django.core.exceptions import ValidationError
-from django.db import models, transaction
+from django.core.signals import request_finished, request_started
+from django.db import connection, models, transaction
 from django.db.models import Q
 from django.db.models.signals import post_migrate
 from django.db.utils import ProgrammingError
@@ -17,7 +21,9 @@ from django.utils.translation import ugettext_lazy as _
 from mptt.models import MPTTModel, TreeForeignKey
 
 from ralph.assets.models import AssetLastHostname, Ethernet
+from ralph.dhcp.cache import invalidate_configs as invalidate_dhcp_configs
 from ralph.lib import network as network_tools
+from ralph.lib.external_services import InternalService
 from ralph.lib.mixins.fields import NullableCharField
 from ralph.lib.mixins.models import (
     AdminAbsoluteUrlMixin,
@@ -25,12 +31,16 @@ from ralph.lib.mixins.models import (
     NamedMixin,
     TimeStampMixin
 )
-from ralph.networks.fields import IPNetwork
+from ralph.networks.fields import IPNetwork, IPNumberField
 from ralph.networks.models.choices import IPAddressStatus
 
 logger = logging.getLogger(__name__)
 
 
+class NotEnoughFreeIPsError(Exception):
+    pass
+
+
 class NetworkKind(NamedMixin, models.Model):
     class Meta:
         verbose_name = _('network kind')
@@ -120,11 +130,9 @@ class NetworkMixin(object):
         raise NotImplementedError()
 
     def get_network(self):
-        network = None
-        networks = self.search_networks()
-        if networks:
-            network = networks[0]
-        return network
+        # fetch only the smallest network (single row, using index on
+        # min_ip and max_ip) instead of all ancestors
+        return self.search_networks().first()
 
 
 class Network(
@@ -182,17 +190,13 @@ class Network(
         on_delete=models.SET_NULL,
     )
     network_environment._autocomplete = False
-    min_ip = models.DecimalField(
+    min_ip = IPNumberField(
         verbose_name=_('smallest IP number'),
         editable=False,
-        max_digits=39,
-        decimal_places=0,
     )
-    max_ip = models.DecimalField(
+    max_ip = IPNumberField(
         verbose_name=_('largest IP number'),
         editable=False,
-        max_digits=39,
-        decimal_places=0,
     )
     kind = models.ForeignKey(
         NetworkKind,
@@ -285,13 +289,19 @@ class Network(
             (3232235776, 3232236031, None)
         """
         enable_save_descendants = kwargs.pop('enable_save_descendants', True)
+        old_range = (self.min_ip, self.max_ip)
+        # address could be changed since network was cached
+        self.__dict__.pop('network', None)
         self.min_ip = int(self.network_address)
         self.max_ip = int(self.broadcast_address)
+        self._range_changed = old_range != (self.min_ip, self.max_ip)
         self._assign_parent()
-        super(Network, self).save(*args, **kwargs)
-        self._assign_ips_to_network()
-        if enable_save_descendants:
-            self._update_subnetworks_parent()
+        with transaction.atomic():
+            super(Network, self).save(*args, **kwargs)
+            if enable_save_descendants and self._range_changed:
+                self._update_subnetworks_parent(old_range)
+            if settings.NETWORKS_ASSIGN_IPS_ON_SAVE:
+                self._assign_ips_to_network()
 
     def delete(self):
         # Save fake address so that all children of network changed its
@@ -301,21 +311,81 @@ class Network(
             self.save()
             super().delete()
 
-    def _update_subnetworks_parent(self):
-        for network in self.__class__.objects.all():
-            network.save(enable_save_descendants=False)
+    def _update_subnetworks_parent(self, old_range):
+        """
+        Reassign parents of networks affected by the change of current
+        network address - networks contained in its old or new range. Only
+        these networks are moved in the MPTT tree (together with their
+        descendants), instead of re-saving every network.
+
+        Networks are CIDR blocks, so any two of them are either disjoint or
+        nested. Thanks to that, when networks are sorted by min_ip ascending
+        and max_ip descending, parent of every network is the last network
+        on the stack of "open" ranges.
+        """
+        ranges = {(self.min_ip, self.max_ip)}
+        if None not in old_range:
+            ranges.add(old_range)
+        query = Q()
+        for min_ip, max_ip in ranges:
+            # networks contained in range and networks containing range
+            query |= Q(min_ip__gte=min_ip, max_ip__lte=max_ip)
+            query |= Q(min_ip__lte=min_ip, max_ip__gte=max_ip)
+        networks = list(
+            self.__class__.objects.filter(query).order_by('min_ip', '-max_ip')
+        )
+        new_parents = {}
+        stack = []
+        for network in networks:
+            while stack and stack[-1].max_ip < network.min_ip:
+                stack.pop()
+            new_parents[network.pk] = stack[-1].pk if stack else None
+            stack.append(network)
+
+        for network in networks:
+            new_parent_id = new_parents[network.pk]
+            if network.pk == self.pk or network.parent_id == new_parent_id:
+                continue
+            # tree fields could be changed by previous moves
+            network.refresh_from_db()
+            network.move_to(
+                self.__class__.objects.get(pk=new_parent_id)
+                if new_parent_id else None,
+                'last-child'
+            )
+
+        if None not in old_range:
+            # IPs assigned directly to this network which are not in its new
+            # range belong now to the smallest network containing old range
+            old_parents = [
+                network for network in networks
+                if network.pk != self.pk and
+                network.min_ip <= old_range[0] and
+                network.max_ip >= old_range[1]
+            ]
+            if IPAddress.objects.filter(network=self).exclude(
+                number__gte=self.min_ip,
+                number__lte=self.max_ip,
+            ).update(network=old_parents[-1] if old_parents else None):
+                invalidate_dhcp_configs()
 
     def _assign_ips_to_network(self):
-        self, IPAddress.objects.exclude(
-            network=self,
-        ).exclude(
-            network__in=self.get_subnetworks()
+        # IPs assigned to this network or to any network contained in its
+        # range (even if it's not placed under this network in the tree yet)
+        # are left untouched
+        contained_networks = Network.objects.filter(
+            min_ip__gte=self.min_ip,
+            max_ip__lte=self.max_ip
+        )
+        if IPAddress.objects.exclude(
+            network__in=contained_networks
         ).filter(
             number__gte=self.min_ip,
             number__lte=self.max_ip
         ).update(
             network=self
-        )
+        ):
+            invalidate_dhcp_configs()
 
     def get_subnetworks(self):
         return self.get_descendants()
@@ -345,25 +415,184 @@ class Network(
         # TODO: handle decreasing count
         return len(to_create), existing_ips - to_create
 
-    def get_first_free_ip(self):
-        used_ips = set(self.ips.values_list('number', flat=True))
-        min_ip = int(self.min_ip if self.netmask == 31 else self.min_ip + 1)
-        max_ip = int(self.max_ip + 1 if self.netmask == 31 else self.max_ip)
-        ip_as_int = None
-        for ip_as_int in range(min_ip, max_ip):
-            if ip_as_int not in used_ips:
-                break
-        # TODO: do it better
-        last = ip_as_int in used_ips
-        return (
-            ipaddress.ip_address(ip_as_int)
-            if ip_as_int and not last else None
+    def _get_assignable_range(self):
+        """
+        Return first and last (inclusive) IP number which could be assigned
+        to a host in this network (network and broadcast addresses are
+        skipped, except for /31 networks).
+        """
+        if self.netmask == 31:
+            return int(self.min_ip), int(self.max_ip)
+        return int(self.min_ip) + 1, int(self.max_ip) - 1
+
+    def _get_next_number_sql(self, column, start, end):
+        """
+        Return SQL expression of IP number following the number stored in
+        `column` (for numbers in range <start, end>) or None if it could not
+        be calculated by the database.
+        """
+        number_field = IPAddress._meta.get_field('number')
+        if number_field.stored_as_number(connection):
+            return '{} + 1'.format(column)
+        # binary number (MySQL) - only 8 lower bytes are incremented, so the
+        # whole range has to share 8 higher bytes (every IPv4 network and
+        # IPv6 networks with prefix not shorter than 64 bits)
+        if connection.vendor == 'mysql' and start >> 64 == end >> 64:
+            return (
+                "CONCAT(SUBSTRING({column}, 1, 8), UNHEX(LPAD(HEX(CAST("
+                "CONV(HEX(SUBSTRING({column}, 9, 8)), 16, 10) AS UNSIGNED"
+                ") + 1), 16, '0')))"
+            ).format(column=column)
+        return None
+
+    def _get_first_free_number(self, start, end):
+        """
+        Return the smallest IP number in range <start, end> which is not used
+        by any IP address, or None if the whole range is used.
+
+        When the database could calculate the following IP number, gap is
+        searched by the database (using unique index on IP number), so used
+        addresses are not fetched.
+        """
+        number_field = IPAddress._meta.get_field('number')
+        if not IPAddress.objects.filter(number=start).exists():
+            return start
+        number_column = 'ip.{}'.format(
+            connection.ops.quote_name(number_field.column)
         )
+        next_number = self._get_next_number_sql(number_column, start, end)
+        if next_number is None:
+            return self._scan_first_free_number(start, end)
+        sql = (
+            'SELECT {ip_number} FROM {table} ip '
+            'WHERE {ip_number} >= %s AND {ip_number} < %s AND NOT EXISTS ('
+            'SELECT 1 FROM {table} next_ip '
+            'WHERE next_ip.{number} = {next_number}'
+            ') ORDER BY {ip_number} LIMIT 1'
+        ).format(
+            table=connection.ops.quote_name(IPAddress._meta.db_table),
+            number=connection.ops.quote_name(number_field.column),
+            ip_number=number_column,
+            next_number=next_number,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [
+                number_field.get_db_prep_value(start, connection),
+                number_field.get_db_prep_value(end, connection),
+            ])
+            row = cursor.fetchone()
+        if not row:
+            return None
+        return number_field.from_db_value(row[0], None, connection, None) + 1
+
+    def _scan_first_free_number(self, start, end, chunk_size=1000):
+        """
+        Fallback for `_get_first_free_number` when the following IP number
+        could not be calculated in SQL - used numbers are fetched in chunks
+        (ordered, using index on IP number) until the first gap.
+        """
+        position = start
+        while position <= end:
+            numbers = list(IPAddress.objects.filter(
+                number__gte=position, number__lte=end
+            ).order_by('number').values_list('number', flat=True)[:chunk_size])
+            for number in numbers:
+                if number != position:
+                    return position
+                position += 1
+            if len(numbers) < chunk_size:
+                break
+        return position if position <= end else None
+
+    def _iter_free_ranges(self):
+        """
+        Yield free ranges (first and last IP number, inclusive) of this
+        network ordered by IP number. Database is queried only around gaps,
+        so the cost doesn't depend on the size of the network.
+        """
+        start, end = self._get_assignable_range()
+        while start <= end:
+            start = self._get_first_free_number(start, end)
+            if start is None:
+                return
+            next_used = IPAddress.objects.filter(
+                number__gt=start, number__lte=end
+            ).order_by('number').values_list('number', flat=True).first()
+            last = end if next_used is None else int(next_used) - 1
+            yield start, last
+            start = last + 2
+
+    def get_free_ips(self, count=1, contiguous=False):
+        """
+        Return list of (at most) `count` first free IP addresses in this
+        network. When `contiguous` is True, all addresses are taken from the
+        first free range big enough to fit them (empty list is returned if
+        there is no such range).
+        """
+        ip_class = type(self.network_address)
+        numbers = []
+        for first, last in self._iter_free_ranges():
+            if contiguous:
+                if last - first + 1 >= count:
+                    numbers = range(first, first + count)
+                    break
+                continue
+            numbers.extend(
+                range(first, min(last + 1, first + count - len(numbers)))
+            )
+            if len(numbers) >= count:
+                break
+        return [ip_class(number) for number in numbers]
+
+    def get_first_free_ip(self):
+        free_ips = self.get_free_ips()
+        return free_ips[0] if free_ips else None
 
     def issue_next_free_ip(self):
-        # TODO: exception when any free IP found
-        ip_address = self.get_first_free_ip()
-        return IPAddress.objects.create(address=str(ip_address))
+        return self.issue_next_free_ips()[0]
+
+    def issue_next_free_ips(self, count=1, contiguous=False):
+        """
+        Reserve `count` next free IP addresses in this network and return
+        them (ordered by address).
+
+        Network and all of its ancestors are locked (SELECT ... FOR UPDATE)
+        until the end of the transaction, so concurrent allocations in this
+        network (or in networks containing it) are serialized instead of
+        colliding. All addresses are created in single query.
+        """
+        if count < 1:
+            return []
+        with transaction.atomic():
+            list(
+                self.get_ancestors(include_self=True).select_for_update()
+            )
+            free_ips = self.get_free_ips(count, contiguous)
+            if len(free_ips) < count:
+                raise NotEnoughFreeIPsError(
+                    'Not enough free IP addresses in {} ({} requested)'.format(
+                        self, count
+                    )
+                )
+            IPAddress.objects.bulk_create([
+                IPAddress(
+                    address=str(ip),
+                    number=int(ip),
+                    network=self,
+                    is_public=not ip.is_private,
+                )
+                for ip in free_ips
+            ])
+            # free addresses could belong to subnetworks of this network -
+            # assign them from the top to the most specific network
+            for subnetwork in self.get_subnetworks().filter(
+                min_ip__lte=int(free_ips[-1]),
+                max_ip__gte=int(free_ips[0]),
+            ):
+                subnetwork._assign_ips_to_network()
+            return list(IPAddress.objects.filter(
+                number__in=[int(ip) for ip in free_ips]
+            ).order_by('number'))
 
     def search_networks(self):
         """
@@ -378,6 +607,91 @@ class Network(
         return nets
 
 
+def resolve_hostname(ip_or_hostname, reverse=False):
+    """
+    Resolve hostname (or address when `reverse` is True) with timeout and
+    caching configured in settings.
+    """
+    return network_tools.resolver.hostname(
+        ip_or_hostname,
+        reverse=reverse,
+        timeout=settings.CHECK_IP_HOSTNAME_TIMEOUT,
+        ttl=settings.CHECK_IP_HOSTNAME_CACHE_TTL,
+        negative_ttl=settings.CHECK_IP_HOSTNAME_NEGATIVE_CACHE_TTL,
+    )
+
+
+def fill_ip_hostname(ip_id):
+    """
+    Resolve hostname of IP address in the background (RQ job) and store it
+    if IP doesn't have hostname yet.
+    """
+    for attempt in range(settings.CHECK_IP_HOSTNAME_ASYNC_RETRIES + 1):
+        if attempt:
+            time.sleep(settings.CHECK_IP_HOSTNAME_ASYNC_RETRY_DELAY)
+        ip = IPAddress.objects.filter(pk=ip_id).values_list(
+            'address', 'hostname'
+        ).first()
+        # IP could be not visible yet (transaction not commited)
+        if ip:
+            break
+    else:
+        logger.warning('IP {} not found - skipping hostname lookup'.format(
+            ip_id
+        ))
+        return
+    address, hostname = ip
+    if hostname:
+        return
+    hostname = resolve_hostname(address)
+    if hostname:
+        # update only if hostname wasn't filled in the meantime
+        if IPAddress.objects.filter(pk=ip_id, hostname__isnull=True).update(
+            hostname=hostname
+        ):
+            invalidate_dhcp_configs()
+
+
+_hostnames_to_resolve = threading.local()
+
+
+def _queue_hostnames_resolving(ip_ids):
+    # errors of the queue don't break saving of IPs (hostname is left empty)
+    for ip_id in ip_ids:
+        try:
+            InternalService('RESOLVE_IP_HOSTNAME').run_async(ip_id=ip_id)
+        except Exception:
+            logger.exception(
+                'Could not queue hostname lookup of IP {}'.format(ip_id)
+            )
+
+
+def resolve_hostname_later(ip_id):
+    """
+    Queue hostname lookup of IP in the background. During request (in
+    transaction) IP is queued after the request is finished (and its
+    transaction is commited), so the worker could see it.
+    """
+    pending = getattr(_hostnames_to_resolve, 'ip_ids', None)
+    if pending is not None and connection.in_atomic_block:
+        pending.add(ip_id)
+    else:
+        _queue_hostnames_resolving([ip_id])
+
+
+@receiver(request_started)
+def collect_hostnames_to_resolve(sender, **kwargs):
+    _hostnames_to_resolve.ip_ids = set()
+
+
+@receiver(request_finished)
+def queue_collected_hostnames_to_resolve(sender, **kwargs):
+    pending = getattr(_hostnames_to_resolve, 'ip_ids', None)
+    _hostnames_to_resolve.ip_ids = None
+    if pending:
+        _queue_hostnames_resolving(sorted(pending))
+
+
 class DiscoveryQueue(NamedMixin, models.Model):
 
     class Meta:
@@ -398,6 +712,50 @@ class IPAddressQuerySet(models.QuerySet):
             ip.save(force_insert=True)
         return ip
 
+    def assign_networks(self, batch_size=1000):
+        """
+        Assign every IP address in queryset to the most specific network
+        containing it, in a single pass over IP addresses and networks.
+
+        Both IP addresses and networks are sorted by IP number and merged.
+        Networks are nested CIDR blocks, so the most specific network
+        containing an IP is the last one on the stack of "open" networks.
+        Only IPs whose network changed are updated (in batches, grouped by
+        network).
+
+        Returns number of updated IP addresses.
+        """
+        networks = Network.objects.order_by(
+            'min_ip', '-max_ip'
+        ).values_list('pk', 'min_ip', 'max_ip').iterator()
+        changes = defaultdict(list)
+        stack = []
+        next_network = next(networks, None)
+        for pk, number, network_id in self.order_by('number').values_list(
+            'pk', 'number', 'network_id'
+        ).iterator():
+            while next_network is not None and next_network[1] <= number:
+                while stack and stack[-1][2] < next_network[1]:
+                    stack.pop()
+                stack.append(next_network)
+                next_network = next(networks, None)
+            while stack and stack[-1][2] < number:
+                stack.pop()
+            new_network_id = stack[-1][0] if stack else None
+            if new_network_id != network_id:
+                changes[new_network_id].append(pk)
+
+        updated = 0
+        for network_id, ips_ids in changes.items():
+            for i in range(0, len(ips_ids), batch_size):
+                updated += self.model._default_manager.filter(
+                    pk__in=ips_ids[i:i + batch_size]
+                ).update(network_id=network_id)
+        logger.info('%s IP addresses assigned to new networks', updated)
+        if updated:
+            invalidate_dhcp_configs()
+        return updated
+
 
 class IPAddress(
     AdminAbsoluteUrlMixin,
@@ -438,13 +796,11 @@ class IPAddress(
         default=None,
         # TODO: unique
     )
-    number = models.DecimalField(
+    number = IPNumberField(
         verbose_name=_('IP address'),
         help_text=_('Presented as int.'),
         editable=False,
         unique=True,
-        max_digits=39,
-        decimal_places=0,
         default=None,
     )
     is_management = models.BooleanField(
@@ -532,13 +888,15 @@ class IPAddress(
             raise ValidationError(errors)
 
     def save(self, *args, **kwargs):
+        resolve_hostname_in_background = False
         if settings.CHECK_IP_HOSTNAME_ON_SAVE:
             if not self.address and self.hostname:
-                self.address = network_tools.hostname(
-                    self.hostname, reverse=True
-                )
+                self.address = resolve_hostname(self.hostname, reverse=True)
             if not self.hostname and self.address:
-                self.hostname = network_tools.hostname(self.address)
+                if settings.CHECK_IP_HOSTNAME_ASYNC:
+                    resolve_hostname_in_background = True
+                else:
+                    self.hostname = resolve_hostname(self.address)
         if self.number and not self.address:
             self.address = ipaddress.ip_address(int(self.number))
         else:
@@ -547,6 +905,8 @@ class IPAddress(
         self.is_public = not self.ip.is_private
         # TODO: if not reserved, check for ethernet
         super(IPAddress, self).save(*args, **kwargs)
+        if resolve_hostname_in_background:
+            resolve_hostname_later(self.pk)
 
     @property
     def ip(self):
@@ -585,12 +945,14 @@ class IPAddress(
 @receiver(post_migrate)
 def rebuild_handler(sender, **kwargs):
     """
-    Rebuild Network tree after migration of operations app.
+    Rebuild Network tree (and assignment of IPs to networks) after migration
+    of networks app.
     """
     # post_migrate is called after each app's migrations
     if sender.name == 'ralph.' + Network._meta.app_label:
         try:
             Network.objects.rebuild()
+            IPAddress.objects.assign_networks()
         except ProgrammingError:
             # this may happen during unapplying initial migration for networks
             # app
@@ -117,3 +117,37 @@ class IPAddressAPITests(RalphAPITestCase):
             'Could not delete IPAddress when it is exposed in DHCP',
             response.data
         )
+
+
+class NetworkAPITests(RalphAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.net = NetworkFactory(address='10.0.0.0/29')
+        IPAddressFactory(address='10.0.0.2')
+
+    def test_issue_next_free_ips(self):
+        url = reverse('network-issue-next-free-ips', args=(self.net.id,))
+        response = self.client.post(url, format='json', data={'count': 3})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [ip['address'] for ip in response.data],
+            ['10.0.0.1', '10.0.0.3', '10.0.0.4']
+        )
+        self.assertEqual(self.net.ips.count(), 4)
+
+    def test_issue_next_free_ips_contiguous(self):
+        url = reverse('network-issue-next-free-ips', args=(self.net.id,))
+        response = self.client.post(
+            url, format='json', data={'count': 2, 'contiguous': True}
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [ip['address'] for ip in response.data],
+            ['10.0.0.3', '10.0.0.4']
+        )
+
+    def test_issue_next_free_ips_when_not_enough_free_should_not_pass(self):
+        url = reverse('network-issue-next-free-ips', args=(self.net.id,))
+        response = self.client.post(url, format='json', data={'count': 6})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.net.ips.count(), 1)
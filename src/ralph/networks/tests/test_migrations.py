@@ -31,3 +31,40 @@ class RemoveBaseObjectTestCase(MigrationTest):
         IPAddress = self.get_model_after('networks.IPAddress')
         ip = IPAddress.objects.get(pk=ip.pk)
         self.assertEqual(ip.ethernet.pk, eth.pk)
+
+
+class CompactIPNumbersTestCase(MigrationTest):
+    before = [
+        ('networks', '0004_auto_20160606_1512'),
+    ]
+
+    after = [
+        ('networks', '0005_compact_ip_numbers'),
+    ]
+
+    def test_ip_numbers_should_be_recalculated(self):
+        IPAddress = self.get_model_before('networks.IPAddress')
+        Network = self.get_model_before('networks.Network')
+        ip = IPAddress.objects.create(address='2001:db8::1', number=0)
+        ip2 = IPAddress.objects.create(address='10.0.0.1', number=1)
+        net = Network.objects.create(
+            name='net', address='192.168.1.0/24', min_ip=0, max_ip=0,
+            lft=0, rght=0, tree_id=0, level=0
+        )
+        self.run_migration()
+
+        IPAddress = self.get_model_after('networks.IPAddress')
+        Network = self.get_model_after('networks.Network')
+        ip = IPAddress.objects.get(pk=ip.pk)
+        ip2 = IPAddress.objects.get(pk=ip2.pk)
+        net = Network.objects.get(pk=net.pk)
+        self.assertEqual(ip.number, 0x20010db8000000000000000000000001)
+        self.assertEqual(ip2.number, 167772161)
+        self.assertEqual(net.min_ip, 3232235776)
+        self.assertEqual(net.max_ip, 3232236031)
+        self.assertEqual(
+            IPAddress.objects.filter(
+                number__gte=0x20010db8000000000000000000000000
+            ).count(),
+            1
+        )
@@ -1,12 +1,23 @@
+import socket
+import threading
 from ipaddress import ip_address, ip_network
+from unittest.mock import patch
 
 from ddt import data, ddt, unpack
 from django.core.exceptions import ValidationError
+from django.test import override_settings
 
 from ralph.assets.models import AssetLastHostname
 from ralph.assets.tests.factories import EthernetFactory
+from ralph.lib import network as network_tools
 from ralph.networks.models.choices import IPAddressStatus
-from ralph.networks.models.networks import IPAddress, Network
+from ralph.networks.models.networks import (
+    collect_hostnames_to_resolve,
+    IPAddress,
+    Network,
+    NotEnoughFreeIPsError,
+    queue_collected_hostnames_to_resolve
+)
 from ralph.networks.tests.factories import (
     IPAddressFactory,
     NetworkEnvironmentFactory
@@ -186,6 +197,10 @@ class NetworkTest(RalphTestCase):
         ('192.168.1.0/31', ip_address('192.168.1.0'), []),
         ('192.168.1.0/31', ip_address('192.168.1.1'), ['192.168.1.0']),
         ('192.168.1.0/31', None, ['192.168.1.0', '192.168.1.1']),
+        ('2001:db8::/64', ip_address('2001:db8::1'), []),
+        ('2001:db8::/64', ip_address('2001:db8::3'), [
+            '2001:db8::1', '2001:db8::2'
+        ]),
     )
     def test_get_first_free_ip(self, network_addr, first_free, used):
         net = Network.objects.create(address=network_addr)
@@ -196,6 +211,54 @@ class NetworkTest(RalphTestCase):
             IPAddress.object.bulk_create(ips)
         self.assertEqual(net.get_first_free_ip(), first_free)
 
+    @unpack
+    @data(
+        (3, False, ['10.1.1.2', '10.1.1.5', '10.1.1.8']),
+        (2, True, ['10.1.1.8', '10.1.1.9']),
+        (6, False, ['10.1.1.2', '10.1.1.5', '10.1.1.8', '10.1.1.9',
+                    '10.1.1.10', '10.1.1.11']),
+        (7, False, ['10.1.1.2', '10.1.1.5', '10.1.1.8', '10.1.1.9',
+                    '10.1.1.10', '10.1.1.11', '10.1.1.12']),
+        (6, True, []),
+    )
+    def test_get_free_ips(self, count, contiguous, free_ips):
+        net = Network.objects.create(address='10.1.1.0/28')
+        for ip in [
+            '10.1.1.1', '10.1.1.3', '10.1.1.4', '10.1.1.6', '10.1.1.7',
+            '10.1.1.13'
+        ]:
+            IPAddress.objects.create(address=ip)
+        self.assertEqual(
+            net.get_free_ips(count, contiguous),
+            [ip_address(ip) for ip in free_ips]
+        )
+
+    def test_get_first_free_ip_should_skip_ips_from_subnetwork(self):
+        net = Network.objects.create(address='10.1.1.0/24')
+        subnet = Network.objects.create(address='10.1.1.0/30')
+        IPAddress.objects.create(address='10.1.1.1')
+        IPAddress.objects.create(address='10.1.1.2')
+        self.assertEqual(subnet.ips.count(), 2)
+        self.assertEqual(net.get_first_free_ip(), ip_address('10.1.1.3'))
+
+    def test_issue_next_free_ips(self):
+        net = Network.objects.create(address='10.1.1.0/24')
+        subnet = Network.objects.create(address='10.1.1.0/30')
+        IPAddress.objects.create(address='10.1.1.2')
+        ips = net.issue_next_free_ips(3)
+        self.assertEqual(
+            [ip.address for ip in ips], ['10.1.1.1', '10.1.1.3', '10.1.1.4']
+        )
+        self.assertEqual(
+            [ip.network for ip in ips], [subnet, subnet, net]
+        )
+
+    def test_issue_next_free_ips_when_not_enough_free_should_raise(self):
+        net = Network.objects.create(address='10.1.1.0/30')
+        with self.assertRaises(NotEnoughFreeIPsError):
+            net.issue_next_free_ips(3)
+        self.assertEqual(net.ips.count(), 0)
+
     def test_sub_network_should_assign_automatically(self):
         net = Network.objects.create(
             name='net', address='192.168.5.0/24'
@@ -260,6 +323,79 @@ class NetworkTest(RalphTestCase):
         self.refresh_objects_from_db(ip, sub1, sub2)
         self.assertEqual(ip.network, sub1)
 
+    def test_change_network_address_should_reassign_ips_and_subnetworks(self):
+        net = Network.objects.create(
+            name='net', address='10.30.0.0/16'
+        )
+        subnet = Network.objects.create(
+            name='subnet', address='10.30.1.0/24'
+        )
+        subnet2 = Network.objects.create(
+            name='subnet2', address='10.30.1.0/28'
+        )
+        other_subnet = Network.objects.create(
+            name='other_subnet', address='10.30.2.0/28'
+        )
+        ip = IPAddress.objects.create(address='10.30.1.100')
+        self.assertEqual(ip.network, subnet)
+
+        subnet.address = '10.30.2.0/24'
+        subnet.save()
+
+        self.refresh_objects_from_db(ip, subnet, subnet2, other_subnet)
+        self.assertEqual(ip.network, net)
+        self.assertEqual(subnet2.parent, net)
+        self.assertEqual(other_subnet.parent, subnet)
+        self.assertEqual(subnet.parent, net)
+        self.assertEqual(
+            list(net.get_descendants().order_by('min_ip', '-max_ip')),
+            [subnet2, subnet, other_subnet]
+        )
+
+    def test_assign_networks(self):
+        ip1 = IPAddress.objects.create(address='10.40.1.1')
+        ip2 = IPAddress.objects.create(address='10.40.1.200')
+        ip3 = IPAddress.objects.create(address='10.40.2.1')
+        ip4 = IPAddress.objects.create(address='10.41.0.1')
+        with override_settings(NETWORKS_ASSIGN_IPS_ON_SAVE=False):
+            net = Network.objects.create(name='net', address='10.40.0.0/16')
+            subnet = Network.objects.create(
+                name='subnet', address='10.40.1.0/24'
+            )
+            subnet2 = Network.objects.create(
+                name='subnet2', address='10.40.1.128/25'
+            )
+        self.refresh_objects_from_db(ip1, ip2, ip3, ip4)
+        self.assertEqual(ip1.network, None)
+
+        self.assertEqual(IPAddress.objects.assign_networks(batch_size=1), 3)
+
+        self.refresh_objects_from_db(ip1, ip2, ip3, ip4)
+        self.assertEqual(ip1.network, subnet)
+        self.assertEqual(ip2.network, subnet2)
+        self.assertEqual(ip3.network, net)
+        self.assertEqual(ip4.network, None)
+
+    def test_widen_network_should_keep_ips_of_contained_networks(self):
+        net = Network.objects.create(
+            name='net', address='10.40.0.0/24'
+        )
+        subnet = Network.objects.create(
+            name='subnet', address='10.41.1.0/24'
+        )
+        ip = IPAddress.objects.create(address='10.41.1.10')
+        ip2 = IPAddress.objects.create(address='10.41.2.10')
+        self.assertEqual(ip.network, subnet)
+        self.assertIsNone(ip2.network)
+
+        net.address = '10.40.0.0/14'
+        net.save()
+
+        self.refresh_objects_from_db(ip, ip2, subnet)
+        self.assertEqual(subnet.parent, net)
+        self.assertEqual(ip.network, subnet)
+        self.assertEqual(ip2.network, net)
+
     def test_delete_network_shouldnt_delete_related_ip(self):
         net = Network.objects.create(
             name='net', address='192.169.58.0/24'
@@ -270,6 +406,62 @@ class NetworkTest(RalphTestCase):
         self.assertTrue(ip)
 
 
+@ddt
+class SmallestNetworkTest(RalphTestCase):
+    def setUp(self):
+        self.net1 = Network.objects.create(
+            name='net1', address='10.20.0.0/16'
+        )
+        self.net2 = Network.objects.create(
+            name='net2', address='10.20.30.0/24'
+        )
+        self.net3 = Network.objects.create(
+            name='net3', address='10.20.30.128/25'
+        )
+
+    @unpack
+    @data(
+        ('10.20.30.1', 'net2'),
+        ('10.20.30.200', 'net3'),
+        ('10.20.40.1', 'net1'),
+        ('10.21.0.1', None),
+    )
+    def test_get_network_for_ip(self, ip, net):
+        self.assertEqual(
+            IPAddress(address=ip).get_network(),
+            getattr(self, net) if net else None
+        )
+
+    def test_get_network_should_skip_self(self):
+        self.assertEqual(self.net3.get_network(), self.net2)
+
+    def test_ip_address_should_be_assigned_to_smallest_network(self):
+        ip = IPAddress.objects.create(address='10.20.30.129')
+        self.assertEqual(ip.network, self.net3)
+
+    def test_get_network_should_fetch_single_network(self):
+        ip = IPAddress(address='10.20.30.129')
+        with self.assertNumQueries(1):
+            self.assertEqual(ip.get_network(), self.net3)
+
+    def test_ip_should_be_assigned_to_parent_after_network_change(self):
+        self.net3.address = '10.20.31.0/25'
+        self.net3.save()
+        ip = IPAddress.objects.create(address='10.20.30.129')
+        self.assertEqual(ip.network, self.net2)
+
+    def test_ip_should_be_assigned_to_parent_after_network_delete(self):
+        self.net3.delete()
+        ip = IPAddress.objects.create(address='10.20.30.129')
+        self.assertEqual(ip.network, self.net2)
+
+    def test_sub_network_should_be_assigned_to_parent(self):
+        net4 = Network.objects.create(
+            name='net4', address='10.20.30.192/26'
+        )
+        self.assertEqual(net4.parent, self.net3)
+
+
 class NetworkEnvironmentTest(RalphTestCase):
     def test_issue_next_hostname(self):
         ne = NetworkEnvironmentFactory(
@@ -321,10 +513,95 @@ class NetworkEnvironmentTest(RalphTestCase):
         self.assertEqual(ne.next_free_hostname, 's12300001.dc.local')
 
 
+class CachedResolverTest(RalphTestCase):
+    @patch('ralph.lib.network.socket.gethostbyaddr')
+    def test_lookup_should_be_skipped_when_too_many_pending(
+        self, gethostbyaddr_mock
+    ):
+        dns_released = threading.Event()
+
+        def slow_gethostbyaddr(ip):
+            dns_released.wait(5)
+            return ('s1.local', [], [ip])
+        gethostbyaddr_mock.side_effect = slow_gethostbyaddr
+        resolver = network_tools.CachedResolver(max_workers=1, max_pending=1)
+        self.assertIsNone(resolver.hostname('10.0.0.1', timeout=0.01))
+        # previous lookup is still pending - next one is not queued
+        self.assertIsNone(resolver.hostname('10.0.0.2', timeout=0.01))
+        dns_released.set()
+        resolver._executor.shutdown(wait=True)
+        self.assertEqual(gethostbyaddr_mock.call_count, 1)
+
+
 class IPAddressTest(RalphTestCase):
     def setUp(self):
         self.ip = IPAddressFactory()
 
+    def tearDown(self):
+        network_tools.resolver.clear()
+
+    @override_settings(CHECK_IP_HOSTNAME_ON_SAVE=True)
+    @patch('ralph.lib.network.socket.gethostbyaddr')
+    def test_hostname_lookup_should_be_cached(self, gethostbyaddr_mock):
+        gethostbyaddr_mock.return_value = ('s1.local', [], ['10.0.0.1'])
+        ip = IPAddress.objects.create(address='10.0.0.1')
+        ip.hostname = None
+        ip.save()
+        self.assertEqual(ip.hostname, 's1.local')
+        self.assertEqual(gethostbyaddr_mock.call_count, 1)
+
+    @override_settings(CHECK_IP_HOSTNAME_ON_SAVE=True)
+    @patch('ralph.lib.network.socket.gethostbyaddr')
+    def test_failed_hostname_lookup_should_be_cached(self, gethostbyaddr_mock):
+        gethostbyaddr_mock.side_effect = socket.herror()
+        ip = IPAddress.objects.create(address='10.0.0.1')
+        ip.save()
+        self.assertEqual(ip.hostname, None)
+        self.assertEqual(gethostbyaddr_mock.call_count, 1)
+
+    @override_settings(
+        CHECK_IP_HOSTNAME_ON_SAVE=True, CHECK_IP_HOSTNAME_ASYNC=True
+    )
+    @patch('ralph.lib.network.socket.gethostbyaddr')
+    def test_hostname_lookup_in_background(self, gethostbyaddr_mock):
+        gethostbyaddr_mock.return_value = ('s1.local', [], ['10.0.0.1'])
+        ip = IPAddress.objects.create(address='10.0.0.1')
+        # hostname is not set during save
+        self.assertEqual(ip.hostname, None)
+        ip.refresh_from_db()
+        self.assertEqual(ip.hostname, 's1.local')
+
+    @override_settings(
+        CHECK_IP_HOSTNAME_ON_SAVE=True, CHECK_IP_HOSTNAME_ASYNC=True
+    )
+    @patch('ralph.lib.network.socket.gethostbyaddr')
+    def test_hostname_lookup_in_background_after_request(
+        self, gethostbyaddr_mock
+    ):
+        gethostbyaddr_mock.return_value = ('s1.local', [], ['10.0.0.1'])
+        # signals are not sent, because other receivers close DB connection
+        collect_hostnames_to_resolve(sender=None)
+        ip = IPAddress.objects.create(address='10.0.0.1')
+        ip.refresh_from_db()
+        # not queued until request is finished
+        self.assertEqual(ip.hostname, None)
+        queue_collected_hostnames_to_resolve(sender=None)
+        ip.refresh_from_db()
+        self.assertEqual(ip.hostname, 's1.local')
+
+    @override_settings(
+        CHECK_IP_HOSTNAME_ON_SAVE=True, CHECK_IP_HOSTNAME_ASYNC=True
+    )
+    @patch('ralph.lib.external_services.base.ExternalService.run_async')
+    def test_ip_should_be_saved_when_queue_is_unavailable(
+        self, run_async_mock
+    ):
+        run_async_mock.side_effect = ConnectionError()
+        ip = IPAddress.objects.create(address='10.0.0.1')
+        ip.refresh_from_db()
+        self.assertEqual(ip.hostname, None)
+        self.assertEqual(run_async_mock.call_count, 1)
+
     def test_delete_ethernet_should_delete_related_ip(self):
         ip = IPAddressFactory()
         ip.ethernet.delete()
@@ -159,6 +159,18 @@ MESSAGE_TAGS = {
 
 DEFAULT_DEPRECIATION_RATE = int(os.environ.get('DEFAULT_DEPRECIATION_RATE', 25))  # noqa
 CHECK_IP_HOSTNAME_ON_SAVE = True
+# max time (in seconds) of DNS lookup when IP is saved
+CHECK_IP_HOSTNAME_TIMEOUT = float(os.environ.get('CHECK_IP_HOSTNAME_TIMEOUT', 1))  # noqa
+# time (in seconds) for which (un)successful DNS lookups are cached
+CHECK_IP_HOSTNAME_CACHE_TTL = int(os.environ.get('CHECK_IP_HOSTNAME_CACHE_TTL', 3600))  # noqa
+CHECK_IP_HOSTNAME_NEGATIVE_CACHE_TTL = int(os.environ.get('CHECK_IP_HOSTNAME_NEGATIVE_CACHE_TTL', 300))  # noqa
+# when set to True, missing hostname of IP is resolved in background job
+# (after IP is saved)
+CHECK_IP_HOSTNAME_ASYNC = os_env_true('CHECK_IP_HOSTNAME_ASYNC')
+# number of retries (and delay between them in seconds) of hostname lookup in
+# background when IP is not visible yet
+CHECK_IP_HOSTNAME_ASYNC_RETRIES = int(os.environ.get('CHECK_IP_HOSTNAME_ASYNC_RETRIES', 3))  # noqa
+CHECK_IP_HOSTNAME_ASYNC_RETRY_DELAY = float(os.environ.get('CHECK_IP_HOSTNAME_ASYNC_RETRY_DELAY', 1))  # noqa
 ASSET_HOSTNAME_TEMPLATE = {
     'prefix': '{{ country_code|upper }}{{ code|upper }}',
     'postfix': '',
@@ -246,7 +258,7 @@ REST_FRAMEWORK = {
         'rest_framework.parsers.MultiPartParser',
         'rest_framework_xml.parsers.XMLParser',
     ),
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',  # noqa
+    'DEFAULT_PAGINATION_CLASS': 'ralph.api.pagination.RalphPagination',
     'PAGE_SIZE': 10,
     'DEFAULT_METADATA_CLASS': 'ralph.lib.api.utils.RalphApiMetadata',
     'DEFAULT_VERSIONING_CLASS': 'rest_framework.versioning.AcceptHeaderVersioning',  # noqa
@@ -254,6 +266,17 @@ REST_FRAMEWORK = {
     'ALLOWED_VERSIONS': ('v1',)
 }
 
+# names of BaseObject descendant models (ex. ["DataCenterAsset",
+# "BackOfficeAsset"]) fetched in BaseObject API in the same query as base
+# objects (using LEFT JOINs) instead of separate query for each model
+API_BASE_OBJECT_POLYMORPHIC_JOIN = json.loads(
+    os.environ.get('API_BASE_OBJECT_POLYMORPHIC_JOIN', '[]')
+)
+
+# max number of items in single request to bulk API endpoints
+# (`<resource>/bulk/`)
+API_BULK_MAX_SIZE = int(os.environ.get('API_BULK_MAX_SIZE', 1000))
+
 REDIS_CONNECTION = {
     'HOST': os.environ.get('REDIS_HOST', 'localhost'),
     'PORT': os.environ.get('REDIS_PORT', '6379'),
@@ -263,6 +286,20 @@ REDIS_CONNECTION = {
 
 # set to False to turn off cache decorator
 USE_CACHE = os_env_true('USE_CACHE', 'True')
+# caches of data which is invalidated on every change (turned off by
+# default) - every one of them requires cache shared between processes (ex.
+# Redis), otherwise other processes would serve outdated data (until TTL in
+# seconds passes):
+# * fields allowed for user (invalidated on change of users' permissions)
+FIELD_PERMISSIONS_CACHE = os_env_true('FIELD_PERMISSIONS_CACHE')
+FIELD_PERMISSIONS_CACHE_TTL = int(os.environ.get('FIELD_PERMISSIONS_CACHE_TTL', 3600))  # noqa
+# * user's regions (invalidated on change of user's regions)
+USER_REGIONS_CACHE = os_env_true('USER_REGIONS_CACHE')
+USER_REGIONS_CACHE_TTL = int(os.environ.get('USER_REGIONS_CACHE_TTL', 3600))
+# * rendered DHCP configs, served with ETag (invalidated on change of data
+#   used in configs)
+DHCP_CONFIG_CACHE = os_env_true('DHCP_CONFIG_CACHE')
+DHCP_CONFIG_CACHE_TTL = int(os.environ.get('DHCP_CONFIG_CACHE_TTL', 3600))
 
 SENTRY_ENABLED = os_env_true('SENTRY_ENABLED')
 SENTRY_JS_DSN = os.environ.get('SENTRY_JS_DSN', None)
@@ -279,6 +316,7 @@ RQ_QUEUES = {
 }
 RALPH_QUEUES = {
     'ralph_ext_pdf': {},
+    'ralph_network_resolver': {},
     'ralph_async_transitions': {
         'DEFAULT_TIMEOUT': 3600,
     },
@@ -293,12 +331,63 @@ RALPH_EXTERNAL_SERVICES = {
         'method': 'inkpy_jinja.pdf',
     },
 }
+# max time (in seconds) of waiting for result of (external or internal)
+# service's job, if service doesn't specify its own `timeout`
+RALPH_SERVICES_WAIT_TIMEOUT = int(
+    os.environ.get('RALPH_SERVICES_WAIT_TIMEOUT', 180)
+)
+
+# delay (in seconds) of rescheduling asynchronous transition action which is
+# not ready yet; it's multiplied by backoff after every retry (up to max
+# delay). Delayed jobs are queued by `resume_scheduled_jobs` management
+# command, which has to be run periodically (or with `--interval`) when delay
+# is greater than 0. Every action could override these values (see
+# `transition_action` decorator)
+ASYNC_TRANSITION_ACTION_RESCHEDULE_DELAY = int(
+    os.environ.get('ASYNC_TRANSITION_ACTION_RESCHEDULE_DELAY', 0)
+)
+ASYNC_TRANSITION_ACTION_RESCHEDULE_BACKOFF = float(
+    os.environ.get('ASYNC_TRANSITION_ACTION_RESCHEDULE_BACKOFF', 2)
+)
+ASYNC_TRANSITION_ACTION_RESCHEDULE_MAX_DELAY = int(
+    os.environ.get('ASYNC_TRANSITION_ACTION_RESCHEDULE_MAX_DELAY', 600)
+)
+# min timeout (in seconds) of waiting for the event by asynchronous transition
+# action - after this time (extended by reschedule backoff) action is checked
+# again by `resume_scheduled_jobs` even if the event was not signalled
+ASYNC_TRANSITION_ACTION_WAIT_TIMEOUT = int(
+    os.environ.get('ASYNC_TRANSITION_ACTION_WAIT_TIMEOUT', 300)
+)
+# max number of retries of asynchronous transition action (0 means no limit)
+ASYNC_TRANSITION_ACTION_MAX_RETRIES = int(
+    os.environ.get('ASYNC_TRANSITION_ACTION_MAX_RETRIES', 0)
+)
+# max number of independent actions (not requiring each other) of single
+# asynchronous transition performed concurrently (every in separate thread
+# and transaction); 1 means that actions are performed one after another
+ASYNC_TRANSITION_MAX_PARALLEL_ACTIONS = int(
+    os.environ.get('ASYNC_TRANSITION_MAX_PARALLEL_ACTIONS', 1)
+)
+# max number of worker jobs performing asynchronous transition of multiple
+# objects (run as single batch); 0 means that every object is transitioned
+# by separate job
+ASYNC_TRANSITION_BATCH_WORKERS = int(
+    os.environ.get('ASYNC_TRANSITION_BATCH_WORKERS', 0)
+)
 
 RALPH_INTERNAL_SERVICES = {
     'ASYNC_TRANSITIONS': {
         'queue_name': 'ralph_async_transitions',
         'method': 'ralph.lib.transitions.async.run_async_transition'
-    }
+    },
+    'ASYNC_TRANSITIONS_BATCH': {
+        'queue_name': 'ralph_async_transitions',
+        'method': 'ralph.lib.transitions.async.run_async_transitions_batch'
+    },
+    'RESOLVE_IP_HOSTNAME': {
+        'queue_name': 'ralph_network_resolver',
+        'method': 'ralph.networks.models.networks.fill_ip_hostname'
+    },
 }
 
 # Example:
@@ -318,9 +407,16 @@ ISSUE_TRACKER_URL = os.environ.get('ISSUE_TRACKER_URL', '')
 
 # Networks
 DEFAULT_NETWORK_MARGIN = int(os.environ.get('DEFAULT_NETWORK_MARGIN', 10))
+# when set to False, IPs are not assigned to network when it's saved (used
+# during import - IPs are assigned to networks in single pass afterwards)
+NETWORKS_ASSIGN_IPS_ON_SAVE = True
 # when set to True, network records (IP/Ethernet) can't be modified until
 # 'expose in DHCP' is selected
 DHCP_ENTRY_FORBID_CHANGE = os_env_true('DHCP_ENTRY_FORBID_CHANGE', 'True')
+# when set to True, DHCP entries config is streamed to the client in chunks
+# (without building model instances and rendering template)
+DHCP_ENTRIES_STREAMING = os_env_true('DHCP_ENTRIES_STREAMING')
+DHCP_ENTRIES_CHUNK_SIZE = int(os.environ.get('DHCP_ENTRIES_CHUNK_SIZE', 2000))
 
 # enable integration with DNSaaS, for details see
 # https://github.com/allegro/django-powerdns-dnssec
@@ -50,6 +50,7 @@ LOGGING['loggers']['ralph'].update({'level': 'DEBUG', 'handlers': ['console']})
 
 RQ_QUEUES['ralph_job_test'] = dict(ASYNC=False, **REDIS_CONNECTION)
 RQ_QUEUES['ralph_async_transitions']['ASYNC'] = False
+RQ_QUEUES['ralph_network_resolver']['ASYNC'] = False
 RALPH_INTERNAL_SERVICES.update({
     'JOB_TEST': {
         'queue_name': 'ralph_job_test',
@@ -167,6 +167,44 @@ class AsyncOrder(
                 instance.username = kwargs['_request__user'].username
                 instance.save()
 
+    @classmethod
+    @transition_action(
+        verbose_name='Action waiting for event',
+        is_async=True,
+    )
+    def action_waiting_for_event(cls, instances, **kwargs):
+        instance = instances[0]
+        instance.refresh_from_db()
+        if instance.name != 'ready':
+            raise RescheduleAsyncTransitionActionLater(
+                wait_for='async_order_ready'
+            )
+
+    @classmethod
+    @transition_action(
+        verbose_name='Action with delayed retries',
+        is_async=True,
+        reschedule_delay=60,
+        max_retries=2,
+    )
+    def action_with_delayed_retries(cls, instances, **kwargs):
+        raise RescheduleAsyncTransitionActionLater()
+
+    @classmethod
+    @transition_action(
+        verbose_name='Action in batch',
+        is_async=True,
+        run_in_batch=True,
+        run_after=['long_running_action']
+    )
+    def action_in_batch(cls, instances, **kwargs):
+        for instance in instances:
+            instance.counter += 1
+            instance.save()
+            kwargs['shared_params'][instance.pk]['batch_size'] = len(
+                instances
+            )
+
     @classmethod
     @transition_action(
         verbose_name='Failing action',